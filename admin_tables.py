@@ -0,0 +1,191 @@
+"""
+Admin Tables Module for Vidensbank
+Keyset pagination, filters and cached row counts for the admin views, so /admin
+stays fast however many contact form submissions pile up
+"""
+
+from sqlalchemy import DateTime, event, func, tuple_
+from sqlalchemy.orm import object_session
+from datetime import datetime
+import base64
+import json
+import logging
+import threading
+import time
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Session.info key for the models written in the open transaction, per AdminTables
+PENDING_KEY = 'admin_tables_pending'
+
+
+class KeysetPage:
+    """One page of rows plus cursors for the neighbouring pages (None at either end)"""
+
+    def __init__(self, items, next_cursor=None, prev_cursor=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+
+def encode_cursor(values):
+    """Opaque, URL-safe cursor for a row's sort key"""
+    plain = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(plain).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, columns):
+    """Sort key from a cursor, or None if the cursor is missing or malformed"""
+    if not token:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        if not isinstance(values, list) or len(values) != len(columns):
+            return None
+        return tuple(
+            datetime.fromisoformat(value) if isinstance(column.type, DateTime) else value
+            for value, column in zip(values, columns)
+        )
+    except (ValueError, TypeError):
+        return None
+
+
+def paginate(query, columns, per_page, after=None, before=None):
+    """
+    Keyset pagination, newest first.
+
+    Rows are ordered by `columns` descending; `after` continues with older rows
+    than a cursor, `before` goes back to newer ones. Every page is an index
+    range scan, unlike OFFSET which reads and discards all earlier rows.
+
+    Args:
+        query: Filtered query on the model
+        columns: Sort key, ending in a unique column (usually the id)
+        per_page: Rows per page
+        after: Cursor of the last row on the previous page
+        before: Cursor of the first row on the next page
+
+    Returns:
+        KeysetPage
+    """
+    def key(row):
+        return encode_cursor([getattr(row, column.key) for column in columns])
+
+    after_key = decode_cursor(after, columns)
+    before_key = decode_cursor(before, columns) if after_key is None else None
+
+    if before_key is not None:
+        rows = (query.filter(tuple_(*columns) > before_key)
+                .order_by(*[column.asc() for column in columns])
+                .limit(per_page + 1).all())
+        items = rows[:per_page][::-1]
+        if not items:
+            return KeysetPage([])
+        return KeysetPage(items, next_cursor=key(items[-1]),
+                          prev_cursor=key(items[0]) if len(rows) > per_page else None)
+
+    if after_key is not None:
+        query = query.filter(tuple_(*columns) < after_key)
+    rows = query.order_by(*[column.desc() for column in columns]).limit(per_page + 1).all()
+    items = rows[:per_page]
+    if not items:
+        return KeysetPage([])
+    return KeysetPage(items, next_cursor=key(items[-1]) if len(rows) > per_page else None,
+                      prev_cursor=key(items[0]) if after_key is not None else None)
+
+
+class AdminTables:
+    """Paginated, counted access to the admin tables"""
+
+    def __init__(self, app=None, db=None):
+        self.app = None
+        self.db = db
+        self.models = []
+        self._counts = {}
+        self._lock = threading.Lock()
+        self._ready = set()
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db=None):
+        app.config.setdefault('ADMIN_PAGE_SIZE', 50)
+        # Counts are shared by every admin request for this long; writes in this
+        # process clear them once committed, writes in other workers after the TTL
+        app.config.setdefault('ADMIN_COUNT_TTL', 60)
+        app.extensions['admin_tables'] = self
+        self.app = app
+        if db is not None:
+            self.db = db
+        # Clearing during the flush would let a concurrent request re-cache the
+        # old, still committed count for ADMIN_COUNT_TTL
+        event.listen(self.db.session, 'after_commit', self._after_commit)
+        event.listen(self.db.session, 'after_rollback', self._after_rollback)
+
+    def watch(self, *models):
+        """Track models whose indexes must exist and whose counts go stale on writes"""
+        for model in models:
+            self.models.append(model)
+            for name in ('after_insert', 'after_update', 'after_delete'):
+                event.listen(model, name, self._invalidate)
+
+    def ensure_indexes(self):
+        """Create indexes declared on the models that an older database lacks"""
+        key = str(self.db.engine.url)
+        if key in self._ready:
+            return
+        with self.db.engine.begin() as connection:
+            for model in self.models:
+                for index in model.__table__.indexes:
+                    index.create(connection, checkfirst=True)
+        self._ready.add(key)
+
+    def paginate(self, query, columns, after=None, before=None):
+        self.ensure_indexes()
+        return paginate(query, columns, self.app.config['ADMIN_PAGE_SIZE'], after=after, before=before)
+
+    def count(self, model, column=None):
+        """
+        Cached row count of a table, or with `column` a dict of row counts per
+        value of that column.
+        """
+        cache_key = (model.__name__, column.key if column is not None else None)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._counts.get(cache_key)
+        if cached and now - cached[1] < self.app.config['ADMIN_COUNT_TTL']:
+            return cached[0]
+
+        self.ensure_indexes()
+        if column is None:
+            value = self.db.session.query(func.count()).select_from(model).scalar()
+        else:
+            value = dict(self.db.session.query(column, func.count()).group_by(column).all())
+        with self._lock:
+            self._counts[cache_key] = (value, now)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+
+    def _invalidate(self, mapper, connection, target):
+        name = mapper.class_.__name__
+        session = object_session(target)
+        if session is None:
+            self._clear_models([name])
+            return
+        session.info.setdefault(PENDING_KEY, {}).setdefault(self, set()).add(name)
+
+    def _after_commit(self, session):
+        names = session.info.get(PENDING_KEY, {}).pop(self, None)
+        if names:
+            self._clear_models(names)
+
+    def _after_rollback(self, session):
+        session.info.get(PENDING_KEY, {}).pop(self, None)
+
+    def _clear_models(self, names):
+        with self._lock:
+            for cache_key in [cache_key for cache_key in self._counts if cache_key[0] in names]:
+                del self._counts[cache_key]
@@ -3,6 +3,7 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
+import click
 import os
 import sys
 
@@ -12,7 +13,27 @@ from calculator_engine import ClimateCalculatorEngine
 import sqlite3
 
 # Import PDF generator
-from pdf_generator import PDFGenerator
+from pdf_cache import PDFCache
+from pdf_jobs import PDFJobs
+from canteen_reports import CanteenReports, archive_filename, quarter_label
+
+# Import page cache and front-end asset helpers
+from page_cache import PageCache
+from image_pipeline import ResponsiveImages
+from css_build import StylesheetBundle
+from static_assets import StaticAssets
+from compression import Compression
+from template_cache import TemplateCache
+from streaming import TemplateStreaming, measure_ttfb
+from fragments import Fragments
+from fragment_cache import FragmentCache
+from remote_images import RemoteImages, rewrite_templates
+from search_index import SearchIndex
+from content_index import ContentIndex
+from suggest import Suggestions
+from admin_tables import AdminTables
+from identity_cache import IdentityCache
+from write_behind import WriteBehind
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
@@ -24,6 +45,20 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 db = SQLAlchemy(app)
 login_manager = LoginManager(app)
 login_manager.login_view = 'login'
+page_cache = PageCache(app)
+responsive_images = ResponsiveImages(app)
+css_bundle = StylesheetBundle(app)
+static_assets = StaticAssets(app)
+compression = Compression(app)
+template_cache = TemplateCache(app)
+streaming = TemplateStreaming(app)
+fragments = Fragments(app)
+fragment_cache = FragmentCache(app)
+remote_images = RemoteImages(app)
+content_index = ContentIndex(app)
+suggestions = Suggestions(app)
+pdf_cache = PDFCache(app)
+pdf_jobs = PDFJobs(app)
 
 # ============================================================================
 # DATABASE MODELS
@@ -48,12 +83,18 @@ class Page(db.Model):
     title = db.Column(db.String(200), nullable=False)
     slug = db.Column(db.String(200), unique=True, nullable=False)
     content = db.Column(db.Text, nullable=False)
-    topic = db.Column(db.String(100), nullable=False)
-    is_published = db.Column(db.Boolean, default=True)
+    topic = db.Column(db.String(100), nullable=False, index=True)
+    is_published = db.Column(db.Boolean, default=True, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class ContactForm(db.Model):
+    # Match the admin list's keyset order, with and without a status filter
+    __table_args__ = (
+        db.Index('ix_contact_form_submitted_at_id', 'submitted_at', 'id'),
+        db.Index('ix_contact_form_status_submitted_at_id', 'status', 'submitted_at', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), nullable=False)
@@ -62,9 +103,16 @@ class ContactForm(db.Model):
     submitted_at = db.Column(db.DateTime, default=datetime.utcnow)
     status = db.Column(db.String(20), default='new')  # new, read, replied
 
+search_index = SearchIndex(app, db, Page)
+admin_tables = AdminTables(app, db)
+admin_tables.watch(User, Page, ContactForm)
+identity_cache = IdentityCache(app, db, User)
+contact_queue = WriteBehind(app, db, ContactForm)
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    # Served from the per-worker identity cache while the session's version stamp matches
+    return identity_cache.load(user_id)
 
 # ============================================================================
 # CONTEXT PROCESSORS
@@ -79,30 +127,37 @@ def inject_current_year():
 # ============================================================================
 
 @app.route('/')
+@page_cache.cached
 def index():
     return render_template('index.html')
 
 @app.route('/emissioner-og-baeredygtighed')
+@page_cache.cached
 def emissions_sustainability():
     return render_template('emissions_sustainability.html')
 
 @app.route('/emissioner-og-baeredygtighed/fodevare-relaterede-emissioner')
+@page_cache.cached
 def food_emissions():
     return render_template('food_emissions.html')
 
 @app.route('/emissioner-og-baeredygtighed/datadrevet-tilgang')
+@page_cache.cached
 def data_driven_approach():
     return render_template('data_driven_approach.html')
 
 @app.route('/emissioner-og-baeredygtighed/branchepraestation')
+@page_cache.cached
 def market_analysis():
-    return render_template('market_analysis.html')
+    return streaming.render('market_analysis.html')
 
 @app.route('/emissioner-og-baeredygtighed/politisk-landskab')
+@page_cache.cached
 def political_landscape():
     return render_template('political_landscape.html')
 
 @app.route('/emissioner-og-baeredygtighed/klimadata')
+@page_cache.cached
 def climate_data():
     return render_template('climate_data.html')
 
@@ -111,62 +166,74 @@ def climate_data():
 # ============================================================================
 
 @app.route('/vidensbank/emissioner')
+@page_cache.cached
 def topic_emissions_landing():
     """Emissions topic landing page"""
     return render_template('topics/emissions/landing.html')
 
 @app.route('/vidensbank/emissioner/hvad-er-det')
+@page_cache.cached
 def topic_emissions_what():
     """What are food-related emissions?"""
     return render_template('topics/emissions/what.html')
 
 @app.route('/vidensbank/emissioner/hvorfor-vigtigt')
+@page_cache.cached
 def topic_emissions_why():
     """Why are emissions important?"""
     return render_template('topics/emissions/why.html')
 
 @app.route('/vidensbank/emissioner/maal-og-ambition')
+@page_cache.cached
 def topic_emissions_goal():
     """Goals and ambitions"""
     return render_template('topics/emissions/goal.html')
 
 @app.route('/vidensbank/emissioner/mit-aftryk')
+@page_cache.cached
 def topic_emissions_impact():
     """What is my impact?"""
     return render_template('topics/emissions/impact.html')
 
 @app.route('/vidensbank/emissioner/tips-og-tricks')
+@page_cache.cached
 def topic_emissions_tips():
     """Emissions - Tips & Tricks"""
     return render_template('topics/emissions/tips.html')
 
 # --- Organic Topic Routes ---
 @app.route('/vidensbank/okologi')
+@page_cache.cached
 def topic_organic_landing():
     """Organic topic landing page"""
     return render_template('topics/organic/landing.html')
 
 @app.route('/vidensbank/okologi/hvad-er-det')
+@page_cache.cached
 def topic_organic_what():
     """Organic - What is it?"""
     return render_template('topics/organic/what.html')
 
 @app.route('/vidensbank/okologi/hvorfor-er-det-vigtigt')
+@page_cache.cached
 def topic_organic_why():
     """Organic - Why is it important?"""
     return render_template('topics/organic/why.html')
 
 @app.route('/vidensbank/okologi/maal-og-ambition')
+@page_cache.cached
 def topic_organic_goal():
     """Organic - Goal & Ambition"""
     return render_template('topics/organic/goal.html')
 
 @app.route('/vidensbank/okologi/mit-aftryk')
+@page_cache.cached
 def topic_organic_impact():
     """Organic - My Impact / Calculator"""
     return render_template('topics/organic/impact.html')
 
 @app.route('/vidensbank/okologi/tips-og-tricks')
+@page_cache.cached
 def topic_organic_tips():
     """Organic - Tips & Tricks"""
     return render_template('topics/organic/tips.html')
@@ -176,31 +243,37 @@ def topic_organic_tips():
 # ============================================================================
 
 @app.route('/vidensbank/ernaering')
+@page_cache.cached
 def topic_ernaering_landing():
     """Ernæring topic landing page"""
     return render_template('topics/ernaering/landing.html')
 
 @app.route('/vidensbank/ernaering/hvad-er-det')
+@page_cache.cached
 def topic_ernaering_what():
     """What is Ernæring?"""
     return render_template('topics/ernaering/what.html')
 
 @app.route('/vidensbank/ernaering/hvorfor-vigtigt')
+@page_cache.cached
 def topic_ernaering_why():
     """Why Ernæring matters"""
     return render_template('topics/ernaering/why.html')
 
 @app.route('/vidensbank/ernaering/maal-og-ambition')
+@page_cache.cached
 def topic_ernaering_goal():
     """Goals and ambitions for Ernæring"""
     return render_template('topics/ernaering/goal.html')
 
 @app.route('/vidensbank/ernaering/mit-aftryk')
+@page_cache.cached
 def topic_ernaering_impact():
     """Impact for Ernæring"""
     return render_template('topics/ernaering/impact.html')
 
 @app.route('/vidensbank/ernaering/tips-og-tricks')
+@page_cache.cached
 def topic_ernaering_tips():
     """Tips and tricks for Ernæring"""
     return render_template('topics/ernaering/tips.html')
@@ -213,31 +286,37 @@ def topic_ernaering_tips():
 # ============================================================================
 
 @app.route('/vidensbank/vandforbrug')
+@page_cache.cached
 def topic_vandforbrug_landing():
     """Vandforbrug topic landing page"""
     return render_template('topics/vandforbrug/landing.html')
 
 @app.route('/vidensbank/vandforbrug/hvad-er-det')
+@page_cache.cached
 def topic_vandforbrug_what():
     """What is Vandforbrug?"""
     return render_template('topics/vandforbrug/what.html')
 
 @app.route('/vidensbank/vandforbrug/hvorfor-vigtigt')
+@page_cache.cached
 def topic_vandforbrug_why():
     """Why Vandforbrug matters"""
     return render_template('topics/vandforbrug/why.html')
 
 @app.route('/vidensbank/vandforbrug/maal-og-ambition')
+@page_cache.cached
 def topic_vandforbrug_goal():
     """Goals and ambitions for Vandforbrug"""
     return render_template('topics/vandforbrug/goal.html')
 
 @app.route('/vidensbank/vandforbrug/mit-aftryk')
+@page_cache.cached
 def topic_vandforbrug_impact():
     """Impact for Vandforbrug"""
     return render_template('topics/vandforbrug/impact.html')
 
 @app.route('/vidensbank/vandforbrug/tips-og-tricks')
+@page_cache.cached
 def topic_vandforbrug_tips():
     """Tips and tricks for Vandforbrug"""
     return render_template('topics/vandforbrug/tips.html')
@@ -247,31 +326,37 @@ def topic_vandforbrug_tips():
 # ============================================================================
 
 @app.route('/vidensbank/madspild')
+@page_cache.cached
 def topic_madspild_landing():
     """Madspild topic landing page"""
     return render_template('topics/madspild/landing.html')
 
 @app.route('/vidensbank/madspild/hvad-er-det')
+@page_cache.cached
 def topic_madspild_what():
     """What is Madspild?"""
     return render_template('topics/madspild/what.html')
 
 @app.route('/vidensbank/madspild/hvorfor-vigtigt')
+@page_cache.cached
 def topic_madspild_why():
     """Why Madspild matters"""
     return render_template('topics/madspild/why.html')
 
 @app.route('/vidensbank/madspild/maal-og-ambition')
+@page_cache.cached
 def topic_madspild_goal():
     """Goals and ambitions for Madspild"""
     return render_template('topics/madspild/goal.html')
 
 @app.route('/vidensbank/madspild/mit-aftryk')
+@page_cache.cached
 def topic_madspild_impact():
     """Impact for Madspild"""
     return render_template('topics/madspild/impact.html')
 
 @app.route('/vidensbank/madspild/tips-og-tricks')
+@page_cache.cached
 def topic_madspild_tips():
     """Tips and tricks for Madspild"""
     return render_template('topics/madspild/tips.html')
@@ -282,11 +367,13 @@ def topic_madspild_tips():
 
 # Emissioner Tools & Cases
 @app.route('/vidensbank/emissioner/tools')
+@page_cache.cached
 def topic_emissions_tools():
     """Tools for Emissions topic"""
     return render_template('topics/emissions/tools.html')
 
 @app.route('/vidensbank/emissioner/cases')
+@page_cache.cached
 def topic_emissions_cases():
     """Cases for Emissions topic"""
     return render_template('topics/emissions/cases.html')
@@ -294,55 +381,66 @@ def topic_emissions_cases():
 # Ernæring Tools & Cases
 
 # PDF Download Route for Emissions
+pdf_jobs.register_report('emissions', 'pdf/emissions_report.html', 'Emissions_Report_{date}.pdf',
+                         back_endpoint='topic_emissions_landing')
+
 @app.route('/vidensbank/emissioner/download-pdf')
 def emissions_download_pdf():
     """Generate and download PDF report for Emissions topic"""
     try:
-        pdf_gen = PDFGenerator()
-        return pdf_gen.generate_emissions_report()
+        # Cached per day and template version; renders go to the pdf-worker when one runs
+        return pdf_jobs.respond('emissions')
     except Exception as e:
         flash(f'Der opstod en fejl ved generering af PDF: {str(e)}', 'error')
         return redirect(url_for('topic_emissions_landing'))
 
 @app.route('/vidensbank/ernaering/tools')
+@page_cache.cached
 def topic_ernaering_tools():
     """Tools for Ernæring topic"""
     return render_template('topics/ernaering/tools.html')
 
 @app.route('/vidensbank/ernaering/cases')
+@page_cache.cached
 def topic_ernaering_cases():
     """Cases for Ernæring topic"""
     return render_template('topics/ernaering/cases.html')
 
 # Økologi Tools & Cases
 @app.route('/vidensbank/okologi/tools')
+@page_cache.cached
 def topic_okologi_tools():
     """Tools for Økologi topic"""
     return render_template('topics/okologi/tools.html')
 
 @app.route('/vidensbank/okologi/cases')
+@page_cache.cached
 def topic_okologi_cases():
     """Cases for Økologi topic"""
     return render_template('topics/okologi/cases.html')
 
 # Vandforbrug Tools & Cases
 @app.route('/vidensbank/vandforbrug/tools')
+@page_cache.cached
 def topic_vandforbrug_tools():
     """Tools for Vandforbrug topic"""
     return render_template('topics/vandforbrug/tools.html')
 
 @app.route('/vidensbank/vandforbrug/cases')
+@page_cache.cached
 def topic_vandforbrug_cases():
     """Cases for Vandforbrug topic"""
     return render_template('topics/vandforbrug/cases.html')
 
 # Madspild Tools & Cases
 @app.route('/vidensbank/madspild/tools')
+@page_cache.cached
 def topic_madspild_tools():
     """Tools for Madspild topic"""
     return render_template('topics/madspild/tools.html')
 
 @app.route('/vidensbank/madspild/cases')
+@page_cache.cached
 def topic_madspild_cases():
     """Cases for Madspild topic"""
     return render_template('topics/madspild/cases.html')
@@ -352,115 +450,136 @@ def topic_madspild_cases():
 # ============================================================================
 
 @app.route('/vidensbank/raavarer')
+@page_cache.cached
 def raavarer_landing():
     """Raw materials landing page"""
-    return render_template('raavarer/landing.html')
+    return streaming.render('raavarer/landing.html')
 
 # Meat Products
 @app.route('/vidensbank/raavarer/oksekoed')
+@page_cache.cached
 def raavare_oksekoed():
     """Beef product page"""
-    return render_template('raavarer/oksekoed.html')
+    return streaming.render('raavarer/oksekoed.html')
 
 @app.route('/vidensbank/raavarer/svinekoed')
+@page_cache.cached
 def raavare_svinekoed():
     """Pork product page"""
-    return render_template('raavarer/svinekoed.html')
+    return streaming.render('raavarer/svinekoed.html')
 
 @app.route('/vidensbank/raavarer/kylling')
+@page_cache.cached
 def raavare_kylling():
     """Chicken product page"""
-    return render_template('raavarer/kylling.html')
+    return streaming.render('raavarer/kylling.html')
 
 @app.route('/vidensbank/raavarer/lammekoed')
+@page_cache.cached
 def raavare_lammekoed():
     """Lamb product page"""
-    return render_template('raavarer/lammekoed.html')
+    return streaming.render('raavarer/lammekoed.html')
 
 # Fish and Seafood
 @app.route('/vidensbank/raavarer/laks')
+@page_cache.cached
 def raavare_laks():
     """Salmon product page"""
-    return render_template('raavarer/laks.html')
+    return streaming.render('raavarer/laks.html')
 
 @app.route('/vidensbank/raavarer/hvid-fisk')
+@page_cache.cached
 def raavare_hvid_fisk():
     """White fish product page"""
-    return render_template('raavarer/hvidfisk.html')
+    return streaming.render('raavarer/hvidfisk.html')
 
 @app.route('/vidensbank/raavarer/skaldyr')
+@page_cache.cached
 def raavare_skaldyr():
     """Shellfish product page"""
-    return render_template('raavarer/skaldyr.html')
+    return streaming.render('raavarer/skaldyr.html')
 
 # Dairy and Eggs
 @app.route('/vidensbank/raavarer/maelk')
+@page_cache.cached
 def raavare_maelk():
     """Milk and yogurt product page"""
-    return render_template('raavarer/maelk.html')
+    return streaming.render('raavarer/maelk.html')
 
 @app.route('/vidensbank/raavarer/ost')
+@page_cache.cached
 def raavare_ost():
     """Cheese product page"""
-    return render_template('raavarer/ost.html')
+    return streaming.render('raavarer/ost.html')
 
 @app.route('/vidensbank/raavarer/aeg')
+@page_cache.cached
 def raavare_aeg():
     """Eggs product page"""
-    return render_template('raavarer/aeg.html')
+    return streaming.render('raavarer/aeg.html')
 
 # Grains and Starch
 @app.route('/vidensbank/raavarer/broed')
+@page_cache.cached
 def raavare_broed():
     """Bread and flour product page"""
-    return render_template('raavarer/broed.html')
+    return streaming.render('raavarer/broed.html')
 
 @app.route('/vidensbank/raavarer/ris')
+@page_cache.cached
 def raavare_ris():
     """Rice product page"""
-    return render_template('raavarer/ris.html')
+    return streaming.render('raavarer/ris.html')
 
 @app.route('/vidensbank/raavarer/kartofler')
+@page_cache.cached
 def raavare_kartofler():
     """Potatoes product page"""
-    return render_template('raavarer/kartofler.html')
+    return streaming.render('raavarer/kartofler.html')
 
 # Vegetables and Legumes
 @app.route('/vidensbank/raavarer/baelgfrugter')
+@page_cache.cached
 def raavare_baelgfrugter():
     """Legumes product page"""
-    return render_template('raavarer/baelgfrugter.html')
+    return streaming.render('raavarer/baelgfrugter.html')
 
 @app.route('/vidensbank/raavarer/rodfrugter')
+@page_cache.cached
 def raavare_rodfrugter():
     """Root vegetables product page"""
-    return render_template('raavarer/rodfrugter.html')
+    return streaming.render('raavarer/rodfrugter.html')
 
 @app.route('/vidensbank/raavarer/bladgroent')
+@page_cache.cached
 def raavare_bladgroent():
     """Leafy greens product page"""
-    return render_template('raavarer/bladgroent.html')
+    return streaming.render('raavarer/bladgroent.html')
 
 # Specialty Items
 @app.route('/vidensbank/raavarer/kaffe')
+@page_cache.cached
 def raavare_kaffe():
     """Coffee product page"""
-    return render_template('raavarer/kaffe.html')
+    return streaming.render('raavarer/kaffe.html')
 
 @app.route('/vidensbank/raavarer/te')
+@page_cache.cached
 def raavare_te():
     """Tea product page"""
-    return render_template('raavarer/te.html')
+    return streaming.render('raavarer/te.html')
 
 @app.route('/vidensbank/raavarer/kakao')
+@page_cache.cached
 def raavare_kakao():
     """Cocoa and chocolate product page"""
-    return render_template('raavarer/kakao.html')
+    return streaming.render('raavarer/kakao.html')
 
 @app.route('/vidensbank/raavarer/olier')
+@page_cache.cached
 def raavare_olier():
     """Oils and fats product page"""
-    return render_template('raavarer/olier.html')
+    return streaming.render('raavarer/olier.html')
 
 
 
@@ -475,14 +594,17 @@ def raavare_olier():
 # ============================================================================
 
 @app.route('/okologi')
+@page_cache.cached
 def okologi():
     return render_template('okologi/main.html')
 
 @app.route('/okologi/hvad-er')
+@page_cache.cached
 def okologi_hvad_er():
     return render_template('okologi/okologi_hvad_er.html')
 
 @app.route('/okologi/regulering')
+@page_cache.cached
 def okologi_regulering():
     return render_template('okologi/okologi_regulering.html')
 
@@ -492,14 +614,16 @@ from sourcing_engine import SourcingEngine
 sourcing_engine = SourcingEngine()
 
 @app.route('/vidensbank/raavarer/frugt')
+@page_cache.cached
 def raavare_frugt():
     """Fruit product page"""
-    return render_template('raavarer/frugt.html')
+    return streaming.render('raavarer/frugt.html')
 
 @app.route('/vidensbank/raavarer/planteprotein')
+@page_cache.cached
 def raavare_planteprotein():
     """Plant protein product page"""
-    return render_template('raavarer/planteprotein.html')
+    return streaming.render('raavarer/planteprotein.html')
 
 # ============================================================================
 # TOOLS ROUTES
@@ -541,11 +665,36 @@ def tool_saesonhjulet():
         
     return render_template('tools/saesonhjulet.html', season_data=all_months_data)
 
+@app.route('/api/season/<int:month>/substitutes/<item>', methods=['GET'])
+def get_season_substitutes(month, item):
+    """Get in-season DK replacements for an item that is out of season (month 0-11)"""
+    if month > 11:
+        return jsonify({
+            'success': False,
+            'error': 'Month must be between 0 and 11'
+        }), 400
+
+    substitutes = sourcing_engine.get_substitutes(month, item)
+    if substitutes is None:
+        return jsonify({
+            'success': False,
+            'error': f'No sourcing data found for {item}'
+        }), 404
+
+    return jsonify({
+        'success': True,
+        'month': month,
+        'item': item,
+        'substitutes': substitutes
+    })
+
 @app.route('/okologi/esg')
+@page_cache.cached
 def okologi_esg():
     return render_template('okologi/okologi_esg.html')
 
 @app.route('/okologi/nuanceret')
+@page_cache.cached
 def okologi_nuanceret():
     return render_template('okologi/okologi_nuanceret.html')
 
@@ -554,31 +703,37 @@ def okologi_nuanceret():
 # ============================================================================
 
 @app.route('/vidensbank/biodiversitet')
+@page_cache.cached
 def topic_biodiversity_landing():
     """Biodiversity topic landing page"""
     return render_template('topics/biodiversity/landing.html')
 
 @app.route('/vidensbank/biodiversitet/hvad-er-det')
+@page_cache.cached
 def topic_biodiversity_what():
     """Biodiversity - What is it?"""
     return render_template('topics/biodiversity/what.html')
 
 @app.route('/vidensbank/biodiversitet/hvorfor-er-det-vigtigt')
+@page_cache.cached
 def topic_biodiversity_why():
     """Biodiversity - Why is it important?"""
     return render_template('topics/biodiversity/why.html')
 
 @app.route('/vidensbank/biodiversitet/maal-og-ambition')
+@page_cache.cached
 def topic_biodiversity_goal():
     """Biodiversity - Goal & Ambition"""
     return render_template('topics/biodiversity/goal.html')
 
 @app.route('/vidensbank/biodiversitet/mit-aftryk')
+@page_cache.cached
 def topic_biodiversity_impact():
     """Biodiversity - My Impact"""
     return render_template('topics/biodiversity/impact.html')
 
 @app.route('/vidensbank/biodiversitet/tips-og-tricks')
+@page_cache.cached
 def topic_biodiversity_tips():
     """Biodiversity - Tips & Tricks"""
     return render_template('topics/biodiversity/tips.html')
@@ -588,31 +743,37 @@ def topic_biodiversity_tips():
 # ============================================================================
 
 @app.route('/vidensbank/saeson')
+@page_cache.cached
 def topic_saeson_landing():
     """Seasonality topic landing page"""
     return render_template('topics/saeson/landing.html')
 
 @app.route('/vidensbank/saeson/hvad-er-det')
+@page_cache.cached
 def topic_saeson_what():
     """Seasonality - What is it?"""
     return render_template('topics/saeson/what.html')
 
 @app.route('/vidensbank/saeson/hvorfor-vigtigt')
+@page_cache.cached
 def topic_saeson_why():
     """Seasonality - Why is it important?"""
     return render_template('topics/saeson/why.html')
 
 @app.route('/vidensbank/saeson/maal-og-ambition')
+@page_cache.cached
 def topic_saeson_goal():
     """Seasonality - Goal & Ambition"""
     return render_template('topics/saeson/goal.html')
 
 @app.route('/vidensbank/saeson/mit-aftryk')
+@page_cache.cached
 def topic_saeson_impact():
     """Seasonality - My Impact"""
     return render_template('topics/saeson/impact.html')
 
 @app.route('/vidensbank/saeson/tips-og-tricks')
+@page_cache.cached
 def topic_saeson_tips():
     """Seasonality - Tips & Tricks"""
     return render_template('topics/saeson/tips.html')
@@ -625,6 +786,10 @@ def topic_saeson_tips():
 
 # Initialize calculator engine
 calculator_engine = ClimateCalculatorEngine()
+canteen_reports = CanteenReports(app, calculator_engine)
+# Bulk renders fork a pool of their own, so they run in the pdf-worker or the CLI only
+pdf_jobs.register_archive('canteens_zip', canteen_reports.write_zip, archive_filename, params=('quarter',),
+                          back_endpoint='admin', timeout=app.config['CANTEEN_REPORT_TIMEOUT'], role='admin')
 
 # Helper function for climate database access
 def get_climate_db():
@@ -633,6 +798,7 @@ def get_climate_db():
     return sqlite3.connect(db_path)
 
 @app.route('/calculator')
+@page_cache.cached
 def calculator():
     """
     Main Climate Calculator
@@ -641,6 +807,7 @@ def calculator():
     return render_template('calculators/comprehensive.html')
 
 @app.route('/calculator/comprehensive')
+@page_cache.cached
 def calculator_comprehensive():
     """Render the comprehensive calculator page."""
     return render_template('calculators/comprehensive.html')
@@ -692,9 +859,10 @@ def api_calculate():
         return jsonify({'error': str(e)}), 400
 
 @app.route('/calculator-advanced')
+@page_cache.cached
 def calculator_advanced():
     """Advanced canteen climate analysis tool with 70+ canteens"""
-    return render_template('calculator_advanced.html')
+    return streaming.render('calculator_advanced.html')
 
 @app.route('/api/calculate-canteen-impact', methods=['POST'])
 def calculate_canteen_impact():
@@ -930,20 +1098,14 @@ def get_canteen(canteen_id):
 
 @app.route('/search')
 def search():
-    query = request.args.get('q', '')
-    if query:
-        # Search in page titles and content
-        results = Page.query.filter(
-            db.or_(
-                Page.title.ilike(f'%{query}%'),
-                Page.content.ilike(f'%{query}%')
-            ),
-            Page.is_published == True
-        ).all()
-    else:
-        results = []
-    
-    return render_template('search_results.html', query=query, results=results)
+    query = request.args.get('q', '').strip()
+    page = request.args.get('page', 1, type=int)
+    # Ranked full-text search with snippets, see search_index.py
+    results = search_index.search(query, page=page) if query else None
+    # Knowledge-bank pages themselves, from the prebuilt index (content_index.py)
+    content_results = content_index.search(query) if query and page == 1 else None
+
+    return render_template('search_results.html', query=query, results=results, content_results=content_results)
 
 # ============================================================================
 # CONTACT FORM
@@ -952,14 +1114,14 @@ def search():
 @app.route('/contact', methods=['GET', 'POST'])
 def contact():
     if request.method == 'POST':
-        contact = ContactForm(
-            name=request.form.get('name'),
-            email=request.form.get('email'),
-            subject=request.form.get('subject'),
-            message=request.form.get('message')
-        )
-        db.session.add(contact)
-        db.session.commit()
+        values = {field: request.form.get(field) for field in ('name', 'email', 'subject', 'message')}
+        # Checked here, since a queued row that fails to insert can no longer be reported
+        if not all((value or '').strip() for value in values.values()):
+            flash('Udfyld venligst navn, email, emne og besked.', 'error')
+            return render_template('contact.html'), 400
+
+        # Batched with other submissions; commits here only if the queue is full
+        contact_queue.submit(**values)
         flash('Tak for din besked! Vi vender tilbage hurtigst muligt.', 'success')
         return redirect(url_for('contact'))
     
@@ -1035,18 +1197,61 @@ def dashboard():
 # ADMIN ROUTES
 # ============================================================================
 
+CONTACT_STATUSES = ('new', 'read', 'replied')
+
 @app.route('/admin')
 @login_required
 def admin():
     if current_user.role != 'admin':
         flash('Du har ikke adgang til denne side', 'error')
         return redirect(url_for('index'))
-    
-    users = User.query.all()
-    pages = Page.query.all()
-    contacts = ContactForm.query.order_by(ContactForm.submitted_at.desc()).all()
-    
-    return render_template('admin.html', users=users, pages=pages, contacts=contacts)
+
+    tab = request.args.get('tab', 'contacts')
+    after = request.args.get('after')
+    before = request.args.get('before')
+    filters = {}
+
+    if tab == 'pages':
+        # The page bodies are not shown in the list
+        query = Page.query.options(db.defer(Page.content))
+        if request.args.get('topic'):
+            filters['topic'] = request.args['topic']
+            query = query.filter(Page.topic == filters['topic'])
+        if request.args.get('published') in ('1', '0'):
+            filters['published'] = request.args['published']
+            query = query.filter(Page.is_published == (filters['published'] == '1'))
+        rows = admin_tables.paginate(query, [Page.id], after=after, before=before)
+    elif tab == 'users':
+        rows = admin_tables.paginate(User.query, [User.id], after=after, before=before)
+    else:
+        tab = 'contacts'
+        query = ContactForm.query
+        if request.args.get('status') in CONTACT_STATUSES:
+            filters['status'] = request.args['status']
+            query = query.filter(ContactForm.status == filters['status'])
+        rows = admin_tables.paginate(query, [ContactForm.submitted_at, ContactForm.id], after=after, before=before)
+
+    counts = {
+        'users': admin_tables.count(User),
+        'pages': admin_tables.count(Page, Page.is_published),
+        'topics': admin_tables.count(Page, Page.topic),
+        'contacts': admin_tables.count(ContactForm, ContactForm.status)
+    }
+    return render_template('admin.html', tab=tab, rows=rows, filters=filters, counts=counts,
+                           statuses=CONTACT_STATUSES)
+
+@app.route('/admin/reports/canteens.zip')
+@login_required
+def admin_canteen_reports():
+    """Quarterly climate report for every canteen as a ZIP, built by the pdf-worker"""
+    if current_user.role != 'admin':
+        flash('Du har ikke adgang til denne side', 'error')
+        return redirect(url_for('index'))
+    if not pdf_jobs.worker_alive():
+        flash('Rapporterne dannes af pdf-worker, som ikke kører. Brug "flask canteen-reports" i stedet.', 'error')
+        return redirect(url_for('admin'))
+    job_id = pdf_jobs.enqueue('canteens_zip', quarter=quarter_label())
+    return redirect(url_for('pdf_job_download', job_id=job_id))
 
 # ============================================================================
 # ERROR HANDLERS
@@ -1068,8 +1273,14 @@ def server_error(e):
 def init_db():
     """Initialize the database."""
     db.create_all()
+    search_index.rebuild()
     print('Database initialized!')
 
+@app.cli.command('rebuild-search-index')
+def rebuild_search_index():
+    """Re-index all pages for full-text search."""
+    print(f'Indexed {search_index.rebuild()} pages')
+
 @app.cli.command()
 def create_admin():
     """Create an admin user."""
@@ -1079,6 +1290,115 @@ def create_admin():
     db.session.commit()
     print('Admin user created! Username: admin, Password: admin123')
 
+@app.cli.command('export-static')
+@click.argument('output_dir')
+@click.option('--app-url', default='', help='Origin of the Flask app for links to pages that are not exported.')
+@click.option('--jobs', type=int, default=None, help='Parallel render workers (default: CPU count).')
+@click.option('--force', is_flag=True, help='Re-render pages even if their templates are unchanged.')
+@click.option('--no-static', is_flag=True, help='Do not copy the static folder.')
+def export_static(output_dir, app_url, jobs, force, no_static):
+    """Export the knowledge-bank pages as static HTML."""
+    from static_export import export_site
+    summary = export_site(app, output_dir, app_url=app_url, jobs=jobs, force=force, copy_static=not no_static)
+    print(f"Exported {summary['rendered']} pages, {summary['skipped']} unchanged, "
+          f"{summary['removed']} removed to {output_dir}")
+    for path in summary['failed']:
+        print(f'Failed: {path}')
+
+@app.cli.command('build-images')
+@click.option('--jobs', type=int, default=None, help='Worker processes (default: CPU count).')
+@click.option('--force', is_flag=True, help='Rebuild variants even if they exist.')
+def build_images(jobs, force):
+    """Build responsive WebP variants of static/images."""
+    from image_pipeline import build_images as run_build
+    summary = run_build(app.static_folder, jobs=jobs, force=force)
+    responsive_images.reload()
+    print(f"Built {summary['built']} images, {summary['cached']} cached, {summary['pruned']} stale variants removed")
+    for filename in summary['failed']:
+        print(f'Failed: {filename}')
+
+@app.cli.command('build-css')
+@click.option('--tailwind-bin', default=None, help='Tailwind CLI command (default: $TAILWIND_BIN or npx tailwindcss).')
+def build_css(tailwind_bin):
+    """Build the purged, fingerprinted stylesheet and critical CSS."""
+    from css_build import build_css as run_build
+    summary = run_build(app, tailwind_bin=tailwind_bin)
+    css_bundle.reload()
+    print(f"Built {summary['stylesheet']} ({summary['size'] // 1024} KB, "
+          f"{summary['critical_size'] // 1024} KB critical)")
+
+@app.cli.command('compress-static')
+@click.option('--force', is_flag=True, help='Recompress files even if they are up to date.')
+def compress_static(force):
+    """Write .gz/.br siblings for static text assets."""
+    from compression import precompress_static
+    summary = precompress_static(app.static_folder, force=force)
+    print(f"Wrote {summary['written']} compressed files, {summary['unchanged']} up to date")
+
+@app.cli.command('precompile-templates')
+def precompile_templates():
+    """Compile every template into the Jinja bytecode cache."""
+    summary = template_cache.load_all()
+    print(f"Compiled {summary['compiled']} templates ({summary['from_cache']} already cached) "
+          f"in {summary['seconds']:.2f}s to {template_cache.directory}")
+    for name in summary['failed']:
+        print(f'Failed: {name}')
+
+@app.cli.command('bench-pages')
+@click.argument('paths', nargs=-1)
+@click.option('--runs', default=20, show_default=True, help='Requests per path and mode')
+def bench_pages(paths, runs):
+    """Compare time to first byte of streamed and fully rendered pages."""
+    if not paths:
+        paths = ('/calculator-advanced', '/emissioner-og-baeredygtighed/branchepraestation',
+                 '/vidensbank/raavarer', '/vidensbank/raavarer/oksekoed')
+    for path, modes in measure_ttfb(app, paths, runs=runs).items():
+        print(path)
+        for mode, stats in modes.items():
+            print(f"  {mode:9} {stats['status']}  TTFB {stats['ttfb_ms']:7.2f} ms  total {stats['total_ms']:7.2f} ms")
+
+@app.cli.command('rewrite-remote-images')
+def rewrite_remote_images():
+    """Move hard-coded Unsplash URLs in templates onto the /img proxy."""
+    summary = rewrite_templates(os.path.join(app.root_path, app.template_folder))
+    print(f"Rewrote {summary['urls']} image URLs in {summary['files']} templates")
+
+@app.cli.command('fetch-remote-images')
+def fetch_remote_images():
+    """Download every proxied remote image and build its WebP variants."""
+    summary = remote_images.prefetch()
+    print(f"{summary['ready']} remote images ready in {app.config['REMOTE_IMAGE_CACHE_DIR']}")
+    for key in summary['failed']:
+        print(f'Failed: {key} (served via redirect until fetched)')
+
+@app.cli.command('build-content-index')
+@click.option('--force', is_flag=True, help='Re-render every page even if its templates are unchanged.')
+def build_content_index(force):
+    """Render the content pages into the search index file."""
+    summary = content_index.build(force=force)
+    print(f"Indexed {summary['documents']} pages ({summary['rendered']} rendered, {summary['reused']} unchanged), "
+          f"{summary['terms']} terms in {summary['seconds']:.2f}s to {content_index.path}")
+    for path in summary['failed']:
+        print(f'Failed: {path}')
+
+@app.cli.command('pdf-worker')
+@click.option('--concurrency', type=int, default=None, help='Parallel renders (default: PDF_JOB_CONCURRENCY).')
+@click.option('--once', is_flag=True, help='Exit when the queue is empty.')
+def pdf_worker(concurrency, once):
+    """Render queued PDF download jobs."""
+    summary = pdf_jobs.run_worker(concurrency=concurrency, once=once)
+    print(f"Rendered {summary['done']} PDFs, {summary['failed']} failed")
+
+@app.cli.command('canteen-reports')
+@click.argument('output')
+@click.option('--processes', type=int, default=None, help='Render processes (default: CPU count).')
+@click.option('--quarter', default=None, help='Quarter label on the reports, e.g. "Q3 2026" (default: current).')
+def canteen_reports_command(output, processes, quarter):
+    """Render every canteen's climate report into a ZIP file."""
+    summary = canteen_reports.write_zip(output, processes=processes, quarter=quarter)
+    print(f"Wrote {summary['done']} reports to {output} in {summary['seconds']:.1f}s")
+    for filename, error in summary['failed']:
+        print(f'Failed: {filename} ({error})')
 
 if __name__ == '__main__':
     with app.app_context():
@@ -0,0 +1,270 @@
+"""
+Canteen Reports Module for Vidensbank
+Quarterly climate reports for every canteen in the climate database, rendered in
+parallel across CPU cores and streamed into a ZIP archive as each PDF finishes.
+Runs from `flask canteen-reports` or as a pdf-worker job, never in a web worker.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from danish_text import fold
+from datetime import datetime
+import logging
+import multiprocessing
+import os
+import re
+import sqlite3
+import time
+import zipfile
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+CANTEEN_QUERY = '''
+    SELECT id, name, location, address, co2_per_kg, green_percent,
+           meat_percent, organic_percent, food_waste_percent, local_sourced,
+           employees, meals_per_day, operating_days
+    FROM canteens
+    ORDER BY name
+'''
+
+# Same split as the advanced calculator's default waste inputs (8/12/5)
+WASTE_SHARES = {'preparation': 8 / 25, 'plate': 12 / 25, 'buffet': 5 / 25}
+
+# Set before the render pool starts; forked workers inherit it
+_report_app = None
+
+
+def quarter_label(when=None):
+    """'Q3 2026' for the quarter a report covers"""
+    when = when or datetime.now()
+    return f"Q{(when.month - 1) // 3 + 1} {when.year}"
+
+
+def load_canteens(db_path):
+    """Every canteen, in the shape /api/canteens returns"""
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(CANTEEN_QUERY).fetchall()
+    finally:
+        conn.close()
+
+    return [{
+        'id': row[0],
+        'name': row[1],
+        'location': row[2],
+        'address': row[3],
+        'baseline': {
+            'co2_per_kg': row[4],
+            'green_percent': row[5],
+            'meat_percent': row[6],
+            'organic_percent': row[7],
+            'food_waste_percent': row[8],
+            'local_sourced': row[9]
+        },
+        'employees': row[10],
+        'meals_per_day': row[11],
+        'operating_days': row[12]
+    } for row in rows]
+
+
+def canteen_params(canteen):
+    """
+    Calculator parameters for a canteen's registered baseline, built the way the
+    advanced calculator builds them for a selected canteen.
+    """
+    baseline = canteen['baseline']
+    return {
+        'employees': canteen['employees'],
+        'meals_per_day': 1,
+        'operating_days': canteen['operating_days'],
+        'attendance_rate': 0.85,
+        'meat_distribution': {
+            'red_meat_percent': baseline['meat_percent'] * 0.3,
+            'bright_meat_percent': baseline['meat_percent'] * 0.5,
+            'fish_percent': baseline['meat_percent'] * 0.2,
+            'vegetarian_percent': baseline['green_percent']
+        },
+        'portion_sizes': {
+            'protein_gram': 120,
+            'vegetables_gram': 200,
+            'carbs_gram': 150
+        },
+        'organic_percent': {
+            'meat': baseline['organic_percent'],
+            'vegetables': 60,
+            'dairy': 30
+        },
+        'waste': {name: round(baseline['food_waste_percent'] * share, 2) for name, share in WASTE_SHARES.items()},
+        'local_sourcing': baseline['local_sourced'],
+        'seasonal_produce': 50
+    }
+
+
+def report_variables(engine, canteen, quarter):
+    """Template variables for one canteen's report"""
+    result = engine.calculate_canteen_impact(canteen_params(canteen))
+    return {
+        'canteen': canteen,
+        'quarter': quarter,
+        'results': {
+            'per_meal_kg': round(result.per_meal_kg, 2),
+            'annual_tons': round(result.annual_tons, 1),
+            'breakdown': {key: round(value, 3) for key, value in result.breakdown.items()},
+            'recommendations': [{
+                'title': rec['title'],
+                'description': rec['description'],
+                'annual_saving_tons': round(rec['annual_saving_tons'], 2),
+                'difficulty': rec['difficulty'],
+                'cost_impact': rec['cost_impact'],
+                'implementation_time': rec['implementation_time']
+            } for rec in result.recommendations],
+            'organic_net_effect_kg': round(result.organic_impact['net_effect'], 3),
+            'waste_added_kg': round(result.waste_impact['total_added'], 3),
+            'waste_potential_reduction_kg': round(result.waste_impact['potential_reduction'], 3),
+            'seasonal_benefit_kg': round(result.seasonal_benefit, 3),
+            'estimated_cost_savings_dkk': round(result.cost_savings)
+        }
+    }
+
+
+def archive_filename(quarter):
+    """Klimarapporter_Q3_2026.zip"""
+    return f"Klimarapporter_{quarter.replace(' ', '_')}.zip"
+
+
+def report_filename(canteen, quarter):
+    """Klimarapport_Q3_2026_Henning_Larsen_245.pdf"""
+    name = re.sub(r'[^A-Za-z0-9]+', '_', fold(canteen['name'])).strip('_')
+    return f"Klimarapport_{quarter.replace(' ', '_')}_{name}_{canteen['id']}.pdf"
+
+
+class CanteenReports:
+    """Renders the per-canteen report for all canteens and packs them into a ZIP"""
+
+    def __init__(self, app=None, engine=None):
+        self.app = None
+        self.engine = engine
+        if app is not None:
+            self.init_app(app, engine)
+
+    def init_app(self, app, engine=None):
+        app.config.setdefault('CANTEEN_REPORT_TEMPLATE', 'pdf/canteen_report.html')
+        # Render processes; None means one per CPU core
+        app.config.setdefault('CANTEEN_REPORT_PROCESSES', None)
+        # How long the pdf-worker lets the whole archive take before retrying it
+        app.config.setdefault('CANTEEN_REPORT_TIMEOUT', 3600)
+        app.extensions['canteen_reports'] = self
+        self.app = app
+        if engine is not None:
+            self.engine = engine
+
+    def reports(self, quarter=None):
+        """(filename, template variables) for every canteen"""
+        quarter = quarter or quarter_label()
+        return [(report_filename(canteen, quarter), report_variables(self.engine, canteen, quarter))
+                for canteen in load_canteens(self.engine.db_path)]
+
+    def render_all(self, processes=None, quarter=None):
+        """
+        Render every canteen's report, yielding as each one finishes. Forks a
+        pool of render processes, so only call it from the CLI or the pdf-worker.
+
+        Yields:
+            (filename, path, error) tuples; path is None if the render failed
+        """
+        global _report_app
+        reports = self.reports(quarter)
+        if not reports:
+            return
+
+        template_name = self.app.config['CANTEEN_REPORT_TEMPLATE']
+        processes = processes or self.app.config['CANTEEN_REPORT_PROCESSES'] or os.cpu_count() or 1
+        processes = min(processes, len(reports))
+
+        _report_app = self.app
+        self.app.extensions['pdf_cache'].warm([template_name])
+        if processes > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            executor = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('fork'))
+        else:
+            executor = ThreadPoolExecutor(max_workers=processes)
+
+        try:
+            futures = {executor.submit(_render_report, template_name, variables): filename
+                       for filename, variables in reports}
+            for future in as_completed(futures):
+                filename = futures[future]
+                try:
+                    yield filename, future.result(), None
+                except Exception as e:
+                    logger.error(f"Canteen report {filename} failed: {e}")
+                    yield filename, None, str(e)
+        finally:
+            # An aborted download drops the renders that have not started yet
+            executor.shutdown(cancel_futures=True)
+
+    def stream_zip(self, processes=None, quarter=None, summary=None):
+        """
+        ZIP archive of all canteen reports, yielded in chunks as PDFs finish so
+        only one report is held in memory at a time.
+
+        Args:
+            summary: Optional dict that receives done, failed and seconds counts
+        """
+        summary = summary if summary is not None else {}
+        summary.update({'done': 0, 'failed': [], 'seconds': 0.0})
+        started = time.perf_counter()
+        stream = _ZipStream()
+
+        with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for filename, path, error in self.render_all(processes=processes, quarter=quarter):
+                if path is None:
+                    summary['failed'].append((filename, error))
+                    continue
+                archive.write(path, filename)
+                summary['done'] += 1
+                yield stream.drain()
+
+            if summary['failed']:
+                archive.writestr('FEJL.txt', ''.join(f"{filename}: {error}\n" for filename, error in summary['failed']))
+        yield stream.drain()
+        summary['seconds'] = time.perf_counter() - started
+
+    def write_zip(self, path, processes=None, quarter=None):
+        """
+        Write the ZIP archive of all canteen reports to path.
+
+        Returns:
+            Summary dict as filled in by stream_zip
+        """
+        summary = {}
+        with open(path, 'wb') as f:
+            for chunk in self.stream_zip(processes=processes, quarter=quarter, summary=summary):
+                f.write(chunk)
+        return summary
+
+
+class _ZipStream:
+    """Write-only target for zipfile; the bytes are handed on with drain()"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _render_report(template_name, variables):
+    """Render one canteen's report through the PDF cache (runs in a render process)"""
+    app = _report_app
+    with app.test_request_context():
+        path, _ = app.extensions['pdf_cache'].get(template_name, **variables)
+    return path
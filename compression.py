@@ -0,0 +1,203 @@
+"""
+Compression Module for Vidensbank
+Serves build-time precompressed static files and compresses large dynamic responses
+"""
+
+from flask import request, send_from_directory
+from collections import OrderedDict
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import threading
+import zlib
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.json', '.svg', '.html', '.txt', '.map', '.xml'}
+COMPRESSIBLE_MIMETYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/xml', 'text/javascript',
+    'application/json', 'application/javascript', 'application/xml', 'image/svg+xml'
+}
+
+# Suffix of the precompressed sibling for each content coding, in order of preference
+PRECOMPRESSED_SUFFIXES = (('br', '.br'), ('gzip', '.gz'))
+
+
+class Compression:
+    """Content-Encoding negotiation for static files and dynamic responses"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self._gzip_template = None
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('COMPRESS_ENABLED', True)
+        # Responses smaller than this gain less than the encoding costs
+        app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+        app.config.setdefault('COMPRESS_GZIP_LEVEL', 6)
+        app.config.setdefault('COMPRESS_BROTLI_QUALITY', 5)
+        # Compressed bodies kept per worker, keyed by body hash (cached pages repeat)
+        app.config.setdefault('COMPRESS_CACHE_SIZE', 256)
+        app.extensions['compression'] = self
+        app.after_request(self.compress_response)
+        self.app = app
+
+        # Compressor state is built once and copied per response
+        self._gzip_template = zlib.compressobj(app.config['COMPRESS_GZIP_LEVEL'], zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def send_static_file(self, filename):
+        """Send a static file, using a .br/.gz sibling when the client accepts it"""
+        static_folder = self.app.static_folder
+        source = os.path.join(static_folder, filename)
+        response = None
+
+        if self.app.config['COMPRESS_ENABLED'] and os.path.isfile(source):
+            for encoding, suffix in PRECOMPRESSED_SUFFIXES:
+                if not request.accept_encodings[encoding]:
+                    continue
+                compressed = source + suffix
+                # Ignore siblings left behind by an edit to the source
+                if not os.path.isfile(compressed) or os.path.getmtime(compressed) < os.path.getmtime(source):
+                    continue
+                mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+                response = send_from_directory(
+                    static_folder, filename + suffix,
+                    mimetype=mimetype,
+                    max_age=self.app.get_send_file_max_age(filename)
+                )
+                response.headers['Content-Encoding'] = encoding
+                break
+
+        if response is None:
+            response = self.app.send_static_file(filename)
+        if os.path.splitext(filename)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+            response.vary.add('Accept-Encoding')
+        return response
+
+    def compress_response(self, response):
+        """after_request hook that encodes large text responses"""
+        if not self.app.config['COMPRESS_ENABLED']:
+            return response
+        if (response.direct_passthrough
+                or response.status_code < 200 or response.status_code in (204, 304)
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self._negotiate()
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = self._compress_stream(response.response, encoding)
+            response.headers['Content-Encoding'] = encoding
+            response.headers.pop('Content-Length', None)
+            return response
+
+        body = response.get_data()
+        if len(body) < self.app.config['COMPRESS_MIN_SIZE']:
+            return response
+
+        response.set_data(self._compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+
+        # The encoded bytes differ, so the ETag can only be a weak match now
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    def _negotiate(self):
+        accepted = request.accept_encodings
+        if BROTLI_AVAILABLE and accepted['br']:
+            return 'br'
+        if accepted['gzip']:
+            return 'gzip'
+        return None
+
+    def _compress(self, body, encoding):
+        key = (hashlib.sha1(body).digest(), encoding)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        if encoding == 'br':
+            compressed = brotli.compress(body, quality=self.app.config['COMPRESS_BROTLI_QUALITY'])
+        else:
+            compressor = self._gzip_template.copy()
+            compressed = compressor.compress(body) + compressor.flush()
+
+        with self._lock:
+            self._cache[key] = compressed
+            while len(self._cache) > self.app.config['COMPRESS_CACHE_SIZE']:
+                self._cache.popitem(last=False)
+        return compressed
+
+    def _compress_stream(self, chunks, encoding):
+        """Encode a streamed body, flushing after every chunk so nothing is held back"""
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=self.app.config['COMPRESS_BROTLI_QUALITY'])
+            compress, flush, finish = compressor.process, compressor.flush, compressor.finish
+        else:
+            compressor = self._gzip_template.copy()
+            compress, finish = compressor.compress, compressor.flush
+            flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            yield compress(chunk) + flush()
+        yield finish()
+
+
+def precompress_static(static_folder, force=False):
+    """
+    Write .gz (and .br when brotli is installed) siblings for every text asset.
+
+    Returns:
+        Dict with written and unchanged counts
+    """
+    summary = {'written': 0, 'unchanged': 0}
+    for root, _, files in os.walk(static_folder):
+        for name in files:
+            if os.path.splitext(name)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+                continue
+            source = os.path.join(root, name)
+            with open(source, 'rb') as f:
+                body = f.read()
+
+            encoders = [('.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+            if BROTLI_AVAILABLE:
+                encoders.append(('.br', lambda data: brotli.compress(data, quality=11)))
+
+            for suffix, encode in encoders:
+                target = source + suffix
+                if not force and os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(source):
+                    summary['unchanged'] += 1
+                    continue
+                compressed = encode(body)
+                if len(compressed) >= len(body):
+                    # Not worth it; make sure a stale sibling is not served
+                    if os.path.exists(target):
+                        os.remove(target)
+                    continue
+                with open(target, 'wb') as f:
+                    f.write(compressed)
+                summary['written'] += 1
+    return summary
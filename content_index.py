@@ -0,0 +1,446 @@
+"""
+Content Index Module for Vidensbank
+Inverted index over the rendered knowledge-bank pages: Danish stemming with æ/ø/å
+folding, stored as one binary file that every worker memory-maps and queries in place
+"""
+
+from danish_text import STOP_WORDS, TOKEN_PATTERN, fold, normalize, tokenize
+from flask import request, template_rendered
+from fragments import FRAGMENT_HEADER, FRAGMENT_VALUE
+from search_index import MARK_END, MARK_START, highlight, strip_html
+from static_export import collect_routes, template_dependency_hash
+from bisect import bisect_left
+from datetime import datetime
+from jinja2 import TemplateNotFound
+import hashlib
+import heapq
+import html
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+MAGIC = b'VBCI'
+FORMAT_VERSION = 1
+
+# magic, version, doc count, term count, then offsets of the info blob,
+# doc table, term table, term strings and postings
+HEADER = struct.Struct('<4s8I')
+# meta json offset/length, text offset/length
+DOC_RECORD = struct.Struct('<4I')
+# string offset/length, first posting, posting count
+TERM_RECORD = struct.Struct('<4I')
+# doc id, BM25 weight, character offset of the first occurrence in the text
+POSTING = struct.Struct('<IfI')
+
+# Occurrences in the title count this many times in the body
+TITLE_BOOST = 5
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Shortest partial last word that is expanded to every term it starts
+MIN_PREFIX = 3
+MAX_PREFIX_TERMS = 64
+NO_OFFSET = 0xFFFFFFFF
+SNIPPET_CHARS = 220
+
+HIDDEN_PATTERN = re.compile(r'<(script|style|noscript|svg|template)\b.*?</\1\s*>|<!--.*?-->', re.S | re.I)
+TITLE_PATTERN = re.compile(r'<title>(.*?)</title>', re.S | re.I)
+TITLE_SUFFIX = ' - Vidensbank'
+
+
+def extract_text(markup):
+    """
+    Title and visible text of a rendered page.
+
+    Returns:
+        Tuple of (title, text)
+    """
+    match = TITLE_PATTERN.search(markup)
+    title = ' '.join(html.unescape(match.group(1)).split()) if match else ''
+    if title.endswith(TITLE_SUFFIX):
+        title = title[:-len(TITLE_SUFFIX)]
+    body = HIDDEN_PATTERN.sub(' ', TITLE_PATTERN.sub(' ', markup))
+    return title, strip_html(body)
+
+
+class IndexReader:
+    """Read-only view of an index file through mmap; nothing is copied up front"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        (magic, version, self.doc_count, self.term_count, info_offset, self.docs_offset,
+         self.terms_offset, self.strings_offset, self.postings_offset) = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} content index")
+        info_length = self.docs_offset - info_offset
+        self.info = json.loads(self.buffer[info_offset:info_offset + info_length])
+        self._documents = {}
+
+    def term(self, index):
+        string_offset, string_length, _, _ = TERM_RECORD.unpack_from(
+            self.buffer, self.terms_offset + index * TERM_RECORD.size
+        )
+        start = self.strings_offset + string_offset
+        return self.buffer[start:start + string_length]
+
+    def find(self, term):
+        """Index of the first term >= term (bytes) in the sorted term table"""
+        return bisect_left(range(self.term_count), term, key=self.term)
+
+    def postings(self, index):
+        """List of (doc id, weight, first offset) for the term at index"""
+        _, _, first, count = TERM_RECORD.unpack_from(self.buffer, self.terms_offset + index * TERM_RECORD.size)
+        start = self.postings_offset + first * POSTING.size
+        return list(POSTING.iter_unpack(self.buffer[start:start + count * POSTING.size]))
+
+    def lookup(self, term):
+        """Postings for an exact term, empty when it is not indexed"""
+        key = term.encode('utf-8')
+        index = self.find(key)
+        if index < self.term_count and self.term(index) == key:
+            return self.postings(index)
+        return []
+
+    def expand(self, prefix):
+        """Indexes of the terms starting with prefix, capped at MAX_PREFIX_TERMS"""
+        key = prefix.encode('utf-8')
+        index = self.find(key)
+        matches = []
+        while index < self.term_count and len(matches) < MAX_PREFIX_TERMS and self.term(index).startswith(key):
+            matches.append(index)
+            index += 1
+        return matches
+
+    def document(self, doc_id):
+        """Metadata dict (path, endpoint, title, templates, deps_hash) of a document"""
+        document = self._documents.get(doc_id)
+        if document is None:
+            meta_offset, meta_length, _, _ = DOC_RECORD.unpack_from(self.buffer, self.docs_offset + doc_id * DOC_RECORD.size)
+            document = self._documents[doc_id] = json.loads(self.buffer[meta_offset:meta_offset + meta_length])
+        return document
+
+    def text(self, doc_id):
+        _, _, text_offset, text_length = DOC_RECORD.unpack_from(self.buffer, self.docs_offset + doc_id * DOC_RECORD.size)
+        return self.buffer[text_offset:text_offset + text_length].decode('utf-8')
+
+    def close(self):
+        self.buffer.close()
+
+
+class ContentIndex:
+    """Loads the content index file lazily per worker and answers /search queries from it"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self._reader = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('CONTENT_INDEX_PATH', os.path.join(app.instance_path, 'content_index.bin'))
+        app.config.setdefault('CONTENT_INDEX_RESULTS', 10)
+        app.extensions['content_index'] = self
+        self.app = app
+
+    @property
+    def path(self):
+        return self.app.config['CONTENT_INDEX_PATH']
+
+    @property
+    def reader(self):
+        """
+        Current IndexReader, or None while no index has been built. A rebuilt
+        file (new inode/mtime) is picked up on the next call.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+
+        reader = self._reader
+        if reader is not None and reader.identity == (stat.st_ino, stat.st_mtime_ns, stat.st_size):
+            return reader
+        with self._lock:
+            if self._reader is None or self._reader.identity != (stat.st_ino, stat.st_mtime_ns, stat.st_size):
+                try:
+                    # The old map stays valid for requests still holding it
+                    self._reader = IndexReader(self.path)
+                except (OSError, ValueError) as e:
+                    logger.error(f"Could not load content index {self.path}: {e}")
+                    return None
+            return self._reader
+
+    def search(self, query, limit=None):
+        """
+        Pages containing every word of the query, best BM25 score first. The
+        last word also matches as a prefix so partial input finds pages.
+
+        Returns:
+            Dict with hits (path, endpoint, title, snippet markup, score) and total
+        """
+        limit = limit or self.app.config['CONTENT_INDEX_RESULTS']
+        results = {'hits': [], 'total': 0}
+        reader = self.reader
+        words = [word.lower() for word in TOKEN_PATTERN.findall(query or '')]
+        if reader is None or not words:
+            return results
+
+        # Stop words carry no ranking signal unless they are all there is
+        content_words = [word for word in words if word not in STOP_WORDS] or words
+        partial = not query[-1].isspace()
+
+        scores = None
+        first_offsets = {}
+        highlight_terms = set()
+        prefixes = []
+        for position, word in enumerate(content_words):
+            term = normalize(word)
+            matches = {}
+            for doc_id, weight, offset in reader.lookup(term):
+                matches[doc_id] = (weight, offset)
+            highlight_terms.add(term)
+
+            prefix = fold(word)
+            if partial and position == len(content_words) - 1 and len(prefix) >= MIN_PREFIX:
+                prefixes.append(prefix)
+                for index in reader.expand(prefix):
+                    for doc_id, weight, offset in reader.postings(index):
+                        if weight > matches.get(doc_id, (0.0, 0))[0]:
+                            matches[doc_id] = (weight, offset)
+
+            if scores is None:
+                scores = {doc_id: weight for doc_id, (weight, _) in matches.items()}
+            else:
+                scores = {doc_id: score + matches[doc_id][0] for doc_id, score in scores.items() if doc_id in matches}
+            for doc_id, (_, offset) in matches.items():
+                if offset != NO_OFFSET:
+                    first_offsets[doc_id] = min(offset, first_offsets.get(doc_id, offset))
+            if not scores:
+                return results
+
+        results['total'] = len(scores)
+        for doc_id, score in heapq.nlargest(limit, scores.items(), key=lambda item: item[1]):
+            document = reader.document(doc_id)
+            snippet = self._snippet(reader.text(doc_id), first_offsets.get(doc_id, 0), highlight_terms, prefixes)
+            results['hits'].append({
+                'path': document['path'],
+                'endpoint': document['endpoint'],
+                'title': document['title'],
+                'snippet': snippet,
+                'score': score
+            })
+        return results
+
+    def build(self, force=False):
+        """Build or incrementally update the index file, see build_content_index()"""
+        return build_content_index(self.app, self.path, force=force)
+
+    def _snippet(self, text, offset, terms, prefixes):
+        start = max(text.rfind(' ', 0, max(offset - SNIPPET_CHARS // 3, 0)) + 1, 0)
+        end = text.find(' ', min(start + SNIPPET_CHARS, len(text)))
+        end = len(text) if end == -1 else end
+
+        def mark(match):
+            word = match.group(0)
+            if normalize(word) in terms or any(fold(word.lower()).startswith(prefix) for prefix in prefixes):
+                return f"{MARK_START}{word}{MARK_END}"
+            return word
+
+        fragment = TOKEN_PATTERN.sub(mark, text[start:end])
+        return highlight(('…' if start > 0 else '') + fragment + ('…' if end < len(text) else ''))
+
+
+def build_content_index(app, path, force=False):
+    """
+    Render every content route and write the index to path.
+
+    Pages whose templates (and everything they extend or include) are unchanged
+    since the last build keep their stored text instead of being rendered again.
+
+    Returns:
+        Dict with documents, rendered, reused, failed, terms and seconds
+    """
+    started = time.perf_counter()
+    routes = collect_routes(app)
+    build_key = hashlib.sha256(json.dumps([FORMAT_VERSION, sorted(routes)]).encode('utf-8')).hexdigest()
+
+    previous = {}
+    if not force and os.path.exists(path):
+        try:
+            reader = IndexReader(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable content index {path}: {e}")
+        else:
+            if reader.info.get('build_key') == build_key:
+                for doc_id in range(reader.doc_count):
+                    document = dict(reader.document(doc_id), text=reader.text(doc_id))
+                    previous[document['path']] = document
+            reader.close()
+
+    documents = []
+    stale = []
+    for route, endpoint in routes.items():
+        document = previous.get(route)
+        if document is not None and _is_fresh(app, document):
+            documents.append(document)
+        else:
+            stale.append(route)
+
+    reused = len(documents)
+    failed = []
+    for document in _render_pages(app, stale, routes):
+        if document.get('error'):
+            failed.append(document['path'])
+            logger.warning(f"Content index skipped {document['path']}: {document['error']}")
+        else:
+            documents.append(document)
+    documents.sort(key=lambda document: document['path'])
+
+    terms = write_index(path, documents, {
+        'build_key': build_key,
+        'generated_at': datetime.now().isoformat(timespec='seconds')
+    })
+    return {
+        'documents': len(documents),
+        'rendered': len(documents) - reused,
+        'reused': reused,
+        'failed': failed,
+        'terms': terms,
+        'seconds': time.perf_counter() - started
+    }
+
+
+def write_index(path, documents, info):
+    """
+    Tokenize the documents and atomically replace the index file.
+
+    Returns:
+        Number of distinct terms
+    """
+    postings = {}
+    lengths = []
+    for doc_id, document in enumerate(documents):
+        counts = {}
+        for term, start, _ in tokenize(document['text']):
+            entry = counts.get(term)
+            if entry is None:
+                counts[term] = [1, start]
+            else:
+                entry[0] += 1
+        for term, _, _ in tokenize(document['title']):
+            counts.setdefault(term, [0, NO_OFFSET])[0] += TITLE_BOOST
+        lengths.append(sum(count for count, _ in counts.values()))
+        for term, (count, offset) in counts.items():
+            postings.setdefault(term, []).append((doc_id, count, offset))
+
+    # BM25 weights are final per (term, document), so queries only add them up
+    doc_count = len(documents)
+    average_length = (sum(lengths) / doc_count) if doc_count else 1.0
+    term_table = bytearray()
+    strings = bytearray()
+    posting_data = bytearray()
+    posting_index = 0
+    for term in sorted(postings, key=lambda term: term.encode('utf-8')):
+        entries = postings[term]
+        idf = math.log(1 + (doc_count - len(entries) + 0.5) / (len(entries) + 0.5))
+        encoded = term.encode('utf-8')
+        term_table += TERM_RECORD.pack(len(strings), len(encoded), posting_index, len(entries))
+        strings += encoded
+        for doc_id, count, offset in entries:
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[doc_id] / average_length)
+            posting_data += POSTING.pack(doc_id, idf * count * (BM25_K1 + 1) / (count + norm), offset)
+        posting_index += len(entries)
+
+    info_blob = json.dumps(info).encode('utf-8')
+    info_offset = HEADER.size
+    docs_offset = info_offset + len(info_blob)
+    blobs_offset = docs_offset + doc_count * DOC_RECORD.size
+    doc_table = bytearray()
+    doc_blobs = bytearray()
+    for document in documents:
+        meta = json.dumps({key: document[key] for key in ('path', 'endpoint', 'title', 'templates', 'deps_hash')},
+                          ensure_ascii=False).encode('utf-8')
+        text = document['text'].encode('utf-8')
+        meta_offset = blobs_offset + len(doc_blobs)
+        doc_blobs += meta + text
+        doc_table += DOC_RECORD.pack(meta_offset, len(meta), meta_offset + len(meta), len(text))
+
+    terms_offset = blobs_offset + len(doc_blobs)
+    strings_offset = terms_offset + len(term_table)
+    postings_offset = strings_offset + len(strings)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, doc_count, len(postings), info_offset, docs_offset,
+                         terms_offset, strings_offset, postings_offset)
+
+    # Workers map the file, so it is swapped in whole rather than rewritten
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for part in (header, info_blob, doc_table, doc_blobs, term_table, strings, posting_data):
+                f.write(part)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return len(postings)
+
+
+def _is_fresh(app, document):
+    try:
+        return template_dependency_hash(app, document['templates']) == document['deps_hash']
+    except TemplateNotFound:
+        return False
+
+
+def _render_pages(app, paths, routes):
+    """Render pages in fragment mode (content block only) through the test client"""
+    if not paths:
+        return []
+
+    headers = {FRAGMENT_HEADER: FRAGMENT_VALUE}
+    client = app.test_client()
+    # A page cache hit would skip rendering, and with it the template signals
+    cache_enabled = app.config.get('PAGE_CACHE_ENABLED', True)
+    app.config['PAGE_CACHE_ENABLED'] = False
+    documents = []
+    try:
+        for path in paths:
+            document = {'path': path, 'endpoint': routes[path]}
+            templates = []
+
+            def record(sender, template, context, **extra):
+                if request.path == path:
+                    templates.append(template.name)
+
+            with template_rendered.connected_to(record, app):
+                try:
+                    response = client.get(path, headers=headers, buffered=True)
+                except Exception as e:
+                    documents.append(dict(document, error=str(e)))
+                    continue
+
+            if response.status_code != 200 or response.mimetype != 'text/html':
+                documents.append(dict(document, error=f"status {response.status_code} ({response.mimetype})"))
+                continue
+
+            document['title'], document['text'] = extract_text(response.get_data(as_text=True))
+            document['templates'] = sorted(set(templates))
+            document['deps_hash'] = template_dependency_hash(app, document['templates'])
+            documents.append(document)
+    finally:
+        app.config['PAGE_CACHE_ENABLED'] = cache_enabled
+    return documents
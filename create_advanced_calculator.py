@@ -1,16 +1,9 @@
 """
 Script to create the advanced calculator template with canteen selection
+and its static CSS/JS bundles
 """
 
-template = """{% extends "base.html" %}
-
-{% block title %}Avanceret Kantineklimaberegner | Vidensbank{% endblock %}
-
-{% block content %}
-<link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.0/font/bootstrap-icons.css">
-
-<style>
-/* Hero Section */
+styles = """/* Hero Section */
 .calculator-hero {
     background: linear-gradient(135deg, #2E8B57 0%, #4CAF50 100%);
     color: white;
@@ -385,229 +378,9 @@ template = """{% extends "base.html" %}
         font-size: 1.8rem;
     }
 }
-</style>
-
-<div class="calculator-hero">
-    <h1><i class="bi bi-building"></i> Avanceret Kantineklimaberegner</h1>
-    <p>70+ danske kantiner • Ugentlig menu • Baseline sammenligning • AI-anbefalinger</p>
-</div>
-
-<div class="container" style="max-width: 1400px; margin: 0 auto;">
-
-    <!-- CANTEEN SELECTION -->
-    <div class="calc-card">
-        <h2><i class="bi bi-search"></i> Vælg Kantine</h2>
-        <select id="canteenSelect">
-            <option value="">-- Søg og vælg din kantine --</option>
-        </select>
-        <div id="canteenInfo" style="display:none; margin-top:1.5rem;">
-            <p><strong>📍 Adresse:</strong> <span id="canteenAddress"></span></p>
-            <p><strong>👥 Medarbejdere:</strong> <span id="canteenEmployees"></span></p>
-        </div>
-    </div>
-
-    <!-- BASELINE DISPLAY -->
-    <div class="calc-card" id="baselineCard" style="display:none;">
-        <h2><i class="bi bi-bar-chart-line"></i> Nuværende Baseline</h2>
-        <div class="baseline-grid">
-            <div class="baseline-item">
-                <span class="baseline-value" id="baselineCO2">-</span>
-                <span class="baseline-label">kg CO2e/kg</span>
-            </div>
-            <div class="baseline-item">
-                <span class="baseline-value" id="baselineGreen">-</span>
-                <span class="baseline-label">Grønt %</span>
-            </div>
-            <div class="baseline-item">
-                <span class="baseline-value" id="baselineMeat">-</span>
-                <span class="baseline-label">Kød %</span>
-            </div>
-            <div class="baseline-item">
-                <span class="baseline-value" id="baselineOrganic">-</span>
-                <span class="baseline-label">Økologisk %</span>
-            </div>
-            <div class="baseline-item">
-                <span class="baseline-value" id="baselineWaste">-</span>
-                <span class="baseline-label">Madspild %</span>
-            </div>
-            <div class="baseline-item">
-                <span class="baseline-value" id="baselineLocal">-</span>
-                <span class="baseline-label">Lokalt %</span>
-            </div>
-        </div>
-    </div>
-
-    <!-- WEEKLY MENU PLANNING -->
-    <div class="calc-card" id="menuCard" style="display:none;">
-        <h2><i class="bi bi-calendar-week"></i> Ugentlig Menu (Mandag-Fredag)</h2>
-        <div class="weekly-grid" id="weeklyGrid">
-            <!-- Will be populated dynamically -->
-        </div>
-    </div>
-
-    <!-- PROCUREMENT & SOURCING -->
-    <div class="calc-card" id="procurementCard" style="display:none;">
-        <h2><i class="bi bi-truck"></i> Indkøb & Leverandører</h2>
-        <div class="input-grid">
-            <div class="input-group">
-                <label>Dansk % <span style="color:#2E8B57">🇩🇰</span></label>
-                <input type="number" id="danishPercent" min="0" max="100" value="60">
-            </div>
-            <div class="input-group">
-                <label>EU % <span style="color:#0066cc">🇪🇺</span></label>
-                <input type="number" id="euPercent" min="0" max="100" value="30">
-            </div>
-            <div class="input-group">
-                <label>Global % <span style="color:#666">🌍</span></label>
-                <input type="number" id="globalPercent" min="0" max="100" value="10">
-            </div>
-            <div class="input-group">
-                <label>Økologisk % <span style="color:#4CAF50">🌱</span></label>
-                <input type="number" id="organicPercent" min="0" max="100" value="40">
-            </div>
-        </div>
-    </div>
-
-    <!-- WASTE MANAGEMENT INITIATIVES -->
-    <div class="calc-card" id="wasteCard" style="display:none;">
-        <h2><i class="bi bi-recycle"></i> Madspildsinitiativer</h2>
-        <div class="initiative-grid">
-            <div class="initiative-item">
-                <input type="checkbox" id="initiative1" value="preorder">
-                <label for="initiative1">Forudbestilling fra gæster</label>
-            </div>
-            <div class="initiative-item">
-                <input type="checkbox" id="initiative2" value="portions">
-                <label for="initiative2">Fleksible portioner (S/M/L)</label>
-            </div>
-            <div class="initiative-item">
-                <input type="checkbox" id="initiative3" value="compost">
-                <label for="initiative3">Kompost/biogas system</label>
-            </div>
-            <div class="initiative-item">
-                <input type="checkbox" id="initiative4" value="tracking">
-                <label for="initiative4">Daglig spildregistrering</label>
-            </div>
-            <div class="initiative-item">
-                <input type="checkbox" id="initiative5" value="stock">
-                <label for="initiative5">Optimeret lagerudnyttelse</label>
-            </div>
-        </div>
-        <div class="input-grid" style="margin-top:1.5rem;">
-            <div class="input-group">
-                <label>Forberedelse spild %</label>
-                <input type="number" id="wastePrep" min="0" max="50" value="8" step="0.5">
-            </div>
-            <div class="input-group">
-                <label>Tallerken spild %</label>
-                <input type="number" id="wastePlate" min="0" max="50" value="12" step="0.5">
-            </div>
-            <div class="input-group">
-                <label>Buffet spild %</label>
-                <input type="number" id="wasteBuffet" min="0" max="50" value="5" step="0.5">
-            </div>
-        </div>
-    </div>
-
-    <!-- ENERGY EFFICIENCY -->
-    <div class="calc-card" id="energyCard" style="display:none;">
-        <h2><i class="bi bi-lightning-charge"></i> Energieffektivitet</h2>
-        <div class="input-grid">
-            <div class="input-group">
-                <label>Tilberedningsmetode</label>
-                <select id="cookingMethod">
-                    <option value="electric">Elektrisk</option>
-                    <option value="gas">Gas</option>
-                    <option value="mixed">Blandet</option>
-                    <option value="induction">Induktion</option>
-                </select>
-            </div>
-            <div class="input-group">
-                <label>Udstyr energiklasse</label>
-                <select id="energyClass">
-                    <option value="A">A (Mest effektiv)</option>
-                    <option value="B">B</option>
-                    <option value="C">C</option>
-                    <option value="D">D</option>
-                </select>
-            </div>
-            <div class="input-group">
-                <label>Batch cooking</label>
-                <select id="batchCooking">
-                    <option value="yes">Ja - Optimeret</option>
-                    <option value="partial">Delvist</option>
-                    <option value="no">Nej</option>
-                </select>
-            </div>
-        </div>
-    </div>
-
-    <!-- SCENARIO TESTING -->
-    <div class="calc-card" id="scenarioCard" style="display:none;">
-        <h2><i class="bi bi-lightbulb"></i> Test Scenarier</h2>
-        <div class="scenario-grid">
-            <button class="scenario-btn" onclick="applyScenario('meatlessMonday')">
-                🌱 Kødløs Mandag
-            </button>
-            <button class="scenario-btn" onclick="applyScenario('allDanish')">
-                🇩🇰 100% Dansk Kød
-            </button>
-            <button class="scenario-btn" onclick="applyScenario('reducePortions')">
-                📏 Reducer Portioner 10%
-            </button>
-            <button class="scenario-btn" onclick="applyScenario('allOrganic')">
-                🌾 100% Økologisk
-            </button>
-            <button class="scenario-btn" onclick="applyScenario('zeroWaste')">
-                ♻️ Nul-spild Mål
-            </button>
-            <button class="scenario-btn" onclick="applyScenario('reset')">
-                🔄 Nulstil
-            </button>
-        </div>
-    </div>
-
-    <!-- CALCULATE BUTTON -->
-    <button class="calculate-btn" onclick="calculateImpact()">
-        <i class="bi bi-calculator"></i> Beregn Klimaaftryk
-    </button>
-
-    <!-- RESULTS SECTION -->
-    <div id="resultsSection" style="display:none;">
-        <div class="results-hero">
-            <h2 style="color:white; margin:0;">📊 Resultater</h2>
-            <div class="results-main" id="mainResult">-</div>
-            <p style="font-size:1.2rem; margin:0;">kg CO2e per måltid</p>
-
-            <div class="results-grid">
-                <div class="result-card">
-                    <span class="result-value" id="annualTons">-</span>
-                    <span class="result-label">Tons CO2e/år</span>
-                </div>
-                <div class="result-card">
-                    <span class="result-value" id="costSavings">-</span>
-                    <span class="result-label">DKK besparelse/år</span>
-                </div>
-                <div class="result-card">
-                    <span class="result-value" id="vsBaseline">-</span>
-                    <span class="result-label">vs. Baseline</span>
-                </div>
-            </div>
-        </div>
-
-        <!-- AI RECOMMENDATIONS -->
-        <div class="calc-card">
-            <h2><i class="bi bi-robot"></i> AI-Anbefalinger</h2>
-            <div id="recommendationsContainer">
-                <!-- Populated dynamically -->
-            </div>
-        </div>
-    </div>
-
-</div>
+"""
 
-<script>
-let canteens = [];
+script = """let canteens = [];
 let selectedCanteen = null;
 let baselineData = null;
 
@@ -883,12 +656,253 @@ function displayRecommendations(recommendations) {
         container.appendChild(recDiv);
     });
 }
-</script>
+"""
+
+template = """{% extends "base.html" %}
+
+{% block title %}Avanceret Kantineklimaberegner | Vidensbank{% endblock %}
+
+{% block extra_css %}
+<link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.0/font/bootstrap-icons.css">
+<link rel="stylesheet" href="{{ url_for('static', filename='css/calculator_advanced.css') }}">
+{% endblock %}
+
+{% block content %}
+
+<div class="calculator-hero">
+    <h1><i class="bi bi-building"></i> Avanceret Kantineklimaberegner</h1>
+    <p>70+ danske kantiner • Ugentlig menu • Baseline sammenligning • AI-anbefalinger</p>
+</div>
+
+<div class="container" style="max-width: 1400px; margin: 0 auto;">
+
+    <!-- CANTEEN SELECTION -->
+    <div class="calc-card">
+        <h2><i class="bi bi-search"></i> Vælg Kantine</h2>
+        <select id="canteenSelect">
+            <option value="">-- Søg og vælg din kantine --</option>
+        </select>
+        <div id="canteenInfo" style="display:none; margin-top:1.5rem;">
+            <p><strong>📍 Adresse:</strong> <span id="canteenAddress"></span></p>
+            <p><strong>👥 Medarbejdere:</strong> <span id="canteenEmployees"></span></p>
+        </div>
+    </div>
+
+    <!-- BASELINE DISPLAY -->
+    <div class="calc-card" id="baselineCard" style="display:none;">
+        <h2><i class="bi bi-bar-chart-line"></i> Nuværende Baseline</h2>
+        <div class="baseline-grid">
+            <div class="baseline-item">
+                <span class="baseline-value" id="baselineCO2">-</span>
+                <span class="baseline-label">kg CO2e/kg</span>
+            </div>
+            <div class="baseline-item">
+                <span class="baseline-value" id="baselineGreen">-</span>
+                <span class="baseline-label">Grønt %</span>
+            </div>
+            <div class="baseline-item">
+                <span class="baseline-value" id="baselineMeat">-</span>
+                <span class="baseline-label">Kød %</span>
+            </div>
+            <div class="baseline-item">
+                <span class="baseline-value" id="baselineOrganic">-</span>
+                <span class="baseline-label">Økologisk %</span>
+            </div>
+            <div class="baseline-item">
+                <span class="baseline-value" id="baselineWaste">-</span>
+                <span class="baseline-label">Madspild %</span>
+            </div>
+            <div class="baseline-item">
+                <span class="baseline-value" id="baselineLocal">-</span>
+                <span class="baseline-label">Lokalt %</span>
+            </div>
+        </div>
+    </div>
+
+    <!-- WEEKLY MENU PLANNING -->
+    <div class="calc-card" id="menuCard" style="display:none;">
+        <h2><i class="bi bi-calendar-week"></i> Ugentlig Menu (Mandag-Fredag)</h2>
+        <div class="weekly-grid" id="weeklyGrid">
+            <!-- Will be populated dynamically -->
+        </div>
+    </div>
+
+    <!-- PROCUREMENT & SOURCING -->
+    <div class="calc-card" id="procurementCard" style="display:none;">
+        <h2><i class="bi bi-truck"></i> Indkøb & Leverandører</h2>
+        <div class="input-grid">
+            <div class="input-group">
+                <label>Dansk % <span style="color:#2E8B57">🇩🇰</span></label>
+                <input type="number" id="danishPercent" min="0" max="100" value="60">
+            </div>
+            <div class="input-group">
+                <label>EU % <span style="color:#0066cc">🇪🇺</span></label>
+                <input type="number" id="euPercent" min="0" max="100" value="30">
+            </div>
+            <div class="input-group">
+                <label>Global % <span style="color:#666">🌍</span></label>
+                <input type="number" id="globalPercent" min="0" max="100" value="10">
+            </div>
+            <div class="input-group">
+                <label>Økologisk % <span style="color:#4CAF50">🌱</span></label>
+                <input type="number" id="organicPercent" min="0" max="100" value="40">
+            </div>
+        </div>
+    </div>
+
+    <!-- WASTE MANAGEMENT INITIATIVES -->
+    <div class="calc-card" id="wasteCard" style="display:none;">
+        <h2><i class="bi bi-recycle"></i> Madspildsinitiativer</h2>
+        <div class="initiative-grid">
+            <div class="initiative-item">
+                <input type="checkbox" id="initiative1" value="preorder">
+                <label for="initiative1">Forudbestilling fra gæster</label>
+            </div>
+            <div class="initiative-item">
+                <input type="checkbox" id="initiative2" value="portions">
+                <label for="initiative2">Fleksible portioner (S/M/L)</label>
+            </div>
+            <div class="initiative-item">
+                <input type="checkbox" id="initiative3" value="compost">
+                <label for="initiative3">Kompost/biogas system</label>
+            </div>
+            <div class="initiative-item">
+                <input type="checkbox" id="initiative4" value="tracking">
+                <label for="initiative4">Daglig spildregistrering</label>
+            </div>
+            <div class="initiative-item">
+                <input type="checkbox" id="initiative5" value="stock">
+                <label for="initiative5">Optimeret lagerudnyttelse</label>
+            </div>
+        </div>
+        <div class="input-grid" style="margin-top:1.5rem;">
+            <div class="input-group">
+                <label>Forberedelse spild %</label>
+                <input type="number" id="wastePrep" min="0" max="50" value="8" step="0.5">
+            </div>
+            <div class="input-group">
+                <label>Tallerken spild %</label>
+                <input type="number" id="wastePlate" min="0" max="50" value="12" step="0.5">
+            </div>
+            <div class="input-group">
+                <label>Buffet spild %</label>
+                <input type="number" id="wasteBuffet" min="0" max="50" value="5" step="0.5">
+            </div>
+        </div>
+    </div>
+
+    <!-- ENERGY EFFICIENCY -->
+    <div class="calc-card" id="energyCard" style="display:none;">
+        <h2><i class="bi bi-lightning-charge"></i> Energieffektivitet</h2>
+        <div class="input-grid">
+            <div class="input-group">
+                <label>Tilberedningsmetode</label>
+                <select id="cookingMethod">
+                    <option value="electric">Elektrisk</option>
+                    <option value="gas">Gas</option>
+                    <option value="mixed">Blandet</option>
+                    <option value="induction">Induktion</option>
+                </select>
+            </div>
+            <div class="input-group">
+                <label>Udstyr energiklasse</label>
+                <select id="energyClass">
+                    <option value="A">A (Mest effektiv)</option>
+                    <option value="B">B</option>
+                    <option value="C">C</option>
+                    <option value="D">D</option>
+                </select>
+            </div>
+            <div class="input-group">
+                <label>Batch cooking</label>
+                <select id="batchCooking">
+                    <option value="yes">Ja - Optimeret</option>
+                    <option value="partial">Delvist</option>
+                    <option value="no">Nej</option>
+                </select>
+            </div>
+        </div>
+    </div>
+
+    <!-- SCENARIO TESTING -->
+    <div class="calc-card" id="scenarioCard" style="display:none;">
+        <h2><i class="bi bi-lightbulb"></i> Test Scenarier</h2>
+        <div class="scenario-grid">
+            <button class="scenario-btn" onclick="applyScenario('meatlessMonday')">
+                🌱 Kødløs Mandag
+            </button>
+            <button class="scenario-btn" onclick="applyScenario('allDanish')">
+                🇩🇰 100% Dansk Kød
+            </button>
+            <button class="scenario-btn" onclick="applyScenario('reducePortions')">
+                📏 Reducer Portioner 10%
+            </button>
+            <button class="scenario-btn" onclick="applyScenario('allOrganic')">
+                🌾 100% Økologisk
+            </button>
+            <button class="scenario-btn" onclick="applyScenario('zeroWaste')">
+                ♻️ Nul-spild Mål
+            </button>
+            <button class="scenario-btn" onclick="applyScenario('reset')">
+                🔄 Nulstil
+            </button>
+        </div>
+    </div>
+
+    <!-- CALCULATE BUTTON -->
+    <button class="calculate-btn" onclick="calculateImpact()">
+        <i class="bi bi-calculator"></i> Beregn Klimaaftryk
+    </button>
+
+    <!-- RESULTS SECTION -->
+    <div id="resultsSection" style="display:none;">
+        <div class="results-hero">
+            <h2 style="color:white; margin:0;">📊 Resultater</h2>
+            <div class="results-main" id="mainResult">-</div>
+            <p style="font-size:1.2rem; margin:0;">kg CO2e per måltid</p>
+
+            <div class="results-grid">
+                <div class="result-card">
+                    <span class="result-value" id="annualTons">-</span>
+                    <span class="result-label">Tons CO2e/år</span>
+                </div>
+                <div class="result-card">
+                    <span class="result-value" id="costSavings">-</span>
+                    <span class="result-label">DKK besparelse/år</span>
+                </div>
+                <div class="result-card">
+                    <span class="result-value" id="vsBaseline">-</span>
+                    <span class="result-label">vs. Baseline</span>
+                </div>
+            </div>
+        </div>
+
+        <!-- AI RECOMMENDATIONS -->
+        <div class="calc-card">
+            <h2><i class="bi bi-robot"></i> AI-Anbefalinger</h2>
+            <div id="recommendationsContainer">
+                <!-- Populated dynamically -->
+            </div>
+        </div>
+    </div>
+
+</div>
 
+{% endblock %}
+
+{% block extra_js %}
+<script defer src="{{ url_for('static', filename='js/calculator_advanced.js') }}"></script>
 {% endblock %}
 """
 
-with open('templates/calculator_advanced.html', 'w', encoding='utf-8') as f:
-    f.write(template)
+files = {
+    'static/css/calculator_advanced.css': styles,
+    'static/js/calculator_advanced.js': script,
+    'templates/calculator_advanced.html': template,
+}
+
+for path, content in files.items():
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
 
 print('[OK] Advanced calculator template created successfully!')
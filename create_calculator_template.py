@@ -1,16 +1,9 @@
 """
 Script to create the advanced calculator template
+and its static CSS/JS bundles
 """
 
-template = """{% extends "base.html" %}
-
-{% block title %}Klimaberegner | Vidensbank{% endblock %}
-
-{% block content %}
-<link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.0/font/bootstrap-icons.css">
-
-<style>
-.calculator-hero {
+styles = """.calculator-hero {
     background: linear-gradient(135deg, #2E8B57 0%, #4CAF50 100%);
     color: white;
     padding: 4rem 2rem;
@@ -42,7 +35,83 @@ template = """{% extends "base.html" %}
 .segment-bright { background: linear-gradient(135deg, #e67e22, #f39c12); }
 .segment-fish { background: linear-gradient(135deg, #3498db, #5dade2); }
 .segment-veg { background: linear-gradient(135deg, #27ae60, #2ecc71); }
-</style>
+"""
+
+script = """let dist = {r:30, b:40, f:15, v:15};
+function upd(){
+    let r=+document.getElementById('redMeat').value;
+    let b=+document.getElementById('brightMeat').value;
+    let f=+document.getElementById('fish').value;
+    let v=+document.getElementById('vegetarian').value;
+    let t=r+b+f+v;
+    document.getElementById('redVal').textContent=r+'%';
+    document.getElementById('brightVal').textContent=b+'%';
+    document.getElementById('fishVal').textContent=f+'%';
+    document.getElementById('vegVal').textContent=v+'%';
+    document.getElementById('total').textContent=t;
+    document.getElementById('segmentRed').style.width=r+'%';
+    document.getElementById('segmentBright').style.width=b+'%';
+    document.getElementById('segmentFish').style.width=f+'%';
+    document.getElementById('segmentVeg').style.width=v+'%';
+    document.getElementById('segmentRed').textContent=r>8?'Rødt '+r+'%':'';
+    document.getElementById('segmentBright').textContent=b>8?'Lyst '+b+'%':'';
+    document.getElementById('segmentFish').textContent=f>8?'Fisk '+f+'%':'';
+    document.getElementById('segmentVeg').textContent=v>8?'Veg '+v+'%':'';
+    document.getElementById('warn').style.display=t!==100?'inline':'none';
+    dist={r,b,f,v};
+}
+async function calc(){
+    if(dist.r+dist.b+dist.f+dist.v!==100){alert('Total skal være 100%'); return;}
+    try{
+        let res=await fetch('/api/calculate-canteen-impact',{
+            method:'POST',
+            headers:{'Content-Type':'application/json'},
+            body:JSON.stringify({
+                employees:+document.getElementById('employees').value,
+                attendance_rate:+document.getElementById('attendance').value/100,
+                operating_days:+document.getElementById('operating_days').value,
+                meals_per_day:1,
+                meat_distribution:{red_meat_percent:dist.r,bright_meat_percent:dist.b,fish_percent:dist.f,vegetarian_percent:dist.v},
+                portion_sizes:{protein_gram:120,vegetables_gram:200,carbs_gram:150},
+                organic_percent:{meat:40,vegetables:60,dairy:30},
+                waste:{preparation:8,plate:12,buffet:5},
+                local_sourcing:60,
+                seasonal_produce:50
+            })
+        });
+        let d=await res.json();
+        if(d.success){
+            document.getElementById('results').style.display='block';
+            document.getElementById('mainRes').textContent=d.results.per_meal_kg.toFixed(2);
+            document.getElementById('tons').textContent=d.results.annual_tons.toFixed(1);
+            document.getElementById('savings').textContent=Math.round(d.results.estimated_cost_savings_dkk).toLocaleString();
+            let h='';
+            d.results.recommendations.forEach(r=>{
+                h+=`<div style="background:#f8f9fa; padding:1.5rem; border-radius:8px; margin-bottom:1rem; border-left:4px solid #2E8B57;">
+                    <div style="font-weight:700; margin-bottom:0.5rem;">${r.priority}. ${r.title}</div>
+                    <div style="color:#7f8c8d; margin-bottom:0.75rem;">${r.description}</div>
+                    <div><strong>${r.annual_saving_tons.toFixed(1)} tons/år</strong> • ${r.implementation_time} • ${r.difficulty}</div>
+                </div>`;
+            });
+            document.getElementById('recs').innerHTML=h;
+            document.getElementById('results').scrollIntoView({behavior:'smooth'});
+        }
+    }catch(e){alert('Fejl: '+e.message);}
+}
+['redMeat','brightMeat','fish','vegetarian'].forEach(id=>document.getElementById(id).addEventListener('input',upd));
+upd();
+"""
+
+template = """{% extends "base.html" %}
+
+{% block title %}Klimaberegner | Vidensbank{% endblock %}
+
+{% block extra_css %}
+<link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.0/font/bootstrap-icons.css">
+<link rel="stylesheet" href="{{ url_for('static', filename='css/calculator.css') }}">
+{% endblock %}
+
+{% block content %}
 
 <div class="calculator-hero">
     <h1>🌱 Avanceret Klimaberegner</h1>
@@ -110,75 +179,21 @@ template = """{% extends "base.html" %}
     </div>
 </div>
 
-<script>
-let dist = {r:30, b:40, f:15, v:15};
-function upd(){
-    let r=+document.getElementById('redMeat').value;
-    let b=+document.getElementById('brightMeat').value;
-    let f=+document.getElementById('fish').value;
-    let v=+document.getElementById('vegetarian').value;
-    let t=r+b+f+v;
-    document.getElementById('redVal').textContent=r+'%';
-    document.getElementById('brightVal').textContent=b+'%';
-    document.getElementById('fishVal').textContent=f+'%';
-    document.getElementById('vegVal').textContent=v+'%';
-    document.getElementById('total').textContent=t;
-    document.getElementById('segmentRed').style.width=r+'%';
-    document.getElementById('segmentBright').style.width=b+'%';
-    document.getElementById('segmentFish').style.width=f+'%';
-    document.getElementById('segmentVeg').style.width=v+'%';
-    document.getElementById('segmentRed').textContent=r>8?'Rødt '+r+'%':'';
-    document.getElementById('segmentBright').textContent=b>8?'Lyst '+b+'%':'';
-    document.getElementById('segmentFish').textContent=f>8?'Fisk '+f+'%':'';
-    document.getElementById('segmentVeg').textContent=v>8?'Veg '+v+'%':'';
-    document.getElementById('warn').style.display=t!==100?'inline':'none';
-    dist={r,b,f,v};
-}
-async function calc(){
-    if(dist.r+dist.b+dist.f+dist.v!==100){alert('Total skal være 100%'); return;}
-    try{
-        let res=await fetch('/api/calculate-canteen-impact',{
-            method:'POST',
-            headers:{'Content-Type':'application/json'},
-            body:JSON.stringify({
-                employees:+document.getElementById('employees').value,
-                attendance_rate:+document.getElementById('attendance').value/100,
-                operating_days:+document.getElementById('operating_days').value,
-                meals_per_day:1,
-                meat_distribution:{red_meat_percent:dist.r,bright_meat_percent:dist.b,fish_percent:dist.f,vegetarian_percent:dist.v},
-                portion_sizes:{protein_gram:120,vegetables_gram:200,carbs_gram:150},
-                organic_percent:{meat:40,vegetables:60,dairy:30},
-                waste:{preparation:8,plate:12,buffet:5},
-                local_sourcing:60,
-                seasonal_produce:50
-            })
-        });
-        let d=await res.json();
-        if(d.success){
-            document.getElementById('results').style.display='block';
-            document.getElementById('mainRes').textContent=d.results.per_meal_kg.toFixed(2);
-            document.getElementById('tons').textContent=d.results.annual_tons.toFixed(1);
-            document.getElementById('savings').textContent=Math.round(d.results.estimated_cost_savings_dkk).toLocaleString();
-            let h='';
-            d.results.recommendations.forEach(r=>{
-                h+=`<div style="background:#f8f9fa; padding:1.5rem; border-radius:8px; margin-bottom:1rem; border-left:4px solid #2E8B57;">
-                    <div style="font-weight:700; margin-bottom:0.5rem;">${r.priority}. ${r.title}</div>
-                    <div style="color:#7f8c8d; margin-bottom:0.75rem;">${r.description}</div>
-                    <div><strong>${r.annual_saving_tons.toFixed(1)} tons/år</strong> • ${r.implementation_time} • ${r.difficulty}</div>
-                </div>`;
-            });
-            document.getElementById('recs').innerHTML=h;
-            document.getElementById('results').scrollIntoView({behavior:'smooth'});
-        }
-    }catch(e){alert('Fejl: '+e.message);}
-}
-['redMeat','brightMeat','fish','vegetarian'].forEach(id=>document.getElementById(id).addEventListener('input',upd));
-upd();
-</script>
+{% endblock %}
+
+{% block extra_js %}
+<script defer src="{{ url_for('static', filename='js/calculator.js') }}"></script>
 {% endblock %}
 """
 
-with open('templates/calculator.html', 'w', encoding='utf-8') as f:
-    f.write(template)
+files = {
+    'static/css/calculator.css': styles,
+    'static/js/calculator.js': script,
+    'templates/calculator.html': template,
+}
+
+for path, content in files.items():
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
 
 print('[OK] Calculator template created successfully!')
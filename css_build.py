@@ -0,0 +1,193 @@
+"""
+Stylesheet Build Module for Vidensbank
+Compiles the purged Tailwind + site stylesheet at build time, fingerprints it and
+extracts the critical above-the-fold CSS that base.html inlines
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import re
+import shlex
+import subprocess
+import tempfile
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+INPUT_CSS = os.path.join('static', 'src', 'input.css')
+TAILWIND_CONFIG = 'tailwind.config.js'
+OUTPUT_DIR = 'dist'
+MANIFEST_NAME = 'css-manifest.json'
+
+# Templates whose markup is visible before the first scroll on every page
+CRITICAL_TEMPLATES = ('base.html', 'partials/header.html')
+
+# Lines from the top of each page template counted as the hero section
+HERO_LINES = 30
+
+CLASS_ATTRIBUTE = re.compile(r'''\bclass=["']([^"']*)["']''')
+SELECTOR_CLASS = re.compile(r'\.((?:\\.|[\w-])+)')
+
+
+class StylesheetBundle:
+    """Exposes the built stylesheet to templates as `css_bundle`"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self.bundle = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['css_bundle'] = self
+        app.jinja_env.globals['css_bundle'] = self.get_bundle
+        self.app = app
+        self.reload()
+
+    def reload(self):
+        """Load the manifest and critical CSS written by build_css()"""
+        output_root = os.path.join(self.app.static_folder, OUTPUT_DIR)
+        try:
+            with open(os.path.join(output_root, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            with open(os.path.join(output_root, manifest['critical']), 'r', encoding='utf-8') as f:
+                critical = f.read()
+        except (FileNotFoundError, KeyError, json.JSONDecodeError):
+            self.bundle = None
+            return
+        self.bundle = {
+            'filename': f"{OUTPUT_DIR}/{manifest['stylesheet']}",
+            'critical': critical
+        }
+
+    def get_bundle(self):
+        """Returns the built bundle, or None to fall back to the Tailwind CDN"""
+        return self.bundle
+
+
+def build_css(app, tailwind_bin=None):
+    """
+    Compile static/src/input.css with the Tailwind CLI, which purges every class
+    not found in the templates, then fingerprint it and extract the critical CSS.
+
+    Args:
+        app: Flask application (for the project and static paths)
+        tailwind_bin: Tailwind CLI command, defaults to $TAILWIND_BIN or `npx tailwindcss`
+
+    Returns:
+        Dict with the stylesheet filename and the full and critical sizes
+    """
+    root = app.root_path
+    output_root = os.path.join(app.static_folder, OUTPUT_DIR)
+    os.makedirs(output_root, exist_ok=True)
+
+    tailwind_bin = tailwind_bin or os.environ.get('TAILWIND_BIN', 'npx --no-install tailwindcss')
+    with tempfile.TemporaryDirectory() as tmp:
+        compiled_path = os.path.join(tmp, 'app.css')
+        command = shlex.split(tailwind_bin) + [
+            '--config', os.path.join(root, TAILWIND_CONFIG),
+            '--input', os.path.join(root, INPUT_CSS),
+            '--output', compiled_path,
+            '--minify'
+        ]
+        subprocess.run(command, cwd=root, check=True)
+        with open(compiled_path, 'r', encoding='utf-8') as f:
+            css = f.read()
+
+    template_dir = os.path.join(root, app.template_folder)
+    critical = extract_critical_css(css, collect_critical_classes(template_dir))
+
+    digest = hashlib.sha256(css.encode('utf-8')).hexdigest()[:12]
+    stylesheet = f"app.{digest}.css"
+    critical_name = f"critical.{digest}.css"
+
+    # Drop bundles from earlier builds
+    for old in glob.glob(os.path.join(output_root, 'app.*.css')) + glob.glob(os.path.join(output_root, 'critical.*.css')):
+        if os.path.basename(old) not in (stylesheet, critical_name):
+            os.remove(old)
+
+    for name, content in ((stylesheet, css), (critical_name, critical)):
+        with open(os.path.join(output_root, name), 'w', encoding='utf-8') as f:
+            f.write(content)
+    with open(os.path.join(output_root, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump({'stylesheet': stylesheet, 'critical': critical_name}, f, indent=2)
+
+    return {'stylesheet': stylesheet, 'size': len(css), 'critical_size': len(critical)}
+
+
+def collect_critical_classes(template_dir):
+    """Classes used by the shared page shell and the hero section of every template"""
+    def scan(path, max_lines=None):
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+        text = ''.join(lines[:max_lines] if max_lines else lines)
+        found = set()
+        for attribute in CLASS_ATTRIBUTE.findall(text):
+            found.update(attribute.split())
+        return found
+
+    shell = [os.path.join(template_dir, name) for name in CRITICAL_TEMPLATES]
+    pages = [
+        path for path in glob.glob(os.path.join(template_dir, '**', '*.html'), recursive=True)
+        if os.path.relpath(path, template_dir).replace(os.sep, '/') not in CRITICAL_TEMPLATES
+    ]
+
+    classes = set()
+    for path in shell:
+        classes |= scan(path)
+    for path in pages:
+        classes |= scan(path, HERO_LINES)
+    return classes
+
+
+def extract_critical_css(css, classes):
+    """
+    Keep the rules that apply to the given classes, plus element-only rules
+    such as the Tailwind preflight. @media blocks are filtered recursively;
+    @keyframes and @font-face are left to the full stylesheet.
+    """
+    output = []
+    for prelude, body in _split_rules(css):
+        if prelude.startswith('@media') or prelude.startswith('@supports'):
+            inner = extract_critical_css(body, classes)
+            if inner:
+                output.append(f"{prelude}{{{inner}}}")
+        elif prelude.startswith('@'):
+            continue
+        elif any(_selector_matches(selector, classes) for selector in prelude.split(',')):
+            output.append(f"{prelude}{{{body}}}")
+    return ''.join(output)
+
+
+def _selector_matches(selector, classes):
+    needed = [name.replace('\\', '') for name in SELECTOR_CLASS.findall(selector)]
+    return all(name in classes for name in needed)
+
+
+def _split_rules(css):
+    """Yield (prelude, body) for each top-level rule of minified CSS"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    position = 0
+    length = len(css)
+    while position < length:
+        start = css.find('{', position)
+        if start == -1:
+            return
+        prelude = css[position:start].strip()
+        depth = 1
+        cursor = start + 1
+        while cursor < length and depth:
+            if css[cursor] == '{':
+                depth += 1
+            elif css[cursor] == '}':
+                depth -= 1
+            cursor += 1
+        body = css[start + 1:cursor - 1]
+        # Statements like @charset end with ';' before the next rule
+        if ';' in prelude and prelude.startswith('@'):
+            prelude = prelude.rsplit(';', 1)[-1].strip()
+        yield prelude, body
+        position = cursor
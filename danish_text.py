@@ -0,0 +1,104 @@
+"""
+Danish Text Module for Vidensbank
+Tokenizing, stemming (Snowball Danish) and æ/ø/å folding for the search indexes
+"""
+
+from functools import lru_cache
+import re
+import unicodedata
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+VOWELS = frozenset('aeiouyæåø')
+# Letters that may precede a plural/genitive s that is removed
+S_ENDINGS = frozenset('abcdfghjklmnoprtvyzå')
+STEP1_SUFFIXES = sorted((
+    'hed', 'ethed', 'ered', 'e', 'erede', 'ende', 'erende', 'ene', 'erne', 'ere', 'en', 'heden',
+    'eren', 'er', 'heder', 'erer', 'heds', 'es', 'endes', 'erendes', 'enes', 'ernes', 'eres',
+    'ens', 'hedens', 'erens', 'ers', 'ets', 'erets', 'et', 'eret'
+), key=len, reverse=True)
+STEP3_SUFFIXES = ('elig', 'løst', 'lig', 'els', 'ig')
+
+# Snowball Danish stop words
+STOP_WORDS = frozenset("""
+    og i jeg det at en den til er som på de med han af for ikke der var mig sig men et har om
+    vi min havde ham hun nu over da fra du ud sin dem os op man hans hvor eller hvad skal selv
+    her alle vil blev kunne ind når være dog noget ville jo deres efter ned skulle denne end
+    dette mit også under have dig anden hende mine alt meget sit sine vor mod disse hvis din
+    nogle hos blive mange ad bliver hendes været thi jer sådan
+""".split())
+
+FOLDING = str.maketrans({'æ': 'ae', 'ø': 'o', 'Æ': 'Ae', 'Ø': 'O'})
+
+
+@lru_cache(maxsize=65536)
+def fold(word):
+    """Fold Danish letters and accents to ASCII, so 'økologi' and 'okologi' meet"""
+    decomposed = unicodedata.normalize('NFKD', word.translate(FOLDING))
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def stem(word):
+    """Snowball Danish stemmer (https://snowballstem.org/algorithms/danish/stemmer.html)"""
+    r1 = _region1(word)
+
+    # Step 1: main suffixes
+    for suffix in STEP1_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= r1:
+            word = word[:-len(suffix)]
+            break
+    else:
+        if word.endswith('s') and len(word) - 1 >= r1 and len(word) > 1 and word[-2] in S_ENDINGS:
+            word = word[:-1]
+
+    # Step 2: consonant pairs
+    word = _consonant_pair(word, r1)
+
+    # Step 3: other suffixes
+    if word.endswith('igst'):
+        word = word[:-2]
+    for suffix in STEP3_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= r1:
+            if suffix == 'løst':
+                word = word[:-1]
+            else:
+                word = _consonant_pair(word[:-len(suffix)], r1)
+            break
+
+    # Step 4: undouble a final consonant
+    if len(word) - 2 >= r1 and word[-1] == word[-2] and word[-1] not in VOWELS:
+        word = word[:-1]
+    return word
+
+
+# Vocabulary is small and repetitive, so snippets and queries mostly hit the cache
+@lru_cache(maxsize=65536)
+def normalize(word):
+    """Index/query form of a single word: lowercased, stemmed, folded"""
+    return fold(stem(word.lower()))
+
+
+def tokenize(text):
+    """
+    Yield (term, start, end) for every indexable word in text; stop words
+    and single letters are skipped.
+    """
+    for match in TOKEN_PATTERN.finditer(text):
+        word = match.group(0).lower()
+        if len(word) < 2 or word in STOP_WORDS:
+            continue
+        yield normalize(word), match.start(), match.end()
+
+
+def _region1(word):
+    # R1 starts after the first consonant that follows a vowel, but not before the 4th letter
+    for i in range(1, len(word)):
+        if word[i] not in VOWELS and word[i - 1] in VOWELS:
+            return max(i + 1, 3)
+    return len(word)
+
+
+def _consonant_pair(word, r1):
+    if word[-2:] in ('gd', 'dt', 'gt', 'kt') and len(word) - 2 >= r1:
+        return word[:-1]
+    return word
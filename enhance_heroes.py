@@ -6,20 +6,15 @@ for filepath in glob.glob('templates/products/*.html', recursive=True):
     with open(filepath, 'r', encoding='utf-8') as f:
         content = f.read()
 
-    # Find all Unsplash URLs in hero sections and add quality parameters
-    # Pattern: url('https://images.unsplash.com/photo-XXXXX')
-    def enhance_unsplash_url(match):
-        url = match.group(1)
-        # Remove any existing parameters
-        base_url = url.split('?')[0]
-        # Add premium quality parameters
-        enhanced_url = f"{base_url}?w=1920&q=85&fit=crop&crop=entropy"
-        return f"url('{enhanced_url}')"
+    # Hero backgrounds go through the /img proxy; request its largest width
+    # Pattern: url('{{ remote_image_url("photo-XXXXX", 960) }}')
+    def enhance_hero_width(match):
+        return f'url(\'{{{{ remote_image_url("{match.group(1)}", 1920) }}}}\')'
 
-    # Replace Unsplash URLs in background-image styles
+    # Replace hero widths in background-image styles
     content = re.sub(
-        r"url\('(https://images\.unsplash\.com/photo-[^']+)'\)",
-        enhance_unsplash_url,
+        r"url\('\{\{ remote_image_url\(\"(photo-[^\"]+)\"(?:, \d+)?\) \}\}'\)",
+        enhance_hero_width,
         content
     )
 
@@ -0,0 +1,101 @@
+"""
+Fragment Cache Module for Vidensbank
+Jinja {% cache %} tag that renders expensive partials once per variant per worker
+"""
+
+from flask import request
+from jinja2 import nodes
+from jinja2.ext import Extension
+from collections import OrderedDict
+from page_cache import auth_state
+import logging
+import threading
+import uuid
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class CacheExtension(Extension):
+    """
+    {% cache 'header', auth_state(), active_section() %}...{% endcache %}
+
+    The block body is rendered once per distinct key and reused afterwards.
+    Only use it for markup that depends on nothing but the key.
+    """
+
+    tags = {'cache'}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=None)
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        key = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            key.append(parser.parse_expression())
+        body = parser.parse_statements(['name:endcache'], drop_needle=True)
+
+        # Unique per compilation, so editing the template never serves the old markup
+        block_id = nodes.Const(f"{parser.name}:{lineno}:{uuid.uuid4().hex[:8]}")
+        call = self.call_method('_render_block', [block_id, nodes.List(key)])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render_block(self, block_id, key, caller):
+        cache = self.environment.fragment_cache
+        if cache is None:
+            return caller()
+        return cache.get_or_render((block_id, *key), caller)
+
+
+def active_section():
+    """
+    Leading static segments of the matched URL rule, e.g. 'vidensbank/emissioner'.
+    Uses the rule rather than the path so unknown URLs cannot grow the cache.
+    """
+    if request.url_rule is None:
+        return ''
+    segments = [part for part in request.url_rule.rule.strip('/').split('/') if not part.startswith('<')]
+    return '/'.join(segments[:2])
+
+
+class FragmentCache:
+    """Per-worker LRU store behind the {% cache %} tag"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self._fragments = OrderedDict()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('FRAGMENT_CACHE_ENABLED', True)
+        app.config.setdefault('FRAGMENT_CACHE_SIZE', 256)
+        app.jinja_env.add_extension(CacheExtension)
+        app.jinja_env.fragment_cache = self
+        app.jinja_env.globals.update(auth_state=auth_state, active_section=active_section)
+        app.extensions['fragment_cache'] = self
+        self.app = app
+
+    def get_or_render(self, key, render):
+        if not self.app.config['FRAGMENT_CACHE_ENABLED']:
+            return render()
+
+        with self._lock:
+            markup = self._fragments.get(key)
+            if markup is not None:
+                self._fragments.move_to_end(key)
+                return markup
+
+        markup = render()
+        with self._lock:
+            self._fragments[key] = markup
+            while len(self._fragments) > self.app.config['FRAGMENT_CACHE_SIZE']:
+                self._fragments.popitem(last=False)
+        return markup
+
+    def clear(self):
+        with self._lock:
+            self._fragments.clear()
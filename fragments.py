@@ -0,0 +1,48 @@
+"""
+Fragments Module for Vidensbank
+Lets in-site navigation fetch only the content block of a page instead of the whole shell
+"""
+
+from flask import request, session
+import logging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Request header sent by static/js/main.js when it wants just the content block
+FRAGMENT_HEADER = 'X-Fragment'
+FRAGMENT_VALUE = 'content'
+
+
+def is_fragment_request():
+    """True when the client asked for the content block only"""
+    if request.headers.get(FRAGMENT_HEADER) != FRAGMENT_VALUE:
+        return False
+    # Flash messages live in the shell, so those requests get the full page
+    return '_flashes' not in session
+
+
+class Fragments:
+    """Fragment rendering mode for templates extending base.html"""
+
+    def __init__(self, app=None):
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('FRAGMENTS_ENABLED', True)
+        app.context_processor(self.inject_fragment_flag)
+        app.after_request(self.add_vary_header)
+        app.extensions['fragments'] = self
+        self.app = app
+
+    def inject_fragment_flag(self):
+        """Make `fragment_request` available to base.html"""
+        return {'fragment_request': self.app.config['FRAGMENTS_ENABLED'] and is_fragment_request()}
+
+    def add_vary_header(self, response):
+        """HTML differs with the fragment header, so shared caches must key on it"""
+        if self.app.config['FRAGMENTS_ENABLED'] and response.mimetype == 'text/html':
+            response.vary.add(FRAGMENT_HEADER)
+        return response
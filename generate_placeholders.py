@@ -9,7 +9,7 @@ PLACEHOLDER_TEMPLATE = """{{%extends "base.html" %}}
 {{%block title %}}{title} - Vidensbank{{%endblock %}}
 
 {{%block content %}}
-<header class="hero-video-container" style="background-image: url('{hero_image}');">
+<header class="hero-video-container" style="background-image: url('{{{{ remote_image_url("{hero_image}") }}}}');">
   <div class="bg-overlay-dark"></div>
   <div class="hero-content">
     <h1 class="hero-title">{page_title}</h1>
@@ -54,7 +54,7 @@ PAGES_CONFIG = {
             'why': {
                 'title': 'Hvorfor er økologi vigtigt?',
                 'subtitle': 'Miljø, dyrevelfærd og marked',
-                'hero_image': 'https://images.unsplash.com/photo-1500382017468-9049fed747ef',
+                'hero_image': 'photo-1500382017468-9049fed747ef',
                 'lead_text': 'Økologi har betydning for miljø, dyrevelfærd og forbrugertillid. Danmark har verdens højeste markedsandel af økologi.',
                 'section1_title': 'Betydning for danske kantiner',
                 'section1_text': 'Økologi er ofte en del af virksomheders bæredygtighedsmål. Mange offentlige kantiner har økologimål på 60-90%.',
@@ -65,7 +65,7 @@ PAGES_CONFIG = {
             'goal': {
                 'title': 'Mål & Ambition - Økologi',
                 'subtitle': 'Strategisk brug af økologi',
-                'hero_image': 'https://images.unsplash.com/photo-1530836369250-ef72a3f5cda8',
+                'hero_image': 'photo-1530836369250-ef72a3f5cda8',
                 'lead_text': 'Målet er at bruge økologi strategisk som en del af en samlet bæredygtighedsstrategi.',
                 'section1_title': 'Vision',
                 'section1_text': 'Økologi skal være en naturlig del af kantinens sortiment uden at dominere budgettet unødigt.',
@@ -76,7 +76,7 @@ PAGES_CONFIG = {
             'impact': {
                 'title': 'Mit Aftryk - Økologi',
                 'subtitle': 'Dine valg om økologi',
-                'hero_image': 'https://images.unsplash.com/photo-1542838132-92c53300491e',
+                'hero_image': 'photo-1542838132-92c53300491e',
                 'lead_text': 'Dit valg af økologiske råvarer påvirker både miljø, dyrevelfærd og kantinens image.',
                 'section1_title': 'Strategiske valg',
                 'section1_text': 'Vælg økologi hvor det giver mest mening – f.eks. mælkeprodukter, æg og grøntsager.',
@@ -87,7 +87,7 @@ PAGES_CONFIG = {
             'tips': {
                 'title': 'Tips & Tricks - Økologi',
                 'subtitle': 'Praktisk brug af økologi',
-                'hero_image': 'https://images.unsplash.com/photo-1518843875459-f738682238a6',
+                'hero_image': 'photo-1518843875459-f738682238a6',
                 'lead_text': 'Konkrete metoder til at øge økologiandelen uden at sprænge budgettet.',
                 'section1_title': 'Budgetvenlige strategier',
                 'section1_text': 'Brug økologi på basisvarer som mælk, æg, pasta og ris. Kombiner med sæsonvarer og lokale leverandører.',
@@ -103,7 +103,7 @@ PAGES_CONFIG = {
             'what': {
                 'title': 'Hvad er vandforbrug i fødevareproduktion?',
                 'subtitle': 'Blåt, grønt og gråt vand',
-                'hero_image': 'https://images.unsplash.com/photo-1578575437130-527eed3abbec',
+                'hero_image': 'photo-1578575437130-527eed3abbec',
                 'lead_text': 'Vandaftryk måler hvor meget vand der bruges til at producere fødevarer. Det omfatter både direkte vanding og vand i forsyningskæden.',
                 'section1_title': 'De tre typer vand',
                 'section1_text': 'Blåt vand er overfladevand, grønt vand er regnvand, og gråt vand er forurenet vand der skal renses.',
@@ -114,7 +114,7 @@ PAGES_CONFIG = {
             'why': {
                 'title': 'Hvorfor er vandforbrug vigtigt?',
                 'subtitle': 'Vandknaphed globalt',
-                'hero_image': 'https://images.unsplash.com/photo-1559827260-dc66d52bef19',
+                'hero_image': 'photo-1559827260-dc66d52bef19',
                 'lead_text': 'Globalt er ferskvand en knap ressource. Fødevareproduktion står for omkring 70% af det globale vandforbrug.',
                 'section1_title': 'Betydning for Danmark',
                 'section1_text': 'Selvom Danmark har rigeligt vand, importerer vi fødevarer fra vandknappe områder.',
@@ -125,7 +125,7 @@ PAGES_CONFIG = {
             'goal': {
                 'title': 'Mål & Ambition - Vandforbrug',
                 'subtitle': 'Vandbevidste valg',
-                'hero_image': 'https://images.unsplash.com/photo-1559825481-12a05cc00344',
+                'hero_image': 'photo-1559825481-12a05cc00344',
                 'lead_text': 'Målet er at integrere vandbevidsthed i indkøbsbeslutninger.',
                 'section1_title': 'Vision',
                 'section1_text': 'Kantiner skal kunne vælge råvarer med lavere vandaftryk hvor det er relevant.',
@@ -136,7 +136,7 @@ PAGES_CONFIG = {
             'impact': {
                 'title': 'Mit Aftryk - Vandforbrug',
                 'subtitle': 'Råvarevalg og vand',
-                'hero_image': 'https://images.unsplash.com/photo-1523301343968-6a6ebf63c672',
+                'hero_image': 'photo-1523301343968-6a6ebf63c672',
                 'lead_text': 'Dit valg af protein og grøntsager påvirker indirekte vandforbruget.',
                 'section1_title': 'Vand-intensive fødevarer',
                 'section1_text': 'Oksekød, lam, nødder og ris har højt vandforbrug. Kylling, bælgfrugter og de fleste grøntsager har lavere aftryk.',
@@ -147,7 +147,7 @@ PAGES_CONFIG = {
             'tips': {
                 'title': 'Tips & Tricks - Vandforbrug',
                 'subtitle': 'Praktiske greb',
-                'hero_image': 'https://images.unsplash.com/photo-1551836022-aadb801c60ae',
+                'hero_image': 'photo-1551836022-aadb801c60ae',
                 'lead_text': 'Konkrete metoder til at reducere vandaftryk gennem menuvalg.',
                 'section1_title': 'Strategier',
                 'section1_text': 'Prioriter kylling over oksekød, bælgfrugter over nødder, og europæiske grøntsager over importvarer fra tørre områder.',
@@ -163,7 +163,7 @@ PAGES_CONFIG = {
             'what': {
                 'title': 'Hvad er madspild?',
                 'subtitle': 'Definition og omfang',
-                'hero_image': 'https://images.unsplash.com/photo-1466637574441-749b8f19452f',
+                'hero_image': 'photo-1466637574441-749b8f19452f',
                 'lead_text': 'Madspild er mad, der kunne have været spist af mennesker, men som i stedet smides væk eller går til andet formål.',
                 'section1_title': 'De tre typer madspild',
                 'section1_text': 'Produktionsspild (i køkkenet), buffetspild (overskud) og tallerkenssp ild (fra gæster).',
@@ -174,7 +174,7 @@ PAGES_CONFIG = {
             'why': {
                 'title': 'Hvorfor er madspild vigtigt?',
                 'subtitle': 'Klima, økonomi og etik',
-                'hero_image': 'https://images.unsplash.com/photo-1532996122724-e3c354a0b15b',
+                'hero_image': 'photo-1532996122724-e3c354a0b15b',
                 'lead_text': 'Madspild er et af de største klimaproblemer i fødevaresystemet, og koster samtidig kantiner mange penge.',
                 'section1_title': 'Det tredobbelte tab',
                 'section1_text': 'Madspild betyder spildt klima, spildte penge og spildte ressourcer.',
@@ -185,7 +185,7 @@ PAGES_CONFIG = {
             'goal': {
                 'title': 'Mål & Ambition - Madspild',
                 'subtitle': 'Halvering af spild',
-                'hero_image': 'https://images.unsplash.com/photo-1542838132-92c53300491e',
+                'hero_image': 'photo-1542838132-92c53300491e',
                 'lead_text': 'Målet er at halvere madspildet fra nuværende niveau gennem systematisk måling og handling.',
                 'section1_title': 'Vision',
                 'section1_text': 'Kantiner skal kunne måle, forstå og reducere madspild på tværs af alle faser.',
@@ -196,7 +196,7 @@ PAGES_CONFIG = {
             'impact': {
                 'title': 'Mit Aftryk - Madspild',
                 'subtitle': 'Din rolle',
-                'hero_image': 'https://images.unsplash.com/photo-1588964895597-cfccd6e2dbf9',
+                'hero_image': 'photo-1588964895597-cfccd6e2dbf9',
                 'lead_text': 'Dit ansvar for portionering, produktion og kommunikation påvirker direkte madspildet.',
                 'section1_title': 'Hvor du kan gøre en forskel',
                 'section1_text': 'Planlæg produktionen bedre, optimer portionsstørrelser, og gør det nemt for gæster at tage mindre.',
@@ -207,7 +207,7 @@ PAGES_CONFIG = {
             'tips': {
                 'title': 'Tips & Tricks - Madspild',
                 'subtitle': 'Praktiske værktøjer',
-                'hero_image': 'https://images.unsplash.com/photo-1504674900247-0877df9cc836',
+                'hero_image': 'photo-1504674900247-0877df9cc836',
                 'lead_text': 'Konkrete metoder til at måle, forstå og reducere madspild i kantinen.',
                 'section1_title': 'Kom i gang',
                 'section1_text': 'Mål spild i en uge, identificer de største kilder, og sæt mål for reduktion. Brug historiske data til bedre planlægning.',
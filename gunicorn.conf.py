@@ -0,0 +1,47 @@
+"""
+Gunicorn configuration for Vidensbank
+Loaded automatically by `gunicorn app:app` from the project root
+"""
+
+import subprocess
+import sys
+
+# `flask pdf-worker`, started next to the web workers so it shares their instance folder
+pdf_worker = None
+
+
+def when_ready(server):
+    """Start the PDF job worker once the master is up"""
+    global pdf_worker
+    pdf_worker = subprocess.Popen([sys.executable, '-m', 'flask', '--app', 'app', 'pdf-worker'])
+    server.log.info("Started pdf-worker (pid %d)", pdf_worker.pid)
+
+
+def on_exit(server):
+    if pdf_worker is not None and pdf_worker.poll() is None:
+        pdf_worker.terminate()
+        pdf_worker.wait(timeout=30)
+
+
+def post_worker_init(worker):
+    """Load every template and render the static pages before taking traffic"""
+    from app import page_cache, search_index, suggestions, template_cache
+
+    summary = template_cache.load_all()
+    worker.log.info(
+        "Loaded %d templates in %.0f ms (%d from bytecode cache, %d compiled, %d failed)",
+        summary['loaded'], summary['seconds'] * 1000,
+        summary['from_cache'], summary['compiled'], len(summary['failed'])
+    )
+
+    worker.log.info("Page cache warmed with %d pages", page_cache.warm())
+    worker.log.info("Suggestion trie built with %d entries", suggestions.warm())
+    worker.log.info("Search cache warmed with %d popular queries", search_index.warm())
+
+
+def worker_exit(server, worker):
+    """Keep the search counts and queued contact submissions gathered since the last flush"""
+    from app import contact_queue, search_index
+
+    search_index.flush_stats()
+    worker.log.info("Wrote %d queued contact submissions", contact_queue.shutdown())
@@ -0,0 +1,138 @@
+"""
+Identity Cache Module for Vidensbank
+Per-worker cache of logged-in users for Flask-Login's user loader, so pages
+that only read current_user do not query the users table on every request
+"""
+
+from flask import session
+from flask_login import user_logged_in, user_logged_out
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
+from collections import OrderedDict
+import hashlib
+import hmac
+import logging
+import threading
+import time
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Session key holding the identity version of the logged-in user
+SESSION_KEY = '_identity_version'
+
+# Session.info key for the user ids changed in the open transaction, per cache
+PENDING_KEY = 'identity_cache_pending'
+
+
+class IdentityCache:
+    """
+    Users by id, valid for IDENTITY_CACHE_TTL seconds and only while the
+    version stamp in the visitor's session matches.
+
+    The version is an HMAC of the password hash and role, so changing either
+    changes it. This process drops the cached user as soon as the change is
+    committed; other workers refetch once their TTL is up, or at once if the
+    change came through the visitor's own session.
+    """
+
+    def __init__(self, app=None, db=None, model=None):
+        self.app = None
+        self.db = db
+        self.model = model
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if app is not None:
+            self.init_app(app, db, model)
+
+    def init_app(self, app, db=None, model=None):
+        app.config.setdefault('IDENTITY_CACHE_ENABLED', True)
+        app.config.setdefault('IDENTITY_CACHE_TTL', 30)
+        app.config.setdefault('IDENTITY_CACHE_SIZE', 1024)
+        app.extensions['identity_cache'] = self
+        self.app = app
+        if db is not None:
+            self.db = db
+        if model is not None:
+            self.model = model
+
+        user_logged_in.connect(self._logged_in, app)
+        user_logged_out.connect(self._logged_out, app)
+        for name in ('after_update', 'after_delete'):
+            event.listen(self.model, name, self._invalidate)
+        # Evicting during the flush would let another request re-cache the old,
+        # still committed row under a matching stamp
+        event.listen(self.db.session, 'after_commit', self._after_commit)
+        event.listen(self.db.session, 'after_rollback', self._after_rollback)
+
+    def version(self, user):
+        """Stamp that changes whenever the user's password or role does"""
+        message = f"{user.id}:{user.password_hash}:{user.role}".encode('utf-8')
+        return hmac.new(self.app.secret_key.encode('utf-8'), message, hashlib.sha256).hexdigest()[:16]
+
+    def load(self, user_id):
+        """Flask-Login user loader"""
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return None
+
+        stamp = session.get(SESSION_KEY)
+        if self.app.config['IDENTITY_CACHE_ENABLED'] and stamp is not None:
+            with self._lock:
+                cached = self._users.get(user_id)
+                if (cached and cached[1] == stamp
+                        and time.monotonic() - cached[2] < self.app.config['IDENTITY_CACHE_TTL']):
+                    self._users.move_to_end(user_id)
+                    self.hits += 1
+                    return cached[0]
+
+        self.misses += 1
+        user = self.db.session.get(self.model, user_id)
+        if user is None:
+            return None
+
+        version = self.version(user)
+        if stamp != version:
+            # First request after login by remember cookie, or the user changed
+            session[SESSION_KEY] = version
+        # Detached so it can outlive this request's session; every column is loaded
+        self.db.session.expunge(user)
+        with self._lock:
+            self._users[user_id] = (user, version, time.monotonic())
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.app.config['IDENTITY_CACHE_SIZE']:
+                self._users.popitem(last=False)
+        return user
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+    def _logged_in(self, sender, user, **extra):
+        session[SESSION_KEY] = self.version(user)
+
+    def _logged_out(self, sender, user, **extra):
+        session.pop(SESSION_KEY, None)
+
+    def _invalidate(self, mapper, connection, target):
+        session = object_session(target)
+        if session is None:
+            self._evict([target.id])
+            return
+        session.info.setdefault(PENDING_KEY, {}).setdefault(self, set()).add(target.id)
+
+    def _after_commit(self, session):
+        user_ids = session.info.get(PENDING_KEY, {}).pop(self, None)
+        if user_ids:
+            self._evict(user_ids)
+
+    def _after_rollback(self, session):
+        session.info.get(PENDING_KEY, {}).pop(self, None)
+
+    def _evict(self, user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._users.pop(user_id, None)
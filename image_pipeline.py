@@ -0,0 +1,174 @@
+"""
+Responsive Image Module for Vidensbank
+Builds downscaled WebP variants of static images and renders them with srcset/sizes
+"""
+
+from flask import url_for
+from markupsafe import Markup, escape
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+import logging
+import os
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+try:
+    from PIL import Image, ImageOps
+    PILLOW_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"Pillow not available: {e}")
+    PILLOW_AVAILABLE = False
+
+# Width buckets in pixels; an image is never upscaled past its own width
+RESPONSIVE_WIDTHS = (480, 960, 1440, 1920)
+SOURCE_EXTENSIONS = {'.jpg', '.jpeg', '.png'}
+OUTPUT_DIR = 'responsive'
+MANIFEST_NAME = 'manifest.json'
+WEBP_QUALITY = 80
+
+
+class ResponsiveImages:
+    """Registers the responsive_image() Jinja helper backed by the build manifest"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self.manifest = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['responsive_images'] = self
+        app.jinja_env.globals['responsive_image'] = self.responsive_image
+        self.app = app
+        self.reload()
+
+    def reload(self):
+        """Load the manifest written by build_images()"""
+        manifest_path = os.path.join(self.app.static_folder, OUTPUT_DIR, MANIFEST_NAME)
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.manifest = {}
+
+    def responsive_image(self, filename, alt='', sizes='100vw', loading='lazy', **attrs):
+        """
+        Render an <img> for a static image, wrapped in a <picture> with WebP
+        variants when the image has been built.
+
+        Args:
+            filename: Path relative to static/, e.g. 'images/emissions_hero.jpg'
+            alt: Alternative text
+            sizes: The sizes attribute describing the rendered width
+            loading: 'lazy' or 'eager' (use eager for above-the-fold heroes)
+            **attrs: Extra attributes for the <img>, e.g. class='h-full w-full'
+        """
+        entry = self.manifest.get(filename)
+        img_attrs = {
+            'src': url_for('static', filename=filename),
+            'alt': alt,
+            'loading': loading,
+            'decoding': 'async'
+        }
+        if entry:
+            img_attrs['width'] = entry['width']
+            img_attrs['height'] = entry['height']
+        img_attrs.update(attrs)
+        img = f"<img {_format_attrs(img_attrs)}>"
+
+        if not entry:
+            return Markup(img)
+
+        srcset = ', '.join(
+            f"{url_for('static', filename=path)} {width}w"
+            for width, path in sorted(entry['variants'].items(), key=lambda item: int(item[0]))
+        )
+        source = f'<source type="image/webp" {_format_attrs({"srcset": srcset, "sizes": sizes})}>'
+        return Markup(f"<picture>{source}{img}</picture>")
+
+
+def build_images(static_folder, jobs=None, force=False):
+    """
+    Generate WebP width variants for every image under static/images.
+    Outputs are named by content hash, so unchanged images are skipped.
+
+    Returns:
+        Dict with built, cached, failed and pruned counts
+    """
+    if not PILLOW_AVAILABLE:
+        raise ImportError("Pillow is not available on this system.")
+
+    output_root = os.path.join(static_folder, OUTPUT_DIR)
+    os.makedirs(output_root, exist_ok=True)
+
+    sources = []
+    for root, _, files in os.walk(os.path.join(static_folder, 'images')):
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in SOURCE_EXTENSIONS:
+                relative = os.path.relpath(os.path.join(root, name), static_folder)
+                sources.append((static_folder, relative.replace(os.sep, '/'), force))
+
+    manifest = {}
+    summary = {'built': 0, 'cached': 0, 'failed': [], 'pruned': 0}
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for filename, entry, status in executor.map(_process_image, sources):
+            if status == 'failed':
+                summary['failed'].append(filename)
+                continue
+            manifest[filename] = entry
+            summary[status] += 1
+
+    # Remove variants of images that were changed or deleted
+    current = {os.path.basename(path) for entry in manifest.values() for path in entry['variants'].values()}
+    for name in os.listdir(output_root):
+        if name.endswith('.webp') and name not in current:
+            os.remove(os.path.join(output_root, name))
+            summary['pruned'] += 1
+
+    with open(os.path.join(output_root, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False, sort_keys=True)
+
+    return summary
+
+
+def _process_image(args):
+    """Build the variants of one image (runs in a worker process)"""
+    static_folder, filename, force = args
+    source_path = os.path.join(static_folder, filename)
+
+    try:
+        with open(source_path, 'rb') as f:
+            content_hash = hashlib.sha256(f.read()).hexdigest()[:12]
+
+        with Image.open(source_path) as opened:
+            image = ImageOps.exif_transpose(opened)
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+            width, height = image.size
+
+            stem = os.path.splitext(os.path.basename(filename))[0].replace(' ', '-')
+            targets = sorted({w for w in RESPONSIVE_WIDTHS if w < width} | {min(width, RESPONSIVE_WIDTHS[-1])})
+
+            variants = {}
+            status = 'cached'
+            for target_width in targets:
+                relative = f"{OUTPUT_DIR}/{stem}.{content_hash}.{target_width}w.webp"
+                variants[str(target_width)] = relative
+                output_path = os.path.join(static_folder, relative)
+                if os.path.exists(output_path) and not force:
+                    continue
+                target_height = round(height * target_width / width)
+                resized = image if target_width == width else image.resize((target_width, target_height), Image.LANCZOS)
+                resized.save(output_path, 'WEBP', quality=WEBP_QUALITY)
+                status = 'built'
+    except Exception as e:
+        logger.error(f"Failed to build responsive variants for {filename}: {e}")
+        return filename, None, 'failed'
+
+    return filename, {'hash': content_hash, 'width': width, 'height': height, 'variants': variants}, status
+
+
+def _format_attrs(attrs):
+    return ' '.join(f'{escape(key)}="{escape(value)}"' for key, value in attrs.items() if value is not None)
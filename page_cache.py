@@ -0,0 +1,167 @@
+"""
+Page Cache Module for Vidensbank
+Keeps fully rendered static pages in memory per worker and serves them with ETags
+"""
+
+from flask import request, session, make_response
+from flask_login import current_user
+from fragments import is_fragment_request
+from datetime import datetime
+from functools import wraps
+import hashlib
+import logging
+import os
+import time
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def auth_state():
+    """Cache key part for what a visitor may see: 'anonymous' or 'user:<role>'"""
+    if current_user.is_authenticated:
+        return f"user:{current_user.role}"
+    return 'anonymous'
+
+
+class PageCache:
+    """Whole-page response cache for routes that only render a template"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self.endpoints = set()
+        self._pages = {}
+        self._templates_version = None
+        self._checked_at = 0.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PAGE_CACHE_ENABLED', True)
+        # Seconds between scans of the template folder for edits
+        app.config.setdefault('PAGE_CACHE_TEMPLATE_CHECK_INTERVAL', 5)
+        app.extensions['page_cache'] = self
+        self.app = app
+
+    def cached(self, view):
+        """
+        Decorator for views whose output only depends on the auth state.
+        Register it below @app.route so the endpoint name is the function name.
+        """
+        self.endpoints.add(view.__name__)
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Flash messages are rendered into the page, so never serve or store those
+            if not self.app.config['PAGE_CACHE_ENABLED'] or '_flashes' in session:
+                return view(*args, **kwargs)
+
+            self._check_templates()
+            key = self._make_key()
+            page = self._pages.get(key)
+            cache_status = 'HIT'
+
+            if page is None:
+                cache_status = 'MISS'
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                if response.is_streamed:
+                    # Pass the stream through and keep a copy for the next request
+                    response.response = self._store_stream(key, response.response, response.mimetype)
+                    response.headers['Cache-Control'] = 'no-cache'
+                    response.vary.add('Cookie')
+                    response.headers['X-Page-Cache'] = cache_status
+                    return response
+                body = response.get_data()
+                page = {
+                    'body': body,
+                    'mimetype': response.mimetype,
+                    'etag': hashlib.sha1(body).hexdigest()
+                }
+                self._pages[key] = page
+
+            response = self.app.response_class(page['body'], mimetype=page['mimetype'])
+            response.set_etag(page['etag'])
+            response.headers['Cache-Control'] = 'no-cache'
+            response.vary.add('Cookie')
+            response.headers['X-Page-Cache'] = cache_status
+            return response.make_conditional(request)
+
+        return wrapper
+
+    def warm(self):
+        """
+        Render every cached route once for anonymous visitors.
+
+        Returns:
+            Number of pages rendered
+        """
+        started = time.perf_counter()
+        count = 0
+        with self.app.test_client() as client:
+            for rule in self.app.url_map.iter_rules():
+                if rule.endpoint not in self.endpoints or rule.arguments:
+                    continue
+                try:
+                    response = client.get(rule.rule, buffered=True)
+                except Exception as e:
+                    logger.error(f"Page cache warm-up failed for {rule.rule}: {e}")
+                    continue
+                if response.status_code == 200:
+                    count += 1
+                else:
+                    logger.warning(f"Page cache warm-up got {response.status_code} for {rule.rule}")
+        logger.info(f"Page cache warmed {count} pages in {time.perf_counter() - started:.2f}s")
+        return count
+
+    def clear(self):
+        self._pages.clear()
+
+    def _store_stream(self, key, chunks, mimetype):
+        """Yield a streamed body unchanged and cache it once it completed"""
+        parts = []
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            parts.append(chunk)
+            yield chunk
+
+        # Only reached when the whole page was rendered and sent
+        body = b''.join(parts)
+        self._pages[key] = {
+            'body': body,
+            'mimetype': mimetype,
+            'etag': hashlib.sha1(body).hexdigest()
+        }
+
+    def _make_key(self):
+        view_args = tuple(sorted((request.view_args or {}).items()))
+        return (request.endpoint, view_args, auth_state(), is_fragment_request(), datetime.now().year)
+
+    def _check_templates(self):
+        """Drop every cached page when a template file has been edited"""
+        now = time.monotonic()
+        if now - self._checked_at < self.app.config['PAGE_CACHE_TEMPLATE_CHECK_INTERVAL']:
+            return
+        self._checked_at = now
+
+        version = self._scan_templates()
+        if version != self._templates_version:
+            if self._templates_version is not None:
+                logger.info("Templates changed, clearing page cache")
+            self._templates_version = version
+            self.clear()
+
+    def _scan_templates(self):
+        template_dir = os.path.join(self.app.root_path, self.app.template_folder)
+        latest = 0.0
+        count = 0
+        for root, _, files in os.walk(template_dir):
+            for name in files:
+                try:
+                    latest = max(latest, os.path.getmtime(os.path.join(root, name)))
+                except OSError:
+                    continue
+                count += 1
+        return (count, latest)
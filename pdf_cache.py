@@ -0,0 +1,185 @@
+"""
+PDF Cache Module for Vidensbank
+Keeps rendered PDF reports on disk, keyed by template content and report date,
+so WeasyPrint runs once per report per day instead of on every download
+"""
+
+from flask import send_file
+from pdf_generator import PDFGenerator, report_date, warm as warm_weasyprint
+from static_export import template_dependency_hash
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: requests within one process still share a render
+    fcntl = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class PDFCache:
+    """Disk cache of rendered reports, served with send_file and an ETag"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self.generator = None
+        self._hashes = {}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PDF_CACHE_ENABLED', True)
+        app.config.setdefault('PDF_CACHE_DIR', os.path.join(app.instance_path, 'pdf_cache'))
+        # Seconds between re-hashing a report's templates for edits
+        app.config.setdefault('PDF_CACHE_TEMPLATE_CHECK_INTERVAL', 5)
+        # Load WeasyPrint and parse report stylesheets before render processes fork
+        app.config.setdefault('PDF_PREWARM', True)
+        app.extensions['pdf_cache'] = self
+        self.app = app
+
+    def send(self, template_name, filename, **template_vars):
+        """
+        Response with the PDF for a template, rendering it only if this
+        template version has not been rendered for today's date yet.
+        """
+        path, key = self.get(template_name, **template_vars)
+        response = send_file(path, mimetype='application/pdf', as_attachment=True,
+                             download_name=filename, etag=key, conditional=True)
+        # Revalidate every time: the ETag changes with the date and templates
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    def get(self, template_name, **template_vars):
+        """
+        Path of the rendered PDF and its cache key. Concurrent first requests,
+        also from other workers, wait for a single render.
+        """
+        template_vars.setdefault('current_date', report_date())
+        key = self._key(template_name, template_vars)
+        path = self._path(template_name, template_vars, key)
+        enabled = self.app.config['PDF_CACHE_ENABLED']
+        if enabled and os.path.exists(path):
+            return path, key
+
+        with self._lock_for(key), self._file_lock(path):
+            if not enabled or not os.path.exists(path):
+                started = time.perf_counter()
+                self._render(template_name, path, template_vars)
+                logger.info(f"Rendered {template_name} to PDF in {time.perf_counter() - started:.2f}s")
+                self._prune(keep=path)
+        return path, key
+
+    def cached_path(self, template_name, **template_vars):
+        """Path of an already rendered PDF, or None if it would need a render"""
+        template_vars.setdefault('current_date', report_date())
+        path = self._path(template_name, template_vars, self._key(template_name, template_vars))
+        if self.app.config['PDF_CACHE_ENABLED'] and os.path.exists(path):
+            return path
+        return None
+
+    def warm(self, template_names):
+        """Pre-load WeasyPrint for the given report templates, if PDF_PREWARM is on"""
+        if not self.app.config['PDF_PREWARM']:
+            return None
+        summary = warm_weasyprint(self.app, template_names)
+        if summary['available']:
+            logger.info(f"WeasyPrint warmed with {summary['stylesheets']} stylesheets in {summary['seconds']:.2f}s")
+        return summary
+
+    def clear(self):
+        """Remove every cached PDF"""
+        directory = self.app.config['PDF_CACHE_DIR']
+        if not os.path.isdir(directory):
+            return
+        for name in os.listdir(directory):
+            if name.endswith(('.pdf', '.lock')):
+                os.remove(os.path.join(directory, name))
+
+    def _key(self, template_name, template_vars):
+        digest = hashlib.sha256()
+        digest.update(template_name.encode('utf-8'))
+        digest.update(self._template_hash(template_name).encode('utf-8'))
+        digest.update(json.dumps(template_vars, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()[:32]
+
+    def _template_hash(self, template_name):
+        """Dependency hash of a template, recomputed at most every check interval"""
+        now = time.monotonic()
+        cached = self._hashes.get(template_name)
+        if cached and now - cached[1] < self.app.config['PDF_CACHE_TEMPLATE_CHECK_INTERVAL']:
+            return cached[0]
+        value = template_dependency_hash(self.app, [template_name])
+        self._hashes[template_name] = (value, now)
+        return value
+
+    def _path(self, template_name, template_vars, key):
+        """<template>.<variant>.<key>.pdf, where the variant covers everything but the date"""
+        stem = re.sub(r'[^A-Za-z0-9_-]+', '_', os.path.splitext(template_name)[0])
+        variant_vars = {name: value for name, value in template_vars.items() if name != 'current_date'}
+        variant = hashlib.sha256(json.dumps(variant_vars, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.app.config['PDF_CACHE_DIR'], f"{stem}.{variant}.{key}.pdf")
+
+    def _render(self, template_name, path, template_vars):
+        # One generator per process; it shares the process-wide font configuration
+        if self.generator is None:
+            self.generator = PDFGenerator()
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                self.generator.write_pdf(template_name, f, **template_vars)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def _prune(self, keep):
+        """Delete renders of the same report for older template versions or dates"""
+        prefix = os.path.basename(keep).rsplit('.', 2)[0] + '.'
+        directory = os.path.dirname(keep)
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name.startswith(prefix) and path != keep and not path.startswith(keep):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _lock_for(self, key):
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _file_lock(self, path):
+        return _FileLock(f"{path}.lock")
+
+
+class _FileLock:
+    """Exclusive flock on a side file, so gunicorn workers render a report only once"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.file = open(self.path, 'a')
+        if fcntl is not None:
+            fcntl.flock(self.file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self.file, fcntl.LOCK_UN)
+        self.file.close()
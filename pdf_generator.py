@@ -3,67 +3,166 @@ PDF Generation Module for Vidensbank
 Generates PDF reports from HTML templates using WeasyPrint
 """
 
-from flask import render_template, make_response
+from flask import render_template, request, send_file
 from datetime import datetime
-import io
+from functools import lru_cache
 import logging
+import os
+import re
+import tempfile
+import threading
+import time
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-try:
-    from weasyprint import HTML, CSS
-    from weasyprint.text.fonts import FontConfiguration
-    WEASYPRINT_AVAILABLE = True
-except (ImportError, OSError) as e:
-    # OSError can happen if system dependencies (like Pango/Cairo) are missing
-    logger.warning(f"WeasyPrint not available: {e}")
-    WEASYPRINT_AVAILABLE = False
+# Inline stylesheets without attributes; <style media=...> stays in the document
+STYLE_BLOCK = re.compile(r'<style(?:\s+type="text/css")?\s*>(.*?)</style>', re.IGNORECASE | re.DOTALL)
+
+# Reports up to this size are spooled in memory, larger ones go to a temporary file
+SPOOL_MAX_SIZE = 1024 * 1024
+
+# WeasyPrint pulls in Pango and Cairo, so it is imported on first render instead of
+# at app import: web workers that never render a PDF do not pay for it
+_weasyprint = None
+_font_config = None
+_import_attempted = False
+_import_lock = threading.Lock()
+
+
+def load_weasyprint():
+    """
+    Import WeasyPrint and create the process-wide FontConfiguration, once.
+
+    Returns:
+        The weasyprint module, or None if it or its system libraries are missing
+    """
+    global _weasyprint, _font_config, _import_attempted
+    if _import_attempted:
+        return _weasyprint
+
+    with _import_lock:
+        if not _import_attempted:
+            try:
+                import weasyprint
+                from weasyprint.text.fonts import FontConfiguration
+                _weasyprint = weasyprint
+            except (ImportError, OSError) as e:
+                # OSError can happen if system dependencies (like Pango/Cairo) are missing
+                logger.warning(f"WeasyPrint not available: {e}")
+            else:
+                try:
+                    _font_config = FontConfiguration()
+                except Exception as e:
+                    logger.error(f"Failed to initialize FontConfiguration: {e}")
+            _import_attempted = True
+    return _weasyprint
+
+
+def font_configuration():
+    """FontConfiguration shared by every render in this process"""
+    load_weasyprint()
+    return _font_config
+
+
+def __getattr__(name):
+    # WEASYPRINT_AVAILABLE used to be set at import; keep it, but resolve it lazily
+    if name == 'WEASYPRINT_AVAILABLE':
+        return load_weasyprint() is not None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=32)
+def parsed_stylesheet(css_text):
+    """CSS object for a template's stylesheet, parsed once per process"""
+    return load_weasyprint().CSS(string=css_text, font_config=font_configuration())
+
+
+def split_stylesheets(html_content):
+    """
+    Take the inline <style> blocks out of a rendered template.
+
+    They are passed to WeasyPrint as pre-parsed stylesheets instead, so the CSS
+    of a report is parsed once rather than on every render.
+
+    Returns:
+        (html without the blocks, list of CSS objects)
+    """
+    blocks = STYLE_BLOCK.findall(html_content)
+    if not blocks:
+        return html_content, []
+    return STYLE_BLOCK.sub('', html_content), [parsed_stylesheet(css) for css in blocks]
+
+
+def warm(app, template_names=()):
+    """
+    Load WeasyPrint, lay out a throwaway page so fonts are loaded, and parse the
+    static stylesheets of the given templates. Call it before forking render
+    processes so they inherit all of it.
+
+    Returns:
+        Dict with available, stylesheets and seconds
+    """
+    started = time.perf_counter()
+    weasyprint = load_weasyprint()
+    summary = {'available': weasyprint is not None, 'stylesheets': 0, 'seconds': 0.0}
+    if weasyprint is None:
+        return summary
+
+    weasyprint.HTML(string='<p>Vidensbank</p>').write_pdf(font_config=font_configuration())
+    for template_name in template_names:
+        source = app.jinja_env.loader.get_source(app.jinja_env, template_name)[0]
+        for css in STYLE_BLOCK.findall(source):
+            # CSS with template tags depends on the render and is parsed then
+            if '{{' not in css and '{%' not in css:
+                parsed_stylesheet(css)
+                summary['stylesheets'] += 1
+    summary['seconds'] = time.perf_counter() - started
+    return summary
+
+
+def report_date():
+    """Date printed on reports; the PDF cache keys on it as well"""
+    return datetime.now().strftime('%d. %B %Y')
 
 
 class PDFGenerator:
     """Handles PDF generation for various report types"""
 
-    def __init__(self):
-        if WEASYPRINT_AVAILABLE:
-            try:
-                self.font_config = FontConfiguration()
-            except Exception as e:
-                logger.error(f"Failed to initialize FontConfiguration: {e}")
-                self.font_config = None
-        else:
-            self.font_config = None
+    @property
+    def font_config(self):
+        return font_configuration()
 
+    def write_pdf(self, template_name, target, **template_vars):
         """
-        Generate a comprehensive PDF report for the Emissions topic
+        Render a template to PDF
 
-        Returns:
-            Flask Response object with PDF content
+        Args:
+            template_name: Path to the template relative to templates/
+            target: File path or binary file object to write the PDF to
+            **template_vars: Variables to pass to the template
         """
-        if not WEASYPRINT_AVAILABLE:
+        weasyprint = load_weasyprint()
+        if weasyprint is None:
             raise ImportError("WeasyPrint is not available on this system.")
 
-        # Get current date for the report
-        current_date = datetime.now().strftime('%d. %B %Y')
+        template_vars.setdefault('current_date', report_date())
+        html_content, stylesheets = split_stylesheets(render_template(template_name, **template_vars))
+        weasyprint.HTML(string=html_content).write_pdf(target, stylesheets=stylesheets,
+                                                       font_config=self.font_config)
 
-        # Render the HTML template
-        html_content = render_template(
-            'pdf/emissions_report.html',
-            current_date=current_date
-        )
+    def generate_emissions_report(self):
+        """
+        Generate a comprehensive PDF report for the Emissions topic
 
-        # Generate PDF from HTML
-        pdf_file = HTML(string=html_content).write_pdf(
-            font_config=self.font_config
+        Returns:
+            Flask Response object with PDF content
+        """
+        return self.generate_custom_report(
+            'pdf/emissions_report.html',
+            f'Emissions_Report_{datetime.now().strftime("%Y%m%d")}.pdf'
         )
 
-        # Create Flask response
-        response = make_response(pdf_file)
-        response.headers['Content-Type'] = 'application/pdf'
-        response.headers['Content-Disposition'] = f'attachment; filename=Emissions_Report_{datetime.now().strftime("%Y%m%d")}.pdf'
-
-        return response
-
     def generate_custom_report(self, template_name, filename, **template_vars):
         """
         Generate a custom PDF report from any template
@@ -76,23 +175,27 @@ class PDFGenerator:
         Returns:
             Flask Response object with PDF content
         """
-        if not WEASYPRINT_AVAILABLE:
-            raise ImportError("WeasyPrint is not available on this system.")
-
-        # Add current date to template variables
-        template_vars['current_date'] = datetime.now().strftime('%d. %B %Y')
-
-        # Render the HTML template
-        html_content = render_template(template_name, **template_vars)
-
-        # Generate PDF from HTML
-        pdf_file = HTML(string=html_content).write_pdf(
-            font_config=self.font_config
-        )
-
-        # Create Flask response
-        response = make_response(pdf_file)
-        response.headers['Content-Type'] = 'application/pdf'
-        response.headers['Content-Disposition'] = f'attachment; filename={filename}'
-
-        return response
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        try:
+            self.write_pdf(template_name, spool, **template_vars)
+            return send_spooled_pdf(spool, filename)
+        except BaseException:
+            spool.close()
+            raise
+
+
+def send_spooled_pdf(spool, filename):
+    """
+    Stream a PDF that was written to a spooled temporary file. The response
+    closes (and so deletes) the file once it has been sent.
+
+    send_file cannot size a spooled file, so Content-Length and range
+    handling are added here.
+    """
+    size = spool.seek(0, os.SEEK_END)
+    spool.seek(0)
+    response = send_file(spool, mimetype='application/pdf', as_attachment=True, download_name=filename)
+    response.content_length = size
+    # Advertised up front so download managers know they can resume
+    response.headers['Accept-Ranges'] = 'bytes'
+    return response.make_conditional(request.environ, accept_ranges=True, complete_length=size)
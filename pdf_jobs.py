@@ -0,0 +1,468 @@
+"""
+PDF Jobs Module for Vidensbank
+Keeps WeasyPrint out of the web workers: report downloads become jobs in a SQLite
+queue that `flask pdf-worker` drains with a bounded pool of render processes
+"""
+
+from flask import flash, jsonify, redirect, render_template, request, send_file, url_for
+from flask_login import current_user
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import time
+import uuid
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pdf_jobs (
+    id TEXT PRIMARY KEY,
+    report TEXT NOT NULL,
+    variables TEXT NOT NULL,
+    status TEXT NOT NULL,
+    path TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_pid INTEGER,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS ix_pdf_jobs_status ON pdf_jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS pdf_worker (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    pid INTEGER,
+    heartbeat REAL NOT NULL
+);
+"""
+
+# Set in the pdf-worker process before forking render processes
+_worker_app = None
+
+
+class PDFJobs:
+    """Report registry, job queue and the routes to create, poll and download jobs"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self.reports = {}
+        self._schema_ready = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PDF_JOB_DB', os.path.join(app.instance_path, 'pdf_jobs.sqlite'))
+        # Render processes per pdf-worker; the bound on concurrent WeasyPrint runs
+        app.config.setdefault('PDF_JOB_CONCURRENCY', 2)
+        # Finished jobs and jobs nobody picked up are dropped after this many seconds
+        app.config.setdefault('PDF_JOB_TTL', 3600)
+        # A running job older than this is assumed lost with its worker and retried once
+        app.config.setdefault('PDF_JOB_TIMEOUT', 300)
+        app.config.setdefault('PDF_JOB_POLL_INTERVAL', 1.0)
+        # A pdf-worker that has not checked in for this long is treated as absent
+        app.config.setdefault('PDF_WORKER_HEARTBEAT', 30)
+        # Files written by archive jobs; single reports live in the PDF cache
+        app.config.setdefault('PDF_JOB_OUTPUT_DIR', os.path.join(app.instance_path, 'pdf_jobs'))
+        app.add_url_rule('/api/pdf-jobs', 'api_pdf_jobs_create', self.create_view, methods=['POST'])
+        app.add_url_rule('/api/pdf-jobs/<job_id>', 'api_pdf_job_status', self.status_view)
+        app.add_url_rule('/pdf-jobs/<job_id>', 'pdf_job_download', self.download_view)
+        app.extensions['pdf_jobs'] = self
+        self.app = app
+
+    def register_report(self, name, template_name, filename, params=(), back_endpoint=None):
+        """
+        Make a report available for download jobs.
+
+        Args:
+            name: Report name used in URLs and the queue
+            template_name: PDF template relative to templates/
+            filename: Download name; {date} is replaced with YYYYMMDD, other
+                {fields} with the report parameters
+            params: Names of the template variables a client may pass
+            back_endpoint: Where to send the visitor if the render fails
+        """
+        self.reports[name] = {
+            'template': template_name,
+            'filename': filename,
+            'params': tuple(params),
+            'back_endpoint': back_endpoint
+        }
+
+    def register_archive(self, name, build, filename, mimetype='application/zip', params=(),
+                         back_endpoint=None, timeout=None, role=None):
+        """
+        Make a bulk download available as a job.
+
+        Args:
+            name: Job name used in URLs and the queue
+            build: Called as build(path, **variables) in a render process; writes the file
+            filename: Download name, as for register_report, or a callable taking the variables
+            mimetype: Content type of the download
+            params: Names of the variables a client may pass
+            back_endpoint: Where to send the visitor if the build fails
+            timeout: Seconds before a running build counts as lost (default PDF_JOB_TIMEOUT)
+            role: User role required to poll or download the job
+        """
+        self.reports[name] = {
+            'template': None,
+            'build': build,
+            'filename': filename,
+            'mimetype': mimetype,
+            'params': tuple(params),
+            'back_endpoint': back_endpoint,
+            'timeout': timeout,
+            'role': role
+        }
+
+    def respond(self, report, **variables):
+        """
+        Download response for a report: the cached PDF if there is one, else a
+        queued job when a pdf-worker is running, else a render in this request.
+        """
+        spec = self.reports[report]
+        pdf_cache = self.app.extensions['pdf_cache']
+        filename = self.filename(report, variables)
+        if pdf_cache.cached_path(spec['template'], **variables) is None and self.worker_alive():
+            return redirect(url_for('pdf_job_download', job_id=self.enqueue(report, **variables)))
+        return pdf_cache.send(spec['template'], filename, **variables)
+
+    def filename(self, report, variables):
+        filename = self.reports[report]['filename']
+        if callable(filename):
+            return filename(**variables)
+        return filename.format(date=datetime.now().strftime('%Y%m%d'), **variables)
+
+    def output_path(self, job_id, report):
+        """Where an archive job writes its file"""
+        extension = os.path.splitext(self.filename(report, self.get(job_id)['variables']))[1]
+        return os.path.join(self.app.config['PDF_JOB_OUTPUT_DIR'], f"{job_id}{extension}")
+
+    # ------------------------------------------------------------------------
+    # Queue
+    # ------------------------------------------------------------------------
+
+    def enqueue(self, report, **variables):
+        """
+        Queue a render; returns the job id. A queued or running job for the
+        same report and parameters is reused rather than rendered twice.
+        """
+        if report not in self.reports:
+            raise KeyError(f"Unknown report: {report}")
+        key = json.dumps(variables, sort_keys=True)
+        with self._connect() as conn:
+            # Taken before the lookup so two requests cannot both insert
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id FROM pdf_jobs WHERE status IN ('queued', 'running') AND report = ? AND variables = ? "
+                "ORDER BY created_at LIMIT 1", (report, key)
+            ).fetchone()
+            if row is not None:
+                conn.execute("COMMIT")
+                return row['id']
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO pdf_jobs (id, report, variables, status, created_at) VALUES (?, ?, ?, 'queued', ?)",
+                (job_id, report, key, time.time())
+            )
+            conn.execute("COMMIT")
+        return job_id
+
+    def get(self, job_id):
+        """Job as a dict, or None if it does not exist (anymore)"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM pdf_jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['variables'] = json.loads(job['variables'])
+        return job
+
+    def worker_alive(self):
+        with self._connect() as conn:
+            row = conn.execute("SELECT heartbeat FROM pdf_worker WHERE id = 1").fetchone()
+        return row is not None and time.time() - row['heartbeat'] < self.app.config['PDF_WORKER_HEARTBEAT']
+
+    def expire(self, held=()):
+        """
+        Drop old finished jobs, fail jobs that waited too long and retry jobs
+        whose worker disappeared.
+
+        Args:
+            held: Ids of the jobs the calling worker is still rendering; a slow
+                render is left alone rather than claimed a second time
+
+        Returns:
+            Number of jobs removed
+        """
+        now = time.time()
+        ttl = self.app.config['PDF_JOB_TTL']
+        output_dir = self.app.config['PDF_JOB_OUTPUT_DIR']
+        with self._connect() as conn:
+            running = conn.execute(
+                "SELECT id, report, attempts, started_at, worker_pid FROM pdf_jobs WHERE status = 'running'"
+            )
+            for row in running.fetchall():
+                spec = self.reports.get(row['report'], {})
+                if row['started_at'] >= now - (spec.get('timeout') or self.app.config['PDF_JOB_TIMEOUT']):
+                    continue
+                if row['id'] in held or (row['worker_pid'] != os.getpid() and _pid_alive(row['worker_pid'])):
+                    # Still rendering in this worker or in another one that is running
+                    continue
+                if row['attempts'] < 2:
+                    conn.execute("UPDATE pdf_jobs SET status = 'queued', started_at = NULL WHERE id = ?", (row['id'],))
+                else:
+                    conn.execute("UPDATE pdf_jobs SET status = 'failed', error = 'Timed out', finished_at = ? "
+                                 "WHERE id = ?", (now, row['id']))
+            conn.execute(
+                "UPDATE pdf_jobs SET status = 'failed', error = 'Timed out', finished_at = ? "
+                "WHERE status = 'queued' AND created_at < ?", (now, now - ttl)
+            )
+            expired = conn.execute(
+                "DELETE FROM pdf_jobs WHERE status IN ('done', 'failed') AND finished_at < ? RETURNING path",
+                (now - ttl,)
+            ).fetchall()
+        # Archive files belong to their job; PDF cache files are pruned by the cache
+        for row in expired:
+            if row['path'] and os.path.dirname(row['path']) == output_dir and os.path.exists(row['path']):
+                os.remove(row['path'])
+        return len(expired)
+
+    def run_worker(self, concurrency=None, once=False):
+        """
+        Drain the queue with up to `concurrency` render processes.
+
+        Args:
+            concurrency: Parallel renders (default PDF_JOB_CONCURRENCY)
+            once: Return when the queue is empty instead of waiting for more jobs
+
+        Returns:
+            Dict with done and failed counts
+        """
+        global _worker_app
+        concurrency = concurrency or self.app.config['PDF_JOB_CONCURRENCY']
+        poll_interval = self.app.config['PDF_JOB_POLL_INTERVAL']
+        summary = {'done': 0, 'failed': 0}
+
+        _worker_app = self.app
+        # Render processes fork from here and inherit WeasyPrint already loaded
+        self.app.extensions['pdf_cache'].warm({spec['template'] for spec in self.reports.values() if spec['template']})
+        if 'fork' in multiprocessing.get_all_start_methods():
+            executor = ProcessPoolExecutor(max_workers=concurrency, mp_context=multiprocessing.get_context('fork'))
+        else:
+            executor = ThreadPoolExecutor(max_workers=concurrency)
+
+        running = {}
+        last_expired = 0.0
+        with executor:
+            while True:
+                self._heartbeat()
+                if time.monotonic() - last_expired > 60:
+                    self.expire(held={job['id'] for job in running.values()})
+                    last_expired = time.monotonic()
+
+                while len(running) < concurrency:
+                    job = self._claim()
+                    if job is None:
+                        break
+                    spec = self.reports.get(job['report'])
+                    if spec is None:
+                        self._finish(job['id'], error=f"Unknown report: {job['report']}")
+                        summary['failed'] += 1
+                        continue
+                    if spec['template'] is None:
+                        future = executor.submit(_build_job, job['report'], self.output_path(job['id'], job['report']),
+                                                 job['variables'])
+                    else:
+                        future = executor.submit(_render_job, spec['template'], job['variables'])
+                    running[future] = job
+
+                if not running:
+                    if once:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                completed, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    job = running.pop(future)
+                    try:
+                        self._finish(job['id'], path=future.result())
+                        summary['done'] += 1
+                    except Exception as e:
+                        logger.error(f"PDF job {job['id']} ({job['report']}) failed: {e}")
+                        self._finish(job['id'], error=str(e))
+                        summary['failed'] += 1
+        return summary
+
+    def _claim(self):
+        with self._connect() as conn:
+            row = conn.execute(
+                "UPDATE pdf_jobs SET status = 'running', started_at = ?, attempts = attempts + 1, worker_pid = ? "
+                "WHERE id = (SELECT id FROM pdf_jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1) "
+                "AND status = 'queued' RETURNING id, report, variables",
+                (time.time(), os.getpid())
+            ).fetchone()
+        if row is None:
+            return None
+        return {'id': row['id'], 'report': row['report'], 'variables': json.loads(row['variables'])}
+
+    def _finish(self, job_id, path=None, error=None):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE pdf_jobs SET status = ?, path = ?, error = ?, finished_at = ? WHERE id = ?",
+                ('failed' if error else 'done', path, error, time.time(), job_id)
+            )
+
+    def _heartbeat(self):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO pdf_worker (id, pid, heartbeat) VALUES (1, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET pid = excluded.pid, heartbeat = excluded.heartbeat",
+                (os.getpid(), time.time())
+            )
+
+    def _connect(self):
+        path = self.app.config['PDF_JOB_DB']
+        conn = sqlite3.connect(path, timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        if not self._schema_ready or not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(pdf_jobs)")}
+            if 'worker_pid' not in columns:
+                # Queue databases created before jobs recorded their worker
+                conn.execute("ALTER TABLE pdf_jobs ADD COLUMN worker_pid INTEGER")
+            self._schema_ready = True
+        return _Connection(conn)
+
+    # ------------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------------
+
+    def create_view(self):
+        """POST /api/pdf-jobs with {"report": name, ...parameters}"""
+        data = request.get_json(silent=True) or {}
+        report = data.get('report')
+        spec = self.reports.get(report)
+        # Archive jobs are started from their own (access-checked) views
+        if spec is None or spec['template'] is None:
+            return jsonify({'success': False, 'error': f"Unknown report: {report}"}), 404
+
+        variables = {name: data[name] for name in spec['params'] if name in data}
+        missing = [name for name in spec['params'] if name not in variables]
+        if missing:
+            return jsonify({'success': False, 'error': f"Missing parameters: {', '.join(missing)}"}), 400
+
+        job_id = self.enqueue(report, **variables)
+        response = jsonify(self._describe(self.get(job_id)))
+        response.status_code = 202
+        response.headers['Location'] = url_for('api_pdf_job_status', job_id=job_id)
+        return response
+
+    def status_view(self, job_id):
+        """GET /api/pdf-jobs/<id>: poll a job"""
+        job = self.get(job_id)
+        if job is None:
+            return jsonify({'success': False, 'error': 'Unknown or expired job'}), 404
+        if not self._allowed(job):
+            return jsonify({'success': False, 'error': 'Access denied'}), 403
+        response = jsonify(self._describe(job))
+        if job['status'] in ('queued', 'running'):
+            response.headers['Retry-After'] = '1'
+        return response
+
+    def download_view(self, job_id):
+        """GET /pdf-jobs/<id>: the finished PDF, or a page that reloads until it is ready"""
+        job = self.get(job_id)
+        if job is None:
+            return render_template('pdf_job.html', job=None), 404
+        if not self._allowed(job):
+            if not current_user.is_authenticated:
+                return self.app.login_manager.unauthorized()
+            flash('Du har ikke adgang til denne side', 'error')
+            return redirect(url_for('index'))
+
+        if job['status'] == 'done':
+            if not (job['path'] and os.path.exists(job['path'])):
+                # Pruned from the PDF cache by a newer render
+                return render_template('pdf_job.html', job=None), 404
+            mimetype = self.reports.get(job['report'], {}).get('mimetype', 'application/pdf')
+            return send_file(job['path'], mimetype=mimetype, as_attachment=True,
+                             download_name=self.filename(job['report'], job['variables']), conditional=True)
+        if job['status'] in ('queued', 'running'):
+            response = self.app.make_response((render_template('pdf_job.html', job=job), 202))
+            response.headers['Refresh'] = '2'
+            response.headers['Cache-Control'] = 'no-store'
+            return response
+
+        spec = self.reports.get(job['report'], {})
+        back_url = url_for(spec['back_endpoint']) if spec.get('back_endpoint') else None
+        return render_template('pdf_job.html', job=job, back_url=back_url), 500
+
+    def _allowed(self, job):
+        # The job link alone is not enough for archives restricted to a role
+        role = self.reports.get(job['report'], {}).get('role')
+        return role is None or (current_user.is_authenticated and current_user.role == role)
+
+    def _describe(self, job):
+        described = {'success': True, 'job_id': job['id'], 'report': job['report'], 'status': job['status']}
+        if job['status'] == 'done':
+            described['download_url'] = url_for('pdf_job_download', job_id=job['id'])
+        if job['error']:
+            described['error'] = job['error']
+        return described
+
+
+class _Connection:
+    """Closes the sqlite3 connection on exit (sqlite3's own context manager only commits)"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self.conn
+
+    def __exit__(self, *exc):
+        self.conn.close()
+
+
+def _render_job(template_name, variables):
+    """Render one report through the PDF cache (runs in a render process)"""
+    app = _worker_app
+    with app.test_request_context():
+        path, _ = app.extensions['pdf_cache'].get(template_name, **variables)
+    return path
+
+
+def _pid_alive(pid):
+    """Whether a process with this pid exists (the queue is local, so it is on this host)"""
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _build_job(report, path, variables):
+    """Write one archive job's file (runs in a render process)"""
+    app = _worker_app
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial = f"{path}.{os.getpid()}.tmp"
+    try:
+        with app.app_context():
+            app.extensions['pdf_jobs'].reports[report]['build'](partial, **variables)
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return path
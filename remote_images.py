@@ -0,0 +1,220 @@
+"""
+Remote Image Module for Vidensbank
+Proxies the Unsplash hero and card photos through /img/<key>: each photo is fetched once,
+kept on local disk and served as resized WebP variants with long-lived caching
+"""
+
+from flask import abort, redirect, request, send_file, url_for
+from image_pipeline import RESPONSIVE_WIDTHS, WEBP_QUALITY, PILLOW_AVAILABLE
+from urllib.request import Request, urlopen
+import logging
+import os
+import re
+import tempfile
+import threading
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+if PILLOW_AVAILABLE:
+    from PIL import Image, ImageOps
+
+# Unsplash photo ids, e.g. photo-1490211871743-069074507117
+KEY_PATTERN = re.compile(r'^photo-[0-9]+-[0-9a-f]+$')
+REMOTE_URL_PATTERN = re.compile(r'https://images\.unsplash\.com/(photo-[0-9]+-[0-9a-f]+)(?:\?([^"\')\s]*))?')
+TEMPLATE_KEY_PATTERN = re.compile(r'remote_image_(?:url|srcset)\(\s*["\'](photo-[0-9]+-[0-9a-f]+)["\']')
+MAX_SOURCE_BYTES = 20 * 1024 * 1024
+
+
+def width_bucket(width):
+    """Smallest responsive width that covers `width`, capped at the largest"""
+    for bucket in RESPONSIVE_WIDTHS:
+        if width <= bucket:
+            return bucket
+    return RESPONSIVE_WIDTHS[-1]
+
+
+class RemoteImages:
+    """The /img/<key> proxy route plus remote_image_url()/remote_image_srcset() Jinja helpers"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self.keys = set()
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('REMOTE_IMAGE_ORIGIN', 'https://images.unsplash.com')
+        app.config.setdefault('REMOTE_IMAGE_CACHE_DIR', os.path.join(app.instance_path, 'remote_images'))
+        app.config.setdefault('REMOTE_IMAGE_TIMEOUT', 10)
+        app.add_url_rule('/img/<key>', 'remote_image', self.serve)
+        app.jinja_env.globals.update(remote_image_url=self.image_url, remote_image_srcset=self.image_srcset)
+        app.extensions['remote_images'] = self
+        self.app = app
+
+        # Only photos referenced by a template are proxied, so the route cannot
+        # be used to pull arbitrary images onto our disk
+        self.keys = collect_template_keys(os.path.join(app.root_path, app.template_folder))
+
+    def image_url(self, key, width=RESPONSIVE_WIDTHS[-1]):
+        return url_for('remote_image', key=key, w=width_bucket(width))
+
+    def image_srcset(self, key, max_width=RESPONSIVE_WIDTHS[-1]):
+        widths = [w for w in RESPONSIVE_WIDTHS if w <= width_bucket(max_width)]
+        return ', '.join(f"{self.image_url(key, w)} {w}w" for w in widths)
+
+    def serve(self, key):
+        """View for /img/<key>?w=<width>"""
+        if key not in self.keys or not KEY_PATTERN.match(key):
+            abort(404)
+        width = width_bucket(request.args.get('w', RESPONSIVE_WIDTHS[-1], type=int) or RESPONSIVE_WIDTHS[-1])
+
+        try:
+            path, mimetype = self.variant(key, width)
+        except Exception as e:
+            # Better the third-party image than a broken one
+            logger.error(f"Remote image {key} unavailable locally: {e}")
+            response = redirect(self._remote_url(key, width))
+            response.headers['Cache-Control'] = 'no-store'
+            return response
+
+        response = send_file(path, mimetype=mimetype, conditional=True, max_age=31536000)
+        # Keys are immutable photo ids and the width is part of the URL
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        return response
+
+    def variant(self, key, width):
+        """
+        Path and mimetype of the WebP variant for a width bucket, fetching the
+        source and resizing it on first use.
+        """
+        cache_dir = self.app.config['REMOTE_IMAGE_CACHE_DIR']
+        target = os.path.join(cache_dir, f"{key}.{width}w.webp")
+        if os.path.exists(target):
+            return target, 'image/webp'
+
+        with self._lock_for(key):
+            source = self._ensure_source(key)
+            if not PILLOW_AVAILABLE:
+                return source, 'image/jpeg'
+            if not os.path.exists(target):
+                with Image.open(source) as opened:
+                    image = ImageOps.exif_transpose(opened)
+                    if image.mode not in ('RGB', 'RGBA'):
+                        image = image.convert('RGB')
+                    if image.width > width:
+                        image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+                    _write_atomic(target, lambda f: image.save(f, 'WEBP', quality=WEBP_QUALITY))
+        return target, 'image/webp'
+
+    def prefetch(self):
+        """
+        Fetch every referenced photo and build all of its variants.
+
+        Returns:
+            Dict with ready count and failed keys
+        """
+        summary = {'ready': 0, 'failed': []}
+        for key in sorted(self.keys):
+            try:
+                for width in RESPONSIVE_WIDTHS:
+                    self.variant(key, width)
+                summary['ready'] += 1
+            except Exception as e:
+                logger.error(f"Failed to prefetch remote image {key}: {e}")
+                summary['failed'].append(key)
+        return summary
+
+    def _ensure_source(self, key):
+        source = os.path.join(self.app.config['REMOTE_IMAGE_CACHE_DIR'], f"{key}.source")
+        if os.path.exists(source):
+            return source
+
+        url = self._remote_url(key, RESPONSIVE_WIDTHS[-1], fmt='jpg', quality=90)
+        logger.info(f"Fetching remote image {url}")
+        req = Request(url, headers={'User-Agent': 'Vidensbank image proxy'})
+        with urlopen(req, timeout=self.app.config['REMOTE_IMAGE_TIMEOUT']) as response:
+            body = response.read(MAX_SOURCE_BYTES + 1)
+        if len(body) > MAX_SOURCE_BYTES:
+            raise ValueError(f"{url} is larger than {MAX_SOURCE_BYTES} bytes")
+
+        _write_atomic(source, lambda f: f.write(body))
+        return source
+
+    def _remote_url(self, key, width, fmt='webp', quality=80):
+        return f"{self.app.config['REMOTE_IMAGE_ORIGIN']}/{key}?w={width}&q={quality}&fm={fmt}&fit=max"
+
+    def _lock_for(self, key):
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+
+def collect_template_keys(template_dir):
+    """Photo keys referenced through remote_image_url()/remote_image_srcset()"""
+    keys = set()
+    for root, _, files in os.walk(template_dir):
+        for name in files:
+            if name.endswith('.html'):
+                with open(os.path.join(root, name), 'r', encoding='utf-8') as f:
+                    keys.update(TEMPLATE_KEY_PATTERN.findall(f.read()))
+    return keys
+
+
+def rewrite_templates(template_dir):
+    """
+    Move hard-coded Unsplash URLs in templates onto the /img proxy.
+
+    <img src="..."> gets src/srcset/sizes up to the width the URL asked for;
+    CSS url('...') backgrounds get a single URL for that width.
+
+    Returns:
+        Dict with rewritten file and URL counts
+    """
+    summary = {'files': 0, 'urls': 0}
+    img_pattern = re.compile(r'src="' + REMOTE_URL_PATTERN.pattern + '"')
+    css_pattern = re.compile(r'url\((["\']?)' + REMOTE_URL_PATTERN.pattern + r'\1\)')
+
+    def requested_width(query):
+        match = re.search(r'(?:^|&)w=(\d+)', query or '')
+        return min(int(match.group(1)), RESPONSIVE_WIDTHS[-1]) if match else RESPONSIVE_WIDTHS[-1]
+
+    def rewrite_img(match):
+        key, width = match.group(1), requested_width(match.group(2))
+        return (f'src="{{{{ remote_image_url(\'{key}\', {width}) }}}}" '
+                f'srcset="{{{{ remote_image_srcset(\'{key}\', {width}) }}}}" '
+                f'sizes="(min-width: {width}px) {width}px, 100vw"')
+
+    def rewrite_css(match):
+        key, width = match.group(2), requested_width(match.group(3))
+        return f'url(\'{{{{ remote_image_url("{key}", {width}) }}}}\')'
+
+    for root, _, files in os.walk(template_dir):
+        for name in files:
+            if not name.endswith('.html'):
+                continue
+            path = os.path.join(root, name)
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            rewritten, img_count = img_pattern.subn(rewrite_img, content)
+            rewritten, css_count = css_pattern.subn(rewrite_css, rewritten)
+            if img_count or css_count:
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(rewritten)
+                summary['files'] += 1
+                summary['urls'] += img_count + css_count
+    return summary
+
+
+def _write_atomic(path, write):
+    """Write via a temp file so concurrent workers never read a partial image"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
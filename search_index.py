@@ -0,0 +1,417 @@
+"""
+Search Index Module for Vidensbank
+Full-text search over CMS pages: SQLite FTS5 or PostgreSQL tsvector + GIN,
+ranked, paginated and with highlighted snippets, behind a per-worker result cache
+"""
+
+from markupsafe import Markup, escape
+from sqlalchemy import event, text
+from sqlalchemy.orm import object_session
+from sqlalchemy.exc import SQLAlchemyError
+from collections import Counter, OrderedDict
+from datetime import datetime
+import html
+import logging
+import math
+import os
+import re
+import threading
+import time
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'page_fts'
+STATS_TABLE = 'search_query_stats'
+# Longer queries are searched but not counted
+MAX_COUNTED_QUERY = 200
+TAG_PATTERN = re.compile(r'<[^>]+>')
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+# Highlight markers that cannot occur in page text; swapped for <mark> after escaping
+MARK_START = '\x02'
+MARK_END = '\x03'
+
+# Session.info key for the indexes whose pages changed in the open transaction
+PENDING_KEY = 'search_index_pending'
+
+
+def strip_html(content):
+    """Plain text of a page body, as it is indexed and shown in snippets"""
+    return ' '.join(html.unescape(TAG_PATTERN.sub(' ', content or '')).split())
+
+
+def normalize_query(query):
+    """Cache and statistics key for a query: lowercased, single-spaced"""
+    return ' '.join((query or '').lower().split())
+
+
+def highlight(fragment):
+    """Escape a snippet and turn the index's match markers into <mark> tags"""
+    escaped = str(escape(fragment or ''))
+    return Markup(escaped.replace(MARK_START, '<mark>').replace(MARK_END, '</mark>'))
+
+
+class SearchIndex:
+    """Keeps the full-text index of the Page model in sync and queries it"""
+
+    def __init__(self, app=None, db=None, model=None):
+        self.app = None
+        self.db = None
+        self.model = None
+        self._ready = set()
+        self._results = OrderedDict()
+        self._stamp = None
+        self._lock = threading.Lock()
+        self.query_counts = Counter()
+        self._flushed_at = time.monotonic()
+        if app is not None:
+            self.init_app(app, db, model)
+
+    def init_app(self, app, db, model):
+        app.config.setdefault('SEARCH_PER_PAGE', 10)
+        # Words of context around the first match in a result snippet
+        app.config.setdefault('SEARCH_SNIPPET_WORDS', 24)
+        app.config.setdefault('SEARCH_CACHE_ENABLED', True)
+        app.config.setdefault('SEARCH_CACHE_SIZE', 512)
+        app.config.setdefault('SEARCH_CACHE_TTL', 300)
+        # Touched on every page change so the other workers drop their results too
+        app.config.setdefault('SEARCH_CACHE_STAMP', os.path.join(app.instance_path, 'search_cache.stamp'))
+        app.config.setdefault('SEARCH_STATS_FLUSH_INTERVAL', 60)
+        app.config.setdefault('SEARCH_WARM_QUERIES', 20)
+        app.extensions['search_index'] = self
+        self.app = app
+        self.db = db
+        self.model = model
+
+        # Postgres keeps its generated tsvector column current by itself;
+        # the FTS5 table is written from the same transaction as the page
+        event.listen(model, 'after_insert', self._sync_page)
+        event.listen(model, 'after_update', self._sync_page)
+        event.listen(model, 'after_delete', self._remove_page)
+        # Results are only dropped once the change is committed; dropping them during
+        # the flush let a concurrent search re-cache the old rows for SEARCH_CACHE_TTL
+        event.listen(db.session, 'after_commit', self._after_commit)
+        event.listen(db.session, 'after_rollback', self._after_rollback)
+
+    @property
+    def table(self):
+        return self.model.__tablename__
+
+    def ensure_schema(self, connection=None):
+        """Create the index for the current database if it is missing"""
+        if connection is None:
+            with self.db.engine.begin() as connection:
+                return self.ensure_schema(connection)
+
+        key = str(connection.engine.url)
+        if key in self._ready:
+            return
+        dialect = connection.dialect.name
+
+        connection.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {STATS_TABLE} (
+                query VARCHAR({MAX_COUNTED_QUERY}) PRIMARY KEY,
+                hits INTEGER NOT NULL,
+                last_searched TIMESTAMP
+            )
+        """))
+
+        if dialect == 'sqlite':
+            exists = connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {'name': FTS_TABLE}
+            ).first()
+            if not exists:
+                connection.execute(text(
+                    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(title, body, tokenize='unicode61')"
+                ))
+                self._rebuild_sqlite(connection)
+        elif dialect == 'postgresql':
+            connection.execute(text(f"""
+                ALTER TABLE {self.table} ADD COLUMN IF NOT EXISTS search_vector tsvector
+                GENERATED ALWAYS AS (
+                    setweight(to_tsvector('danish', coalesce(title, '')), 'A') ||
+                    setweight(to_tsvector('danish', regexp_replace(coalesce(content, ''), '<[^>]+>', ' ', 'g')), 'B')
+                ) STORED
+            """))
+            connection.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{self.table}_search_vector ON {self.table} USING GIN (search_vector)"
+            ))
+        self._ready.add(key)
+
+    def rebuild(self):
+        """
+        Re-index every page from scratch.
+
+        Returns:
+            Number of pages indexed
+        """
+        with self.db.engine.begin() as connection:
+            self.ensure_schema(connection)
+            if connection.dialect.name == 'sqlite':
+                count = self._rebuild_sqlite(connection)
+            else:
+                count = connection.execute(text(f"SELECT count(*) FROM {self.table}")).scalar()
+        self.invalidate()
+        return count
+
+    def search(self, query, page=1, per_page=None):
+        """
+        Ranked full-text search over published pages. Results are cached per
+        normalized query and page for SEARCH_CACHE_TTL seconds.
+
+        Returns:
+            Dict with hits (page, title and snippet markup, rank), total,
+            page, per_page and pages
+        """
+        per_page = per_page or self.app.config['SEARCH_PER_PAGE']
+        page = max(page, 1)
+        results = {'hits': [], 'total': 0, 'page': page, 'per_page': per_page, 'pages': 0}
+        query = normalize_query(query)
+        if not TOKEN_PATTERN.search(query):
+            return results
+
+        self._count(query)
+        total, rows = self._ranked(query, page, per_page)
+
+        ids = [row[0] for row in rows]
+        pages = {p.id: p for p in self.model.query.filter(self.model.id.in_(ids))} if ids else {}
+        results['hits'] = [
+            {'page': pages[page_id], 'title': highlight(title), 'snippet': highlight(snippet), 'rank': rank}
+            for page_id, title, snippet, rank in rows if page_id in pages
+        ]
+        results['total'] = total
+        results['pages'] = math.ceil(total / per_page)
+        return results
+
+    def warm(self, limit=None):
+        """
+        Run the most searched queries so their first page is cached before traffic arrives.
+
+        Returns:
+            Number of queries warmed
+        """
+        limit = limit or self.app.config['SEARCH_WARM_QUERIES']
+        with self.app.app_context():
+            try:
+                self.ensure_schema()
+                queries = self.db.session.execute(
+                    text(f"SELECT query FROM {STATS_TABLE} ORDER BY hits DESC, query LIMIT :limit"), {'limit': limit}
+                ).scalars().all()
+                for query in queries:
+                    self._ranked(query, 1, self.app.config['SEARCH_PER_PAGE'])
+            except SQLAlchemyError as e:
+                logger.error(f"Search cache warm-up failed: {e}")
+                return 0
+        return len(queries)
+
+    def flush_stats(self):
+        """
+        Add the queries counted since the last flush to the statistics table.
+
+        Returns:
+            Number of distinct queries written
+        """
+        with self._lock:
+            counts, self.query_counts = self.query_counts, Counter()
+            self._flushed_at = time.monotonic()
+        if not counts:
+            return 0
+
+        now = datetime.utcnow()
+        try:
+            with self.app.app_context(), self.db.engine.begin() as connection:
+                self.ensure_schema(connection)
+                connection.execute(text(f"""
+                    INSERT INTO {STATS_TABLE} (query, hits, last_searched) VALUES (:query, :hits, :now)
+                    ON CONFLICT (query) DO UPDATE
+                    SET hits = {STATS_TABLE}.hits + excluded.hits, last_searched = excluded.last_searched
+                """), [{'query': query, 'hits': hits, 'now': now} for query, hits in counts.items()])
+        except SQLAlchemyError as e:
+            logger.error(f"Could not store search statistics: {e}")
+            # Keep them for the next attempt
+            with self._lock:
+                self.query_counts.update(counts)
+            return 0
+        return len(counts)
+
+    def invalidate(self):
+        """Drop cached results in this worker and, through the stamp file, in all others"""
+        self.clear_cache()
+        stamp = self.app.config['SEARCH_CACHE_STAMP']
+        try:
+            os.makedirs(os.path.dirname(stamp), exist_ok=True)
+            with open(stamp, 'a'):
+                pass
+            now = time.time_ns()
+            os.utime(stamp, ns=(now, now))
+        except OSError as e:
+            logger.warning(f"Could not touch search cache stamp {stamp}: {e}")
+
+    def clear_cache(self):
+        with self._lock:
+            self._results.clear()
+
+    def _ranked(self, query, page, per_page):
+        """(total, rows) for a normalized query, from the cache when possible"""
+        key = (query, page, per_page)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        self.ensure_schema()
+        dialect = self.db.engine.dialect.name
+        if dialect == 'sqlite':
+            total, rows = self._search_sqlite(query, per_page, (page - 1) * per_page)
+        elif dialect == 'postgresql':
+            total, rows = self._search_postgres(query, per_page, (page - 1) * per_page)
+        else:
+            total, rows = self._search_fallback(query, per_page, (page - 1) * per_page)
+
+        # Only ids, highlighted text and ranks are kept; pages are loaded fresh per request
+        result = (total, [tuple(row) for row in rows])
+        if self.app.config['SEARCH_CACHE_ENABLED']:
+            with self._lock:
+                self._results[key] = (time.monotonic() + self.app.config['SEARCH_CACHE_TTL'], result)
+                while len(self._results) > self.app.config['SEARCH_CACHE_SIZE']:
+                    self._results.popitem(last=False)
+        return result
+
+    def _cached(self, key):
+        if not self.app.config['SEARCH_CACHE_ENABLED']:
+            return None
+        self._check_stamp()
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._results[key]
+                return None
+            self._results.move_to_end(key)
+            return entry[1]
+
+    def _check_stamp(self):
+        """Clear the cache when another worker changed a page since we last looked"""
+        try:
+            stamp = os.stat(self.app.config['SEARCH_CACHE_STAMP']).st_mtime_ns
+        except FileNotFoundError:
+            stamp = None
+        if stamp != self._stamp:
+            self._stamp = stamp
+            self.clear_cache()
+
+    def _count(self, query):
+        if len(query) > MAX_COUNTED_QUERY:
+            return
+        with self._lock:
+            self.query_counts[query] += 1
+            due = time.monotonic() - self._flushed_at >= self.app.config['SEARCH_STATS_FLUSH_INTERVAL']
+        if due:
+            self.flush_stats()
+
+    def _search_sqlite(self, query, limit, offset):
+        # Every word must match; the last one as a prefix so partial input still finds pages
+        tokens = TOKEN_PATTERN.findall(query.lower())
+        match = ' '.join(f'"{token}"' for token in tokens[:-1]) + f' "{tokens[-1]}"*'
+        where = f"""
+            FROM {FTS_TABLE} JOIN {self.table} ON {self.table}.id = {FTS_TABLE}.rowid
+            WHERE {FTS_TABLE} MATCH :match AND {self.table}.is_published = 1
+        """
+        params = {'match': match.strip(), 'start': MARK_START, 'end': MARK_END,
+                  'words': self.app.config['SEARCH_SNIPPET_WORDS'], 'limit': limit, 'offset': offset}
+
+        session = self.db.session
+        total = session.execute(text(f"SELECT count(*) {where}"), params).scalar()
+        rows = session.execute(text(f"""
+            SELECT {self.table}.id,
+                   highlight({FTS_TABLE}, 0, :start, :end),
+                   snippet({FTS_TABLE}, 1, :start, :end, '…', :words),
+                   bm25({FTS_TABLE}, 10.0, 1.0) AS rank
+            {where}
+            ORDER BY rank
+            LIMIT :limit OFFSET :offset
+        """), params).all()
+        return total, rows
+
+    def _search_postgres(self, query, limit, offset):
+        words = self.app.config['SEARCH_SNIPPET_WORDS']
+        options = f"StartSel={MARK_START}, StopSel={MARK_END}, MaxWords={words}, MinWords={words // 2}"
+        where = f"""
+            FROM {self.table}, websearch_to_tsquery('danish', :query) AS q
+            WHERE {self.table}.search_vector @@ q AND {self.table}.is_published
+        """
+        params = {'query': query, 'options': options, 'limit': limit, 'offset': offset}
+
+        session = self.db.session
+        total = session.execute(text(f"SELECT count(*) {where}"), params).scalar()
+        rows = session.execute(text(f"""
+            SELECT {self.table}.id,
+                   ts_headline('danish', {self.table}.title, q, :options || ', HighlightAll=true'),
+                   ts_headline('danish', regexp_replace({self.table}.content, '<[^>]+>', ' ', 'g'), q, :options),
+                   ts_rank_cd({self.table}.search_vector, q) AS rank
+            {where}
+            ORDER BY rank DESC
+            LIMIT :limit OFFSET :offset
+        """), params).all()
+        return total, rows
+
+    def _search_fallback(self, query, limit, offset):
+        """Unranked substring match for databases without a full-text engine"""
+        Page = self.model
+        filtered = Page.query.filter(
+            self.db.or_(Page.title.ilike(f'%{query}%'), Page.content.ilike(f'%{query}%')),
+            Page.is_published == True
+        )
+        total = filtered.count()
+        pages = filtered.order_by(Page.updated_at.desc()).limit(limit).offset(offset).all()
+        words = self.app.config['SEARCH_SNIPPET_WORDS']
+        return total, [(p.id, p.title, ' '.join(strip_html(p.content).split()[:words]), 0.0) for p in pages]
+
+    def _rebuild_sqlite(self, connection):
+        connection.execute(text(f"DELETE FROM {FTS_TABLE}"))
+        rows = connection.execute(text(f"SELECT id, title, content FROM {self.table}")).all()
+        for page_id, title, content in rows:
+            self._write_sqlite(connection, page_id, title, content)
+        return len(rows)
+
+    def _write_sqlite(self, connection, page_id, title, content):
+        connection.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {'id': page_id})
+        connection.execute(
+            text(f"INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (:id, :title, :body)"),
+            {'id': page_id, 'title': title or '', 'body': strip_html(content)}
+        )
+
+    def _sync_page(self, mapper, connection, target):
+        # Covers publishing and unpublishing as well as edits
+        self._mark_changed(target)
+        if connection.dialect.name != 'sqlite':
+            return
+        self.ensure_schema(connection)
+        self._write_sqlite(connection, target.id, target.title, target.content)
+
+    def _remove_page(self, mapper, connection, target):
+        self._mark_changed(target)
+        if connection.dialect.name != 'sqlite':
+            return
+        self.ensure_schema(connection)
+        connection.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {'id': target.id})
+
+    def _mark_changed(self, target):
+        session = object_session(target)
+        if session is None:
+            self.invalidate()
+            return
+        session.info.setdefault(PENDING_KEY, set()).add(self)
+
+    def _after_commit(self, session):
+        pending = session.info.get(PENDING_KEY)
+        if pending and self in pending:
+            pending.discard(self)
+            self.invalidate()
+
+    def _after_rollback(self, session):
+        # The pages were never committed, so the cached results are still right
+        pending = session.info.get(PENDING_KEY)
+        if pending:
+            pending.discard(self)
@@ -1,10 +1,39 @@
 import json
+import logging
 import os
 
+# Configure logging
+logger = logging.getLogger(__name__)
+
 class SourcingEngine:
     def __init__(self, data_path='data/sourcing_data.json'):
         self.data_path = os.path.join(os.path.dirname(__file__), data_path)
+        self._data_mtime = self._get_data_mtime()
         self.data = self._load_data()
+        self.substitution_graph = self._build_substitution_graph()
+
+    def _get_data_mtime(self):
+        try:
+            return os.path.getmtime(self.data_path)
+        except OSError:
+            return None
+
+    def _refresh_if_changed(self):
+        """Reload the catalog and rebuild the substitution graph if the data file changed."""
+        mtime = self._get_data_mtime()
+        if mtime == self._data_mtime:
+            return
+        try:
+            with open(self.data_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            graph = self._build_substitution_graph(data)
+        except (OSError, ValueError, KeyError) as e:
+            # Half-written or broken file: keep serving the previous catalog and
+            # try again on the next request, since the mtime is not recorded
+            logger.error(f"Could not reload {self.data_path}: {e}")
+            return
+        self.data, self.substitution_graph = data, graph
+        self._data_mtime = mtime
 
     def _load_data(self):
         try:
@@ -18,6 +47,7 @@ class SourcingEngine:
         """
         Returns a list of items with calculated scores for the given month (0-11).
         """
+        self._refresh_if_changed()
         recommendations = []
         month_key = str(month_index)
 
@@ -80,6 +110,67 @@ class SourcingEngine:
         # Sort by score descending
         return sorted(recommendations, key=lambda x: x['score'], reverse=True)
 
+    def get_substitutes(self, month_index, item_key, limit=3):
+        """
+        Returns the best in-season DK replacements for an item in the given month (0-11),
+        or None if the item is not in the catalog.
+        """
+        self._refresh_if_changed()
+        if item_key not in self.data:
+            return None
+        return self.substitution_graph.get(str(month_index), {}).get(item_key, [])[:limit]
+
+    def _build_substitution_graph(self, data=None):
+        """
+        Precompute, per month, an edge list from every item that is out of season in DK
+        to the in-season DK items of the same category, best replacement first.
+        """
+        data = self.data if data is None else data
+        graph = {}
+        for month_index in range(12):
+            month_key = str(month_index)
+            available = {}
+            for item_key, item_data in data.items():
+                month_data = item_data['months'].get(month_key)
+                if not month_data or month_data.get('dk_status') == 'Ude':
+                    continue
+                dk_co2 = self._calculate_co2(item_data.get('co2_base', 0.5), 'DK')
+                dk_score = self._calculate_score(
+                    price=month_data.get('dk_price', 0),
+                    quality=month_data.get('dk_quality', 0),
+                    co2=dk_co2,
+                    is_local=True
+                )
+                if dk_score > 0:
+                    available[item_key] = (dk_co2, dk_score, month_data.get('dk_status'))
+
+            edges = {}
+            for item_key, item_data in data.items():
+                month_data = item_data['months'].get(month_key)
+                if month_data and month_data.get('dk_status') != 'Ude':
+                    continue
+                co2_base = item_data.get('co2_base', 0.5)
+                import_origin = month_data.get('import_origin', 'World') if month_data else 'World'
+                import_co2 = self._calculate_co2(co2_base, import_origin)
+                substitutes = []
+                for sub_key, (sub_co2, sub_score, sub_status) in available.items():
+                    if sub_key == item_key or data[sub_key]['category'] != item_data['category']:
+                        continue
+                    substitutes.append({
+                        'id': sub_key,
+                        'name': data[sub_key]['name'],
+                        'category': data[sub_key]['category'],
+                        'status': sub_status,
+                        'co2': round(sub_co2, 2),
+                        'co2_saving': round(import_co2 - sub_co2, 2),
+                        'score': round(sub_score * 100)
+                    })
+                # Best score first, closest CO2 footprint as tie-breaker
+                substitutes.sort(key=lambda x: (-x['score'], abs(x['co2'] - co2_base)))
+                edges[item_key] = substitutes
+            graph[month_key] = edges
+        return graph
+
     def _calculate_co2(self, base_co2, origin):
         """
         Calculate total CO2 based on origin transport multipliers.
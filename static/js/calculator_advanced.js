@@ -0,0 +1,227 @@
+/**
+ * Vidensbank - Kantineklimaberegner
+ * Loads canteens from /api/canteens and calculates impact via /api/calculator/calculate
+ */
+
+let canteens = [];
+let selectedCanteen = null;
+let baselineData = null;
+
+// Load canteens on page load
+document.addEventListener('DOMContentLoaded', async () => {
+    await loadCanteens();
+});
+
+async function loadCanteens() {
+    try {
+        const response = await fetch('/api/canteens');
+        const data = await response.json();
+
+        if (data.success) {
+            canteens = data.canteens;
+            populateCanteenDropdown();
+        }
+    } catch (error) {
+        console.error('Error loading canteens:', error);
+    }
+}
+
+function populateCanteenDropdown() {
+    const select = document.getElementById('canteenSelect');
+
+    canteens.forEach(canteen => {
+        const option = document.createElement('option');
+        option.value = canteen.id;
+        option.textContent = `${canteen.name} - ${canteen.location}`;
+        select.appendChild(option);
+    });
+
+    select.addEventListener('change', handleCanteenSelection);
+
+    // Canteen suggestions from the search box link here with ?canteen=<id>
+    const preselected = new URLSearchParams(window.location.search).get('canteen');
+    if (preselected && canteens.some(c => String(c.id) === preselected)) {
+        select.value = preselected;
+        select.dispatchEvent(new Event('change'));
+    }
+}
+
+function handleCanteenSelection(e) {
+    const canteenId = parseInt(e.target.value);
+
+    if (!canteenId) {
+        hideAllSections();
+        return;
+    }
+
+    selectedCanteen = canteens.find(c => c.id === canteenId);
+
+    if (selectedCanteen) {
+        baselineData = selectedCanteen.baseline;
+        displayCanteenInfo();
+        displayBaseline();
+        showParametersSection();
+        updateProgressSteps(2);
+    }
+}
+
+function displayCanteenInfo() {
+    document.getElementById('canteenInfo').style.display = 'block';
+    document.getElementById('canteenAddress').textContent = selectedCanteen.address;
+    document.getElementById('canteenEmployees').textContent = selectedCanteen.employees.toLocaleString();
+}
+
+function displayBaseline() {
+    document.getElementById('baselineCard').style.display = 'block';
+    document.getElementById('baselineCO2').textContent = baselineData.co2_per_kg.toFixed(2);
+    document.getElementById('baselineGreen').textContent = baselineData.green_percent.toFixed(1) + '%';
+    document.getElementById('baselineMeat').textContent = baselineData.meat_percent.toFixed(1) + '%';
+    document.getElementById('baselineOrganic').textContent = baselineData.organic_percent.toFixed(1) + '%';
+    document.getElementById('baselineWaste').textContent = baselineData.food_waste_percent.toFixed(1) + '%';
+    document.getElementById('baselineLocal').textContent = baselineData.local_sourced.toFixed(1) + '%';
+}
+
+function showParametersSection() {
+    document.getElementById('parametersCard').style.display = 'block';
+    updateProgressSteps(3);
+}
+
+function hideAllSections() {
+    document.getElementById('canteenInfo').style.display = 'none';
+    document.getElementById('baselineCard').style.display = 'none';
+    document.getElementById('parametersCard').style.display = 'none';
+    document.getElementById('resultsSection').style.display = 'none';
+    updateProgressSteps(1);
+}
+
+function updateProgressSteps(activeStep) {
+    for (let i = 1; i <= 4; i++) {
+        const step = document.getElementById(`step${i}`);
+        step.classList.remove('active', 'completed');
+
+        if (i < activeStep) {
+            step.classList.add('completed');
+        } else if (i === activeStep) {
+            step.classList.add('active');
+        }
+    }
+}
+
+async function calculateImpact() {
+    if (!selectedCanteen) {
+        alert('Vælg venligst en kantine først!');
+        return;
+    }
+
+    // Show loading
+    const button = document.getElementById('calcButton');
+    button.disabled = true;
+    button.innerHTML = '<i class="bi bi-hourglass-split"></i> Beregner...';
+
+    // Collect parameters
+    const params = {
+        employees: selectedCanteen.employees,
+        meals_per_day: 1,
+        operating_days: selectedCanteen.operating_days,
+        attendance_rate: 0.85,
+        meat_distribution: {
+            red_meat_percent: baselineData.meat_percent * 0.3,
+            bright_meat_percent: baselineData.meat_percent * 0.5,
+            fish_percent: baselineData.meat_percent * 0.2,
+            vegetarian_percent: baselineData.green_percent
+        },
+        portion_sizes: {
+            protein_gram: 120,
+            vegetables_gram: 200,
+            carbs_gram: 150
+        },
+        organic_percent: {
+            meat: parseFloat(document.getElementById('organicPercent').value),
+            vegetables: 60,
+            dairy: 30
+        },
+        waste: {
+            preparation: parseFloat(document.getElementById('wastePrep').value),
+            plate: parseFloat(document.getElementById('wastePlate').value),
+            buffet: parseFloat(document.getElementById('wasteBuffet').value)
+        },
+        local_sourcing: parseFloat(document.getElementById('danishPercent').value),
+        seasonal_produce: 50
+    };
+
+    try {
+        const response = await fetch('/api/calculate-canteen-impact', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify(params)
+        });
+
+        const data = await response.json();
+
+        if (data.success) {
+            displayResults(data.results);
+            updateProgressSteps(4);
+        } else {
+            alert('Fejl: ' + data.error);
+        }
+    } catch (error) {
+        alert('Der opstod en fejl: ' + error.message);
+    } finally {
+        button.disabled = false;
+        button.innerHTML = '<i class="bi bi-calculator"></i> Beregn Klimaaftryk';
+    }
+}
+
+function displayResults(results) {
+    // Show results section
+    document.getElementById('resultsSection').style.display = 'block';
+
+    // Main metrics
+    document.getElementById('mainResult').textContent = results.per_meal_kg.toFixed(2);
+    document.getElementById('annualTons').textContent = results.annual_tons.toFixed(1);
+    document.getElementById('costSavings').textContent = Math.round(results.estimated_cost_savings_dkk).toLocaleString();
+
+    // Calculate vs baseline
+    const vsBaseline = ((results.per_meal_kg - baselineData.co2_per_kg) / baselineData.co2_per_kg * 100).toFixed(1);
+    const vsText = vsBaseline > 0 ? `+${vsBaseline}%` : `${vsBaseline}%`;
+    document.getElementById('vsBaseline').textContent = vsText;
+    document.getElementById('vsBaseline').style.color = vsBaseline > 0 ? '#ef5350' : '#66bb6a';
+
+    // Display recommendations
+    displayRecommendations(results.recommendations);
+
+    // Scroll to results
+    document.getElementById('resultsSection').scrollIntoView({behavior: 'smooth', block: 'start'});
+}
+
+function displayRecommendations(recommendations) {
+    const container = document.getElementById('recommendationsContainer');
+    container.innerHTML = '';
+
+    recommendations.forEach(rec => {
+        const recDiv = document.createElement('div');
+        recDiv.className = 'recommendation';
+        recDiv.innerHTML = `
+            <div class="rec-header">
+                <div class="rec-title">${rec.title}</div>
+                <div class="rec-priority">#${rec.priority}</div>
+            </div>
+            <div class="rec-description">${rec.description}</div>
+            <div class="rec-stats">
+                <div class="rec-stat">
+                    <i class="bi bi-graph-down"></i>
+                    <strong>${rec.annual_saving_tons.toFixed(1)} tons/år</strong>
+                </div>
+                <div class="rec-stat">
+                    <i class="bi bi-clock"></i>
+                    ${rec.implementation_time}
+                </div>
+                <div class="rec-stat">
+                    <i class="bi bi-speedometer2"></i>
+                    ${rec.difficulty}
+                </div>
+            </div>
+        `;
+        container.appendChild(recDiv);
+    });
+}
@@ -0,0 +1,31 @@
+/**
+ * Vidensbank - Mit Aftryk: CO2e aftryk pr. gæst
+ */
+
+document.addEventListener('DOMContentLoaded', function () {
+  const inputs = ['guests', 'beef', 'veg'];
+
+  function calculate() {
+    const guests = parseFloat(document.getElementById('guests').value) || 0;
+    const beef = parseFloat(document.getElementById('beef').value) || 0;
+    const veg = parseFloat(document.getElementById('veg').value) || 0;
+
+    // Factors based on Concito averages (approx)
+    const beefFactor = 28; // High impact
+    const vegFactor = 0.4; // Low impact
+
+    const total = (beef * beefFactor) + (veg * vegFactor);
+    const perGuest = guests > 0 ? (total / (guests * 5)) : 0; // Assuming 5 days a week
+    const carKm = total / 0.12; // Approx 120g/km for a new car
+
+    document.getElementById('resultValue').textContent = Math.round(total).toLocaleString('da-DK');
+    document.getElementById('perGuestValue').textContent = perGuest.toFixed(2).replace('.', ',') + ' kg';
+    document.getElementById('carKmValue').textContent = Math.round(carKm).toLocaleString('da-DK') + ' km';
+  }
+
+  inputs.forEach(id => {
+    document.getElementById(id).addEventListener('input', calculate);
+  });
+
+  calculate();
+});
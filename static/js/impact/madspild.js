@@ -0,0 +1,44 @@
+/**
+ * Vidensbank - Mit Aftryk: Madspild omregnet til CO2e, bilkm og måltider
+ */
+
+document.addEventListener('DOMContentLoaded', function () {
+  const wasteInput = document.getElementById('wasteInput');
+  const wasteRange = document.getElementById('wasteRange');
+  const co2Output = document.getElementById('co2Output');
+  const carKmOutput = document.getElementById('carKmOutput');
+  const mealsOutput = document.getElementById('mealsOutput');
+
+  // Constants
+  const CO2_PER_KG_WASTE = 2.5; // Avg CO2e per kg of mixed food waste
+  const KG_PER_MEAL = 0.5; // Avg weight of a meal
+  const CO2_PER_KM_CAR = 0.12; // Avg CO2e per km driving
+
+  function updateCalculator() {
+    const weeklyWaste = parseFloat(wasteInput.value) || 0;
+    const annualWaste = weeklyWaste * 52;
+
+    const annualCO2 = annualWaste * CO2_PER_KG_WASTE;
+    const annualMeals = annualWaste / KG_PER_MEAL;
+    const carKm = annualCO2 / CO2_PER_KM_CAR;
+
+    // Animate numbers (simple version)
+    co2Output.textContent = Math.round(annualCO2).toLocaleString('da-DK');
+    mealsOutput.textContent = Math.round(annualMeals).toLocaleString('da-DK');
+    carKmOutput.textContent = Math.round(carKm).toLocaleString('da-DK');
+  }
+
+  // Sync inputs
+  wasteInput.addEventListener('input', function () {
+    wasteRange.value = this.value;
+    updateCalculator();
+  });
+
+  wasteRange.addEventListener('input', function () {
+    wasteInput.value = this.value;
+    updateCalculator();
+  });
+
+  // Initialize
+  updateCalculator();
+});
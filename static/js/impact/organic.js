@@ -0,0 +1,57 @@
+/**
+ * Vidensbank - Mit Aftryk: Økologiprocent og mærkeniveau
+ */
+
+document.addEventListener('DOMContentLoaded', function () {
+    const totalInput = document.getElementById('totalInput');
+    const organicInput = document.getElementById('organicInput');
+    const resultValue = document.getElementById('resultValue');
+    const labelStatus = document.getElementById('labelStatus');
+    const resultContainer = document.getElementById('resultContainer');
+    const nextGoal = document.getElementById('nextGoal');
+    const missingValue = document.getElementById('missingValue');
+
+    function calculate() {
+        const total = parseFloat(totalInput.value) || 0;
+        const organic = parseFloat(organicInput.value) || 0;
+
+        if (total === 0) {
+            resultValue.textContent = '0%';
+            return;
+        }
+
+        const percentage = (organic / total) * 100;
+        resultValue.textContent = Math.round(percentage) + '%';
+
+        // Update UI based on percentage
+        if (percentage >= 90) {
+            labelStatus.textContent = 'Guld Mærke';
+            resultContainer.className = 'flex flex-col justify-center bg-yellow-600 p-8 text-white md:p-16 transition-colors duration-500';
+            nextGoal.textContent = 'Mål Nået!';
+            missingValue.textContent = '0';
+        } else if (percentage >= 60) {
+            labelStatus.textContent = 'Sølv Mærke';
+            resultContainer.className = 'flex flex-col justify-center bg-stone-500 p-8 text-white md:p-16 transition-colors duration-500';
+            nextGoal.textContent = 'Guld (90%)';
+            const needed = (0.9 * total) - organic;
+            missingValue.textContent = Math.round(needed);
+        } else if (percentage >= 30) {
+            labelStatus.textContent = 'Bronze Mærke';
+            resultContainer.className = 'flex flex-col justify-center bg-amber-700 p-8 text-white md:p-16 transition-colors duration-500';
+            nextGoal.textContent = 'Sølv (60%)';
+            const needed = (0.6 * total) - organic;
+            missingValue.textContent = Math.round(needed);
+        } else {
+            labelStatus.textContent = 'Ingen Mærke';
+            resultContainer.className = 'flex flex-col justify-center bg-cb-green-dark p-8 text-white md:p-16 transition-colors duration-500';
+            nextGoal.textContent = 'Bronze (30%)';
+            const needed = (0.3 * total) - organic;
+            missingValue.textContent = Math.round(needed);
+        }
+    }
+
+    totalInput.addEventListener('input', calculate);
+    organicInput.addEventListener('input', calculate);
+
+    calculate();
+});
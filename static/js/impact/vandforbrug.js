@@ -0,0 +1,45 @@
+/**
+ * Vidensbank - Mit Aftryk: Vandaftryk for fødevarer
+ */
+
+document.addEventListener('DOMContentLoaded', function () {
+  const foodSelect = document.getElementById('foodSelect');
+  const amountInput = document.getElementById('amountInput');
+  const waterOutput = document.getElementById('waterOutput');
+  const showerOutput = document.getElementById('showerOutput');
+  const visualBar = document.getElementById('visualBar');
+
+  const LITERS_PER_SHOWER = 50;
+  const MAX_SCALE = 16000; // For visual bar scaling
+
+  function updateCalculator() {
+    const litersPerKg = parseInt(foodSelect.value);
+    const amount = parseFloat(amountInput.value) || 0;
+
+    const totalLiters = litersPerKg * amount;
+    const showers = totalLiters / LITERS_PER_SHOWER;
+
+    // Update text
+    waterOutput.textContent = Math.round(totalLiters).toLocaleString('da-DK');
+    showerOutput.textContent = Math.round(showers).toLocaleString('da-DK');
+
+    // Update visual bar (based on per kg value to show intensity)
+    const percentage = Math.min((litersPerKg / MAX_SCALE) * 100, 100);
+    visualBar.style.width = percentage + '%';
+
+    // Change color based on intensity
+    if (litersPerKg < 1000) {
+      visualBar.className = "absolute left-0 top-0 h-full bg-cb-green-dark transition-all duration-500";
+    } else if (litersPerKg < 5000) {
+      visualBar.className = "absolute left-0 top-0 h-full bg-cb-yellow-dark transition-all duration-500";
+    } else {
+      visualBar.className = "absolute left-0 top-0 h-full bg-cb-blue-dark transition-all duration-500";
+    }
+  }
+
+  foodSelect.addEventListener('change', updateCalculator);
+  amountInput.addEventListener('input', updateCalculator);
+
+  // Initialize
+  updateCalculator();
+});
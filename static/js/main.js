@@ -5,20 +5,26 @@
 
 document.addEventListener('DOMContentLoaded', function() {
     initFlashMessages();
-    initScrollAnimations();
     initNavbarScroll();
+    addLoadingState();
+    initSearchEnhancement();
+    initKeyboardNav();
+    initParallaxEffect();
+    initContent();
+    fragmentNav.init();
+});
+
+// Behaviour bound to elements inside <main>, re-run after a fragment swap
+function initContent() {
+    initScrollAnimations();
     initProgressBars();
     initStatCounters();
     initTimelineHighlight();
-    addLoadingState();
-    initSearchEnhancement();
     initCopyButtons();
     initLazyLoad();
-    initKeyboardNav();
     initTooltips();
     initAwwCardsAnimation();
-    initParallaxEffect();
-});
+}
 
 // ============================================================================
 // FLASH MESSAGES
@@ -336,7 +342,7 @@ function debounce(func, wait) {
 function initSearchEnhancement() {
     const searchInputs = document.querySelectorAll('input[type="search"], input[name="q"]');
 
-    searchInputs.forEach(input => {
+    searchInputs.forEach((input, index) => {
         input.addEventListener('input', debounce(function(e) {
             const value = e.target.value;
             if (value.length >= 2) {
@@ -348,6 +354,45 @@ function initSearchEnhancement() {
                 input.style.boxShadow = '';
             }
         }, 300));
+        initSuggestions(input, index);
+    });
+}
+
+// Typeahead from /api/suggest; picking a suggestion opens it directly
+function initSuggestions(input, index) {
+    const list = document.createElement('datalist');
+    list.id = `search-suggestions-${index}`;
+    input.after(list);
+    input.setAttribute('list', list.id);
+    input.setAttribute('autocomplete', 'off');
+
+    const urls = new Map();
+    let controller = null;
+
+    input.addEventListener('input', debounce(async function() {
+        const query = input.value.trim();
+        if (controller) controller.abort();
+        if (query.length < 2 || urls.has(input.value)) return;
+
+        controller = new AbortController();
+        try {
+            const response = await fetch(`/api/suggest?q=${encodeURIComponent(query)}`, { signal: controller.signal });
+            const data = await response.json();
+            urls.clear();
+            list.replaceChildren(...data.suggestions.map(suggestion => {
+                urls.set(suggestion.label, suggestion.url);
+                const option = document.createElement('option');
+                option.value = suggestion.label;
+                return option;
+            }));
+        } catch (err) {
+            if (err.name !== 'AbortError') console.error('Suggestions failed:', err);
+        }
+    }, 80));
+
+    input.addEventListener('change', () => {
+        const url = urls.get(input.value);
+        if (url) window.location.href = url;
     });
 }
 
@@ -583,4 +628,133 @@ rippleStyle.textContent = `
 `;
 document.head.appendChild(rippleStyle);
 
+// ============================================================================
+// FRAGMENT NAVIGATION (swap #main-content within a topic)
+// ============================================================================
+// Links between pages of the same topic (e.g. /vidensbank/emissioner/...)
+// fetch only the content block (X-Fragment: content) and swap it into <main>.
+// Pages that ship their own scripts or forms fall back to a normal page load.
+const fragmentNav = {
+    cache: new Map(),
+    maxCached: 20,
+    currentPath: window.location.pathname,
+
+    topicOf(pathname) {
+        return pathname.split('/').filter(Boolean).slice(0, 2).join('/');
+    },
+
+    eligibleUrl(link) {
+        if (!link || link.target || link.hasAttribute('download') || link.dataset.noFragment !== undefined) {
+            return null;
+        }
+        const url = new URL(link.href, window.location.href);
+        if (url.origin !== window.location.origin || url.pathname === this.currentPath) {
+            return null;
+        }
+        const topic = this.topicOf(url.pathname);
+        if (!topic.includes('/') || topic !== this.topicOf(this.currentPath)) {
+            return null;
+        }
+        return url;
+    },
+
+    fetchFragment(url) {
+        const key = url.pathname + url.search;
+        if (!this.cache.has(key)) {
+            const request = fetch(key, { headers: { 'X-Fragment': 'content' }, credentials: 'same-origin' })
+                .then(response => {
+                    if (!response.ok) {
+                        throw new Error('HTTP ' + response.status);
+                    }
+                    return response.text();
+                })
+                .catch(error => {
+                    this.cache.delete(key);
+                    throw error;
+                });
+            this.cache.set(key, request);
+            if (this.cache.size > this.maxCached) {
+                this.cache.delete(this.cache.keys().next().value);
+            }
+        }
+        return this.cache.get(key);
+    },
+
+    async navigate(url, push) {
+        let html;
+        try {
+            html = await this.fetchFragment(url);
+        } catch (error) {
+            window.location.assign(url.href);
+            return;
+        }
+
+        const template = document.createElement('template');
+        template.innerHTML = html;
+        // Full documents (templates not extending base.html), scripts and forms need a real page load
+        if (/^\s*<!doctype/i.test(html) || template.content.querySelector('script, form')) {
+            window.location.assign(url.href);
+            return;
+        }
+
+        const title = template.content.querySelector('title');
+        if (title) {
+            document.title = title.textContent;
+            title.remove();
+        }
+        template.content.querySelectorAll('link[rel="stylesheet"]').forEach(link => {
+            if (!document.head.querySelector(`link[rel="stylesheet"][href="${link.getAttribute('href')}"]`)) {
+                document.head.appendChild(link);
+            } else {
+                link.remove();
+            }
+        });
+
+        document.getElementById('main-content').replaceChildren(template.content);
+        this.currentPath = url.pathname;
+        if (push) {
+            history.pushState({ fragment: true }, '', url.href);
+        }
+        window.scrollTo(0, 0);
+        initContent();
+    },
+
+    init() {
+        if (!window.fetch || !history.pushState || !document.getElementById('main-content')) {
+            return;
+        }
+        history.replaceState({ fragment: true }, '');
+
+        const prefetch = (e) => {
+            const url = this.eligibleUrl(e.target.closest && e.target.closest('a[href]'));
+            if (url) {
+                this.fetchFragment(url).catch(() => {});
+            }
+        };
+        document.addEventListener('mouseover', prefetch);
+        document.addEventListener('focusin', prefetch);
+        document.addEventListener('touchstart', prefetch, { passive: true });
+
+        document.addEventListener('click', (e) => {
+            if (e.defaultPrevented || e.button !== 0 || e.metaKey || e.ctrlKey || e.shiftKey || e.altKey) {
+                return;
+            }
+            const url = this.eligibleUrl(e.target.closest('a[href]'));
+            if (url && !url.hash) {
+                e.preventDefault();
+                this.navigate(url, true);
+            }
+        });
+
+        window.addEventListener('popstate', (e) => {
+            const url = new URL(window.location.href);
+            if (!e.state || !e.state.fragment || this.topicOf(url.pathname) !== this.topicOf(this.currentPath)) {
+                window.location.reload();
+                return;
+            }
+            this.navigate(url, false);
+        });
+    }
+};
+
 console.log('✓ Vidensbank JavaScript loaded successfully with premium animations!');
@@ -0,0 +1,63 @@
+/**
+ * Tailwind theme for Vidensbank
+ * Shared by tailwind.config.js (build) and the CDN fallback in base.html (dev)
+ */
+(function (theme) {
+    if (typeof module !== 'undefined' && module.exports) {
+        module.exports = theme;
+    } else {
+        window.tailwind.config = { theme: theme };
+    }
+})({
+    extend: {
+        colors: {
+            emerald: {
+                900: '#064e3b',
+                800: '#065f46',
+            },
+            stone: {
+                50: '#fafaf9',
+            },
+            teal: {
+                100: '#ccfbf1',
+                600: '#0d9488',
+            },
+            cb: {
+                yellow: {
+                    light: '#ffeac0',
+                    medium: '#ffdc96',
+                    dark: '#ffb92d',
+                },
+                orange: {
+                    light: '#ffd4be',
+                    medium: '#ffb793',
+                    dark: '#ff6e28',
+                },
+                blue: {
+                    light: '#e4edf6',
+                    medium: '#d2e1f0',
+                    dark: '#a5c3e1',
+                },
+                green: {
+                    light: '#e3f3e4',
+                    medium: '#d0ebd2',
+                    dark: '#a0d7a5',
+                },
+                taupe: {
+                    light: '#f4f2f1',
+                    medium: '#eceae8',
+                    dark: '#c8c5bd',
+                }
+            }
+        },
+        fontFamily: {
+            display: ['"Big Shoulders Inline Text"', 'cursive'],
+            sans: ['"Work Sans"', 'sans-serif'],
+            system: ['Arial', 'sans-serif'],
+        },
+        letterSpacing: {
+            'brand-wide': '0.05em', // Approx 50 tracking
+            'brand-wider': '0.075em', // Approx 75 tracking
+        }
+    }
+});
@@ -0,0 +1,102 @@
+"""
+Static Asset Module for Vidensbank
+Rewrites static URLs to content-hashed filenames and serves them with far-future caching
+"""
+
+from flask import url_for
+import hashlib
+import logging
+import os
+import re
+import time
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# One year, the longest max-age browsers honour
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Build outputs that already carry a content hash in their filename
+FINGERPRINTED_DIRS = ('dist/', 'responsive/')
+
+# Precompressed siblings are negotiated by the compression module, not linked to
+SKIPPED_SUFFIXES = ('.gz', '.br')
+
+HASH_LENGTH = 10
+HASHED_FILENAME = re.compile(r'^(?P<stem>.+)\.[0-9a-f]{%d}(?P<ext>\.[^./]+)?$' % HASH_LENGTH)
+
+
+class StaticAssets:
+    """Content-hashed static URLs, built once per process from the static folder"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self.hashed = {}
+        self.originals = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('STATIC_URL_HASHING', True)
+        app.extensions['static_assets'] = self
+        app.jinja_env.globals['static_url'] = self.static_url
+        # Every url_for('static', filename=...) goes through the manifest
+        app.url_defaults(self._inject_hashed_filename)
+        app.view_functions['static'] = self.send_static
+        self.app = app
+        self.build_manifest()
+
+    def build_manifest(self):
+        """Hash every file under the static folder (original name <-> hashed name)"""
+        started = time.perf_counter()
+        hashed = {}
+        for root, _, files in os.walk(self.app.static_folder):
+            for name in files:
+                path = os.path.join(root, name)
+                filename = os.path.relpath(path, self.app.static_folder).replace(os.sep, '/')
+                if filename.startswith(FINGERPRINTED_DIRS) or filename.endswith(SKIPPED_SUFFIXES):
+                    continue
+                with open(path, 'rb') as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()[:HASH_LENGTH]
+                stem, ext = os.path.splitext(filename)
+                hashed[filename] = f"{stem}.{digest}{ext}"
+
+        self.hashed = hashed
+        self.originals = {value: key for key, value in hashed.items()}
+        logger.info(f"Hashed {len(hashed)} static files in {time.perf_counter() - started:.2f}s")
+
+    def static_url(self, filename, **kwargs):
+        """Template helper, same as url_for('static', filename=...)"""
+        return url_for('static', filename=filename, **kwargs)
+
+    def send_static(self, filename):
+        """Replacement for Flask's static view that understands hashed filenames"""
+        original = self.originals.get(filename)
+        if original is None and not filename.startswith(FINGERPRINTED_DIRS):
+            # A hash from another deploy (e.g. cached HTML) still gets the current file,
+            # just without the immutable caching
+            match = HASHED_FILENAME.match(filename)
+            if match and match.group('stem') + (match.group('ext') or '') in self.hashed:
+                filename = match.group('stem') + (match.group('ext') or '')
+            return self._send_file(filename)
+
+        response = self._send_file(original or filename)
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+    def _send_file(self, filename):
+        compression = self.app.extensions.get('compression')
+        if compression is not None:
+            return compression.send_static_file(filename)
+        return self.app.send_static_file(filename)
+
+    def _inject_hashed_filename(self, endpoint, values):
+        if endpoint != 'static' or not self._enabled():
+            return
+        hashed = self.hashed.get(values.get('filename'))
+        if hashed:
+            values['filename'] = hashed
+
+    def _enabled(self):
+        # In debug mode files change under a running server, so keep plain names
+        return self.app.config['STATIC_URL_HASHING'] and not self.app.debug
@@ -0,0 +1,341 @@
+"""
+Static Export Module for Vidensbank
+Renders the knowledge-bank pages to plain HTML files that nginx or a CDN can serve,
+so Flask is only needed for the APIs, the calculators and authentication
+"""
+
+from flask import request, template_rendered
+from jinja2 import meta
+from static_assets import FINGERPRINTED_DIRS, HASHED_FILENAME
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+import gzip
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import re
+import shutil
+import threading
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+
+# Content pages that still need the app at runtime (they call the JSON APIs)
+EXCLUDED_ENDPOINTS = {'calculator', 'calculator_comprehensive', 'calculator_advanced'}
+
+# Text assets worth shipping a .gz sibling for
+COMPRESSIBLE_EXTENSIONS = {'.html', '.css', '.js', '.json', '.svg', '.txt'}
+
+LINK_PATTERN = re.compile(r'''(\b(?:href|src|action)=["'])(/[^"'#?]*)([^"']*["'])''')
+# Proxied remote images inside srcset lists and CSS url() values
+REMOTE_IMAGE_PATTERN = re.compile(r'''(?<=[\s"'(,])/img/''')
+
+# Set before the worker pool starts; forked workers inherit it
+_export_app = None
+_worker_state = threading.local()
+
+
+def collect_routes(app):
+    """
+    Walk the URL map for parameterless GET routes that only render content.
+
+    Returns:
+        Dict of URL path -> endpoint name
+    """
+    page_cache = app.extensions['page_cache']
+    routes = {}
+    for rule in app.url_map.iter_rules():
+        if rule.arguments or 'GET' not in rule.methods:
+            continue
+        if rule.endpoint not in page_cache.endpoints or rule.endpoint in EXCLUDED_ENDPOINTS:
+            continue
+        routes[rule.rule] = rule.endpoint
+    return dict(sorted(routes.items()))
+
+
+def template_dependency_hash(app, template_names):
+    """Hash the source of the given templates and everything they extend or include"""
+    env = app.jinja_env
+    pending = list(template_names)
+    seen = set()
+    digest = hashlib.sha256()
+
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        source, _, _ = env.loader.get_source(env, name)
+        digest.update(name.encode('utf-8'))
+        digest.update(source.encode('utf-8'))
+        for reference in meta.find_referenced_templates(env.parse(source)):
+            # None means a dynamic include that cannot be resolved statically
+            if reference is not None:
+                pending.append(reference)
+
+    return f"{len(seen)}:{digest.hexdigest()}"
+
+
+def export_site(app, output_dir, app_url='', jobs=None, force=False, copy_static=True):
+    """
+    Export every content route to output_dir/<path>/index.html plus a .gz sibling.
+
+    Args:
+        app: Flask application to render
+        output_dir: Target directory, created if missing
+        app_url: Origin of the Flask app, prefixed to links that were not exported
+        jobs: Number of parallel render workers (defaults to CPU count)
+        force: Re-render every page even if its templates are unchanged
+        copy_static: Also copy (and precompress) the static folder
+
+    Returns:
+        Dict with rendered, skipped, failed and removed counts
+    """
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+
+    routes = collect_routes(app)
+    manifest = _load_manifest(output_dir)
+
+    # Links, hashed asset URLs and the footer year change for every page when these do
+    build_key = hashlib.sha256(
+        json.dumps([sorted(routes), app_url, datetime.now().year, _asset_digest(app)]).encode('utf-8')
+    ).hexdigest()
+    if manifest.get('build_key') != build_key:
+        force = True
+
+    pages = manifest.get('pages', {})
+    stale = []
+    skipped = 0
+    for path in routes:
+        entry = pages.get(path)
+        if not force and entry and _is_fresh(app, output_dir, entry):
+            skipped += 1
+        else:
+            stale.append(path)
+
+    exported = set(routes)
+    rendered = 0
+    failed = []
+    for result in _render_all(app, stale, exported, output_dir, app_url, jobs):
+        if result['error']:
+            failed.append(result['path'])
+            logger.warning(f"Static export skipped {result['path']}: {result['error']}")
+            pages.pop(result['path'], None)
+            continue
+        path = result.pop('path')
+        del result['error']
+        result['endpoint'] = routes[path]
+        result['deps_hash'] = template_dependency_hash(app, result['templates'])
+        pages[path] = result
+        rendered += 1
+
+    # Drop pages for routes that no longer exist
+    removed = 0
+    for path in list(pages):
+        if path not in routes:
+            _remove_page(output_dir, pages.pop(path))
+            removed += 1
+
+    if copy_static:
+        _copy_static(app, output_dir)
+
+    manifest = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'build_key': build_key,
+        'app_url': app_url,
+        'pages': dict(sorted(pages.items()))
+    }
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    return {
+        'rendered': rendered,
+        'skipped': skipped,
+        'failed': failed,
+        'removed': removed
+    }
+
+
+def rewrite_links(html, exported, app_url=''):
+    """
+    Point links at exported pages to their directory index and links at
+    app-only routes (including /img proxy images) to app_url. Static asset
+    links are left alone.
+    """
+    def replace(match):
+        prefix, path, suffix = match.groups()
+        if path.startswith('/static/'):
+            return match.group(0)
+        if path in exported:
+            return f"{prefix}{path.rstrip('/')}/{suffix}"
+        return f"{prefix}{app_url.rstrip('/')}{path}{suffix}"
+
+    html = LINK_PATTERN.sub(replace, html)
+    if app_url:
+        html = REMOTE_IMAGE_PATTERN.sub(f"{app_url.rstrip('/')}/img/", html)
+    return html
+
+
+def _render_all(app, paths, exported, output_dir, app_url, jobs):
+    global _export_app
+    if not paths:
+        return []
+
+    jobs = jobs or os.cpu_count() or 1
+    args = [(path, exported, output_dir, app_url) for path in paths]
+
+    _export_app = app
+    # A page cache hit would skip rendering, and with it the template signals
+    cache_enabled = app.config.get('PAGE_CACHE_ENABLED', True)
+    app.config['PAGE_CACHE_ENABLED'] = False
+    try:
+        if jobs > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            executor = ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context('fork'))
+        else:
+            executor = ThreadPoolExecutor(max_workers=jobs)
+        with executor:
+            return list(executor.map(_export_page, args))
+    finally:
+        app.config['PAGE_CACHE_ENABLED'] = cache_enabled
+
+
+def _export_page(args):
+    """Render one route through the test client and write it (runs in a worker)"""
+    path, exported, output_dir, app_url = args
+    result = {'path': path, 'error': None}
+
+    client = getattr(_worker_state, 'client', None)
+    if client is None:
+        client = _worker_state.client = _export_app.test_client()
+
+    templates = []
+
+    def record(sender, template, context, **extra):
+        if request.path == path:
+            templates.append(template.name)
+
+    with template_rendered.connected_to(record, _export_app):
+        try:
+            # Buffered so streamed pages finish rendering while the signal is connected
+            response = client.get(path, buffered=True)
+        except Exception as e:
+            result['error'] = str(e)
+            return result
+
+    if response.status_code != 200 or response.mimetype != 'text/html':
+        result['error'] = f"status {response.status_code} ({response.mimetype})"
+        return result
+
+    html = rewrite_links(response.get_data(as_text=True), exported, app_url)
+    body = html.encode('utf-8')
+
+    relative = os.path.join(path.strip('/'), 'index.html')
+    target = os.path.join(output_dir, relative)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, 'wb') as f:
+        f.write(body)
+    gzip_size = _write_gzip(target, body)
+
+    result.update({
+        'file': relative.replace(os.sep, '/'),
+        'templates': templates,
+        'sha256': hashlib.sha256(body).hexdigest(),
+        'size': len(body),
+        'gzip_size': gzip_size
+    })
+    return result
+
+
+def _write_gzip(target, body):
+    # mtime=0 keeps the output byte-identical between exports
+    compressed = gzip.compress(body, compresslevel=9, mtime=0)
+    with open(target + '.gz', 'wb') as f:
+        f.write(compressed)
+    return len(compressed)
+
+
+def _is_fresh(app, output_dir, entry):
+    if not os.path.exists(os.path.join(output_dir, entry.get('file', ''))):
+        return False
+    try:
+        return template_dependency_hash(app, entry['templates']) == entry.get('deps_hash')
+    except Exception:
+        return False
+
+
+def _asset_digest(app):
+    """Hash of the static asset manifest; pages embed its hashed URLs"""
+    static_assets = app.extensions.get('static_assets')
+    if static_assets is None:
+        return None
+    return hashlib.sha256(json.dumps(sorted(static_assets.hashed.items())).encode('utf-8')).hexdigest()
+
+
+def _remove_page(output_dir, entry):
+    target = os.path.join(output_dir, entry.get('file', ''))
+    for filename in (target, target + '.gz'):
+        if os.path.isfile(filename):
+            os.remove(filename)
+
+
+def _copy_static(app, output_dir):
+    """Copy changed files from the static folder, compressing text assets"""
+    static_root = app.static_folder
+    target_root = os.path.join(output_dir, 'static')
+
+    for root, _, files in os.walk(static_root):
+        relative_root = os.path.relpath(root, static_root)
+        for name in files:
+            source = os.path.join(root, name)
+            target = os.path.normpath(os.path.join(target_root, relative_root, name))
+            stat = os.stat(source)
+            if os.path.exists(target):
+                target_stat = os.stat(target)
+                if target_stat.st_size == stat.st_size and int(target_stat.st_mtime) == int(stat.st_mtime):
+                    continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copy2(source, target)
+            if os.path.splitext(name)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+                with open(source, 'rb') as f:
+                    _write_gzip(target, f.read())
+
+    # Pages link to the content-hashed names, so ship those alongside
+    static_assets = app.extensions.get('static_assets')
+    if static_assets is not None:
+        for original, hashed in static_assets.hashed.items():
+            source = os.path.join(target_root, original)
+            target = os.path.join(target_root, hashed)
+            if os.path.exists(target) or not os.path.exists(source):
+                continue
+            shutil.copy2(source, target)
+            if os.path.exists(source + '.gz'):
+                shutil.copy2(source + '.gz', target + '.gz')
+        _prune_hashed(static_root, target_root, static_assets.originals)
+
+
+def _prune_hashed(static_root, target_root, current):
+    """Remove hashed copies left over from earlier versions of a static file"""
+    for root, _, files in os.walk(target_root):
+        relative_root = os.path.relpath(root, target_root)
+        for name in files:
+            filename = os.path.normpath(os.path.join(relative_root, name)).replace(os.sep, '/')
+            plain = filename[:-3] if filename.endswith('.gz') else filename
+            if plain.startswith(FINGERPRINTED_DIRS) or plain in current:
+                continue
+            # Files that exist under this name in the static folder are not copies
+            if os.path.exists(os.path.join(static_root, plain)) or not HASHED_FILENAME.match(plain):
+                continue
+            os.remove(os.path.join(root, name))
+
+
+def _load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
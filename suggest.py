@@ -0,0 +1,269 @@
+"""
+Suggest Module for Vidensbank
+Typeahead for the search box: an in-memory prefix trie over topic pages, raavarer,
+canteens and emission factor items, with folded keys and popularity weights
+"""
+
+from danish_text import fold
+from static_export import collect_routes
+from flask import jsonify, request, url_for
+from collections import Counter
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+RAAVARE_PREFIX = '/vidensbank/raavarer/'
+# Starting weight per kind of suggestion; page views are added on top
+BASE_WEIGHTS = {'raavare': 4.0, 'page': 3.0, 'canteen': 2.0, 'emission_factor': 1.0}
+WORD_START = re.compile(r'(?:^|[\s(/-])(?=\w)')
+
+
+def fold_key(text):
+    """Lookup form of a label or query: lowercased, folded, single-spaced"""
+    return ' '.join(fold(text.lower()).split())
+
+
+class _Node:
+    __slots__ = ('children', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.top = ()
+
+
+class PrefixTrie:
+    """
+    Character trie whose every node keeps its best entries precomputed, so a
+    lookup is one walk down the prefix and no scan of the subtree.
+    """
+
+    def __init__(self, entries, limit):
+        self.root = _Node()
+        self.entries = entries
+        candidates = {}
+        for entry_id, entry in enumerate(entries):
+            for key in entry['keys']:
+                node = self.root
+                for char in key:
+                    node = node.children.setdefault(char, _Node())
+                    candidates.setdefault(id(node), (node, set()))[1].add(entry_id)
+
+        for node, entry_ids in candidates.values():
+            ranked = sorted(entry_ids, key=lambda entry_id: (-entries[entry_id]['weight'], entries[entry_id]['label']))
+            node.top = tuple(ranked[:limit])
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, prefix, limit):
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [self.entries[entry_id] for entry_id in node.top[:limit]]
+
+
+class Suggestions:
+    """Serves /api/suggest and rebuilds its trie when a source changes"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self.trie = None
+        self.views = Counter()
+        self._entries = []
+        self._paths = set()
+        self._signature = None
+        self._checked_at = 0.0
+        self._weighted_views = 0
+        self._weighted_at = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('SUGGEST_LIMIT', 8)
+        app.config.setdefault('SUGGEST_CHECK_INTERVAL', 10)
+        # Page views only re-rank the existing entries, and at most this often
+        app.config.setdefault('SUGGEST_REWEIGHT_INTERVAL', 600)
+        app.config.setdefault('SUGGEST_CLIMATE_DB', os.path.join(app.root_path, 'climate_data', 'climate_data.db'))
+        app.add_url_rule('/api/suggest', 'api_suggest', self.serve)
+        app.after_request(self.record_view)
+        app.extensions['suggestions'] = self
+        self.app = app
+
+    def serve(self):
+        """View for /api/suggest?q=<prefix>"""
+        query = request.args.get('q', '')
+        response = jsonify({'success': True, 'query': query, 'suggestions': self.suggest(query)})
+        response.headers['Cache-Control'] = 'public, max-age=60'
+        return response
+
+    def suggest(self, query, limit=None):
+        """
+        Best suggestions whose label, or a word in it, starts with the query.
+
+        Returns:
+            List of dicts with label, type and url
+        """
+        limit = min(limit or self.app.config['SUGGEST_LIMIT'], self.app.config['SUGGEST_LIMIT'])
+        prefix = fold_key(query)
+        if not prefix:
+            return []
+        trie = self._current_trie()
+        return [{'label': entry['label'], 'type': entry['type'], 'url': entry['url']}
+                for entry in trie.lookup(prefix, limit)]
+
+    def record_view(self, response):
+        """Count successful page views of suggested URLs as popularity"""
+        # Internal renders (page cache warm-up, export, indexing) use the Werkzeug test client
+        if request.user_agent.string.startswith('Werkzeug/'):
+            return response
+        if request.method == 'GET' and response.status_code == 200 and request.path in self._paths:
+            self.views[request.path] += 1
+        return response
+
+    def warm(self):
+        """Build the trie ahead of the first keystroke; returns the entry count"""
+        return len(self._current_trie())
+
+    def rebuild(self):
+        """
+        Collect every source and swap in a new trie.
+
+        Returns:
+            Number of entries
+        """
+        self._entries = self._page_entries() + self._climate_entries()
+        return self.reweight()
+
+    def reweight(self):
+        """
+        Swap in a trie over the current entries with weights from the page
+        views so far, without reading the sources again.
+
+        Returns:
+            Number of entries
+        """
+        views = self.views.copy()
+        entries = [dict(entry, weight=BASE_WEIGHTS[entry['type']] + math.log1p(views[entry['url']]))
+                   for entry in self._entries]
+        trie = PrefixTrie(entries, self.app.config['SUGGEST_LIMIT'])
+        self._paths = {entry['url'] for entry in entries}
+        self.trie = trie
+        self._weighted_views = sum(views.values())
+        self._weighted_at = time.monotonic()
+        return len(trie)
+
+    def _current_trie(self):
+        now = time.monotonic()
+        if self.trie is not None and now - self._checked_at < self.app.config['SUGGEST_CHECK_INTERVAL']:
+            return self.trie
+
+        with self._lock:
+            if self.trie is None:
+                self._refresh()
+            elif now - self._checked_at >= self.app.config['SUGGEST_CHECK_INTERVAL'] and not self._refreshing:
+                # Rebuilding takes tens of milliseconds, so requests keep the old trie meanwhile;
+                # at most one refresh runs at a time
+                self._refreshing = True
+                threading.Thread(target=self._refresh, daemon=True).start()
+            self._checked_at = now
+            return self.trie
+
+    def _refresh(self):
+        try:
+            signature = self._source_signature()
+            if self.trie is None or signature != self._signature:
+                count = self.rebuild()
+                self._signature = signature
+                logger.info(f"Suggestion trie rebuilt with {count} entries")
+            elif (sum(self.views.values()) != self._weighted_views
+                    and time.monotonic() - self._weighted_at >= self.app.config['SUGGEST_REWEIGHT_INTERVAL']):
+                self.reweight()
+        except Exception as e:
+            logger.error(f"Failed to rebuild suggestion trie: {e}")
+            if self.trie is None:
+                self.trie = PrefixTrie([], self.app.config['SUGGEST_LIMIT'])
+        finally:
+            self._refreshing = False
+
+    def _source_signature(self):
+        stats = []
+        content_index = self.app.extensions.get('content_index')
+        for path in (content_index.path if content_index else None, self.app.config['SUGGEST_CLIMATE_DB']):
+            try:
+                stat = os.stat(path) if path else None
+                stats.append((stat.st_ino, stat.st_mtime_ns) if stat else None)
+            except FileNotFoundError:
+                stats.append(None)
+        return tuple(stats)
+
+    def _page_entries(self):
+        """Content routes, labelled with their rendered titles when the content index has them"""
+        titles = {}
+        content_index = self.app.extensions.get('content_index')
+        reader = content_index.reader if content_index else None
+        if reader is not None:
+            for doc_id in range(reader.doc_count):
+                document = reader.document(doc_id)
+                # Drop site names such as ' | Vidensbank' from the rendered titles
+                titles[document['path']] = document['title'].split(' | ')[0].strip()
+
+        entries = []
+        for path in collect_routes(self.app):
+            slug = path.rstrip('/').rsplit('/', 1)[-1] or 'forside'
+            label = titles.get(path) or slug.replace('-', ' ').capitalize()
+            entries.append({
+                'label': label,
+                'type': 'raavare' if path.startswith(RAAVARE_PREFIX) else 'page',
+                'url': path,
+                # The URL slug too, so ASCII spellings like 'oksekoed' and 'baelgfrugter' match
+                'keys': _word_keys(label) | _word_keys(slug.replace('-', ' '))
+            })
+        return entries
+
+    def _climate_entries(self):
+        """Canteens and emission factor items from the climate database"""
+        path = self.app.config['SUGGEST_CLIMATE_DB']
+        if not os.path.exists(path):
+            return []
+        try:
+            conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            try:
+                canteens = conn.execute('SELECT id, name, location FROM canteens ORDER BY name').fetchall()
+                items = conn.execute('SELECT DISTINCT food_item FROM emission_factors ORDER BY food_item').fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Could not read suggestion sources from {path}: {e}")
+            return []
+
+        with self.app.test_request_context():
+            entries = [{
+                'label': f"{name} ({location})" if location else name,
+                'type': 'canteen',
+                'url': url_for('calculator_advanced', canteen=canteen_id),
+                'keys': _word_keys(name)
+            } for canteen_id, name, location in canteens]
+            entries += [{
+                'label': food_item,
+                'type': 'emission_factor',
+                'url': url_for('search', q=food_item),
+                'keys': _word_keys(food_item)
+            } for (food_item,) in items]
+        return entries
+
+
+def _word_keys(label):
+    """The folded label from each word start, so 'laks' also finds 'Røget laks'"""
+    key = fold_key(label)
+    return {key[match.end():] for match in WORD_START.finditer(key)}
@@ -0,0 +1,9 @@
+/** @type {import('tailwindcss').Config} */
+module.exports = {
+    content: [
+        './templates/**/*.html',
+        './static/js/**/*.js',
+    ],
+    theme: require('./static/js/tailwind.theme.js'),
+    plugins: [],
+};
@@ -0,0 +1,137 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, render_template
+from sqlalchemy import event, text
+from datetime import datetime, timedelta
+from app import app, db, ContactForm, Page, User
+from admin_tables import AdminTables, KeysetPage, decode_cursor, encode_cursor
+
+@pytest.fixture
+def tables(tmp_path):
+    """A throwaway SQLite database so the tracked instance database is never touched"""
+    test_app = Flask(__name__)
+    test_app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'admin.db'}"
+    test_app.config['ADMIN_PAGE_SIZE'] = 3
+    db.init_app(test_app)
+    tables = AdminTables(test_app, db)
+    tables.watch(ContactForm, Page)
+    with test_app.app_context():
+        db.create_all()
+        yield tables
+        db.session.remove()
+    for model in (ContactForm, Page):
+        for name in ('after_insert', 'after_update', 'after_delete'):
+            event.remove(model, name, tables._invalidate)
+    event.remove(db.session, 'after_commit', tables._after_commit)
+    event.remove(db.session, 'after_rollback', tables._after_rollback)
+
+def add_contacts(count, status='new', start=datetime(2026, 1, 1)):
+    for number in range(count):
+        db.session.add(ContactForm(name=f'Navn {number}', email='a@b.dk', subject='Emne', message='Besked',
+                                   status=status, submitted_at=start + timedelta(minutes=number)))
+    db.session.commit()
+
+def ids(page):
+    return [row.id for row in page.items]
+
+def test_cursor_round_trip():
+    columns = [ContactForm.submitted_at, ContactForm.id]
+    stamp = datetime(2026, 3, 1, 12, 30)
+    assert decode_cursor(encode_cursor([stamp, 7]), columns) == (stamp, 7)
+    assert decode_cursor('not-a-cursor', columns) is None
+    assert decode_cursor(encode_cursor([1]), columns) is None
+
+def test_keyset_pages_walk_forward_and_back(tables):
+    add_contacts(8)
+    columns = [ContactForm.submitted_at, ContactForm.id]
+
+    first = tables.paginate(ContactForm.query, columns)
+    assert ids(first) == [8, 7, 6]
+    assert first.prev_cursor is None
+
+    second = tables.paginate(ContactForm.query, columns, after=first.next_cursor)
+    assert ids(second) == [5, 4, 3]
+    last = tables.paginate(ContactForm.query, columns, after=second.next_cursor)
+    assert ids(last) == [2, 1]
+    assert last.next_cursor is None
+
+    back = tables.paginate(ContactForm.query, columns, before=last.prev_cursor)
+    assert ids(back) == [5, 4, 3]
+    assert ids(tables.paginate(ContactForm.query, columns, before=back.prev_cursor)) == [8, 7, 6]
+
+def test_equal_timestamps_are_not_skipped(tables):
+    add_contacts(5, start=datetime(2026, 1, 1))
+    db.session.query(ContactForm).update({'submitted_at': datetime(2026, 1, 1)})
+    db.session.commit()
+    columns = [ContactForm.submitted_at, ContactForm.id]
+
+    seen, cursor = [], None
+    while True:
+        page = tables.paginate(ContactForm.query, columns, after=cursor)
+        seen += ids(page)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == [5, 4, 3, 2, 1]
+
+def test_status_filter_uses_index(tables):
+    add_contacts(2, status='new')
+    add_contacts(2, status='replied')
+    tables.ensure_indexes()
+    query = ContactForm.query.filter(ContactForm.status == 'new')
+    assert ids(tables.paginate(query, [ContactForm.submitted_at, ContactForm.id])) == [2, 1]
+
+    plan = db.session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM contact_form WHERE status = 'new' "
+        "ORDER BY submitted_at DESC, id DESC LIMIT 4"
+    )).fetchall()
+    detail = ' '.join(row[-1] for row in plan)
+    assert 'ix_contact_form_status_submitted_at_id' in detail
+    assert 'TEMP B-TREE' not in detail
+
+def test_counts_are_cached_and_cleared_on_write(tables):
+    add_contacts(2, status='new')
+    assert tables.count(ContactForm, ContactForm.status) == {'new': 2}
+    assert tables.count(ContactForm) == 2
+
+    # Bypasses the ORM, so the cached value stays
+    db.session.execute(text("DELETE FROM contact_form"))
+    db.session.commit()
+    assert tables.count(ContactForm) == 2
+
+    add_contacts(1, status='read')
+    assert tables.count(ContactForm, ContactForm.status) == {'read': 1}
+
+def test_counts_are_cleared_on_commit_not_flush(tables):
+    add_contacts(2, status='new')
+    assert tables.count(ContactForm) == 2
+
+    db.session.add(ContactForm(name='Ny', email='a@b.dk', subject='Emne', message='Besked', status='new'))
+    db.session.flush()
+    # Not committed yet: the cached count is still the committed one
+    assert tables._counts
+    db.session.rollback()
+    assert tables.count(ContactForm) == 2
+
+    add_contacts(1)
+    assert tables.count(ContactForm) == 3
+
+def test_admin_requires_login():
+    response = app.test_client().get('/admin')
+    assert response.status_code == 302
+
+def test_admin_template_links_pages():
+    contact = ContactForm(id=1, name='Anna', email='a@b.dk', subject='Madspild', message='Hej',
+                          status='new', submitted_at=datetime(2026, 1, 1))
+    counts = {'users': 1, 'pages': {True: 2}, 'topics': {'emissioner': 2}, 'contacts': {'new': 1}}
+    with app.test_request_context():
+        html = render_template('admin.html', tab='contacts', rows=KeysetPage([contact], next_cursor='abc', prev_cursor='xyz'),
+                               filters={'status': 'new'}, counts=counts, statuses=('new', 'read', 'replied'))
+    assert 'Madspild' in html
+    assert 'after=abc' in html and 'before=xyz' in html
+    assert 'status=new' in html
@@ -0,0 +1,114 @@
+import pytest
+import sys
+import os
+import io
+import zipfile
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, page_cache, canteen_reports, calculator_engine, pdf_jobs, identity_cache, User
+from canteen_reports import canteen_params, load_canteens, report_filename
+from pdf_generator import PDFGenerator
+from flask import render_template
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Fake PDF writer that still renders the template, so template errors surface"""
+    def fake_write_pdf(self, template_name, target, **template_vars):
+        html = render_template(template_name, **template_vars)
+        if template_vars['canteen']['name'] == 'LEGO':
+            raise RuntimeError('render failed')
+        target.write(b'%PDF-1.7 ' + html.encode('utf-8'))
+
+    monkeypatch.setattr(PDFGenerator, 'write_pdf', fake_write_pdf)
+    monkeypatch.setitem(app.config, 'PDF_CACHE_DIR', str(tmp_path / 'pdf_cache'))
+    monkeypatch.setitem(app.config, 'PDF_JOB_DB', str(tmp_path / 'pdf_jobs.sqlite'))
+    monkeypatch.setitem(app.config, 'PDF_JOB_OUTPUT_DIR', str(tmp_path / 'pdf_jobs'))
+    monkeypatch.setitem(app.config, 'PDF_JOB_POLL_INTERVAL', 0.05)
+    monkeypatch.setattr(pdf_jobs, '_schema_ready', False)
+    app.config['TESTING'] = True
+    page_cache.clear()
+    with app.test_client() as client:
+        yield client
+
+def test_params_follow_canteen_baseline():
+    canteen = load_canteens(calculator_engine.db_path)[0]
+    params = canteen_params(canteen)
+    assert params['employees'] == canteen['employees']
+    assert params['meat_distribution']['vegetarian_percent'] == canteen['baseline']['green_percent']
+    assert sum(params['waste'].values()) == pytest.approx(canteen['baseline']['food_waste_percent'], abs=0.02)
+
+def test_report_filename_is_ascii():
+    canteen = {'id': 360, 'name': 'Ørsted'}
+    assert report_filename(canteen, 'Q3 2026') == 'Klimarapport_Q3_2026_Orsted_360.pdf'
+
+def test_zip_contains_a_report_per_canteen(client):
+    summary = {}
+    data = b''.join(canteen_reports.stream_zip(processes=2, quarter='Q3 2026', summary=summary))
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    assert archive.testzip() is None
+
+    canteens = load_canteens(calculator_engine.db_path)
+    pdfs = [name for name in archive.namelist() if name.endswith('.pdf')]
+    assert len(pdfs) == summary['done'] == len(canteens) - 1
+    report = archive.read(pdfs[0])
+    assert report.startswith(b'%PDF')
+    assert 'Klimarapport Q3 2026'.encode('utf-8') in report
+
+    # One canteen failed; the archive says which instead of aborting
+    assert [filename for filename, _ in summary['failed']] == ['Klimarapport_Q3_2026_LEGO_500.pdf']
+    assert b'render failed' in archive.read('FEJL.txt')
+
+def test_zip_is_streamed_per_report(client):
+    chunks = list(canteen_reports.stream_zip(processes=1, quarter='Q3 2026'))
+    assert len(chunks) > 10
+
+def test_download_requires_login(client):
+    response = client.get('/admin/reports/canteens.zip')
+    assert response.status_code == 302
+
+def log_in(client, monkeypatch, role='admin'):
+    monkeypatch.setattr(identity_cache, 'load', lambda user_id: User(id=1, username='anna', role=role))
+    with client.session_transaction() as sess:
+        sess['_user_id'] = '1'
+
+def test_zip_is_built_by_pdf_worker(client, monkeypatch):
+    job_id = pdf_jobs.enqueue('canteens_zip', quarter='Q3 2026')
+    assert pdf_jobs.enqueue('canteens_zip', quarter='Q3 2026') == job_id
+    assert pdf_jobs.run_worker(concurrency=1, once=True) == {'done': 1, 'failed': 0}
+
+    # The archive is admin-only, even for someone holding the link
+    anonymous = client.get(f'/pdf-jobs/{job_id}')
+    assert anonymous.status_code == 302
+    assert anonymous.headers['Location'].startswith('/login')
+    assert client.get(f'/api/pdf-jobs/{job_id}').status_code == 403
+    log_in(client, monkeypatch, role='user')
+    assert client.get(f'/pdf-jobs/{job_id}').status_code == 302
+    assert client.get(f'/api/pdf-jobs/{job_id}').status_code == 403
+
+    log_in(client, monkeypatch)
+    assert client.get(f'/api/pdf-jobs/{job_id}').get_json()['status'] == 'done'
+    download = client.get(f'/pdf-jobs/{job_id}')
+    assert download.mimetype == 'application/zip'
+    assert 'Klimarapporter_Q3_2026.zip' in download.headers['Content-Disposition']
+    archive = zipfile.ZipFile(io.BytesIO(download.data))
+    download.close()
+    assert len(archive.namelist()) == len(load_canteens(calculator_engine.db_path))
+    assert 'FEJL.txt' in archive.namelist()
+
+def test_admin_download_is_queued_not_rendered(client, monkeypatch):
+    log_in(client, monkeypatch)
+    monkeypatch.setattr(canteen_reports, 'render_all', lambda *args, **kwargs: pytest.fail('rendered in the web worker'))
+
+    # No pdf-worker: nothing is rendered here, the admin is pointed at the CLI
+    response = client.get('/admin/reports/canteens.zip')
+    assert response.status_code == 302
+    assert response.headers['Location'] == '/admin'
+
+    pdf_jobs._heartbeat()
+    response = client.get('/admin/reports/canteens.zip')
+    assert response.status_code == 302
+    job_id = response.headers['Location'].rsplit('/', 1)[1]
+    assert pdf_jobs.get(job_id)['report'] == 'canteens_zip'
+    assert client.get(response.headers['Location']).status_code == 202
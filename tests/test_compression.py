@@ -0,0 +1,67 @@
+import pytest
+import sys
+import os
+import gzip
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, page_cache
+from compression import BROTLI_AVAILABLE, precompress_static
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    page_cache.clear()
+    with app.test_client() as client:
+        yield client
+    page_cache.clear()
+
+def test_large_html_is_gzipped(client):
+    plain = client.get('/vidensbank/saeson')
+    response = client.get('/vidensbank/saeson', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert gzip.decompress(response.data) == plain.data
+
+@pytest.mark.skipif(not BROTLI_AVAILABLE, reason='brotli not installed')
+def test_brotli_preferred_when_accepted(client):
+    response = client.get('/vidensbank/saeson', headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+
+def test_small_responses_are_not_compressed(client):
+    response = client.get('/api/season/0/substitutes/appelsin', headers={'Accept-Encoding': 'gzip'})
+    assert len(response.get_data()) < app.config['COMPRESS_MIN_SIZE']
+    assert 'Content-Encoding' not in response.headers
+
+def test_compressed_page_still_revalidates(client):
+    response = client.get('/vidensbank/saeson', headers={'Accept-Encoding': 'gzip'})
+    etag = response.headers['ETag']
+    assert etag.startswith('W/')
+    revalidated = client.get('/vidensbank/saeson', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert revalidated.status_code == 304
+
+def test_precompress_writes_siblings(tmp_path):
+    css = tmp_path / 'css' / 'site.css'
+    css.parent.mkdir()
+    css.write_text('.card{display:flex}\n' * 200, encoding='utf-8')
+    (tmp_path / 'logo.png').write_bytes(b'\x89PNG')
+
+    summary = precompress_static(str(tmp_path))
+    assert (tmp_path / 'css' / 'site.css.gz').exists()
+    assert not (tmp_path / 'logo.png.gz').exists()
+    assert precompress_static(str(tmp_path))['unchanged'] == summary['written']
+
+def test_static_file_served_from_precompressed_sibling(client, tmp_path):
+    static_folder = app.static_folder
+    app.static_folder = str(tmp_path)
+    try:
+        (tmp_path / 'app.css').write_text('.card{display:flex}\n' * 200, encoding='utf-8')
+        precompress_static(str(tmp_path))
+        response = client.get('/static/app.css', headers={'Accept-Encoding': 'gzip'})
+    finally:
+        app.static_folder = static_folder
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.mimetype == 'text/css'
+    assert gzip.decompress(response.data) == b'.card{display:flex}\n' * 200
@@ -0,0 +1,113 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, content_index, page_cache, search_index
+from content_index import IndexReader, build_content_index, extract_text, write_index
+from danish_text import fold, normalize, stem, tokenize
+
+@pytest.fixture(scope='module')
+def index_path(tmp_path_factory):
+    """One full build shared by the module; rendering every page takes a moment"""
+    path = str(tmp_path_factory.mktemp('content_index') / 'content_index.bin')
+    summary = build_content_index(app, path)
+    assert summary['documents'] > 50
+    return path
+
+@pytest.fixture
+def client(index_path):
+    original = app.config['CONTENT_INDEX_PATH']
+    app.config['CONTENT_INDEX_PATH'] = index_path
+    app.config['TESTING'] = True
+    page_cache.clear()
+    with app.test_client() as client:
+        yield client
+    app.config['CONTENT_INDEX_PATH'] = original
+
+def document(path, title, text):
+    return {'path': path, 'endpoint': path.strip('/'), 'title': title, 'text': text, 'templates': [], 'deps_hash': ''}
+
+def test_danish_stemming_and_folding():
+    assert stem('kantinerne') == 'kantin'
+    assert stem('bæredygtighed') == stem('bæredygtige')
+    assert normalize('Økologi') == normalize('okologi') == 'okologi'
+    # Folding keeps case; callers lowercase first when they need to
+    assert fold('Ærø Økologi') == 'Aero Okologi'
+    assert normalize('oksekødet') == normalize('oksekod')
+    # Stop words and single letters are not indexed
+    assert [term for term, _, _ in tokenize('Det er en god kantine i Århus')] == ['god', 'kantin', 'arhus']
+
+def test_extract_text_skips_markup_and_scripts():
+    title, text = extract_text(
+        '<title>Madspild - Vidensbank</title><style>.x{}</style><h1>Mindre &amp; bedre</h1>'
+        '<script>var skjult = 1;</script><!-- note --><p>Rester</p>'
+    )
+    assert title == 'Madspild'
+    assert text == 'Mindre & bedre Rester'
+
+def test_search_matches_folded_query(client):
+    results = content_index.search('okologi')
+    assert results['total'] > 0
+    assert any('okologi' in hit['path'] for hit in results['hits'][:3])
+    assert all('<mark>' in hit['snippet'] for hit in results['hits'])
+    assert content_index.search('økologi')['total'] == results['total']
+
+def test_last_word_matches_as_prefix(client):
+    assert content_index.search('vandforb')['total'] > 0
+    assert content_index.search('vandforb ')['total'] == 0
+
+def test_every_word_must_match(client):
+    assert content_index.search('madspild zzzqqq')['total'] == 0
+
+def test_rebuild_reuses_unchanged_pages(index_path):
+    summary = build_content_index(app, index_path)
+    assert summary['rendered'] == 0
+    assert summary['reused'] == summary['documents']
+
+def test_missing_index_returns_no_hits(tmp_path):
+    original = app.config['CONTENT_INDEX_PATH']
+    app.config['CONTENT_INDEX_PATH'] = str(tmp_path / 'missing.bin')
+    try:
+        assert content_index.search('madspild') == {'hits': [], 'total': 0}
+    finally:
+        app.config['CONTENT_INDEX_PATH'] = original
+
+def test_replaced_file_is_picked_up(tmp_path):
+    path = str(tmp_path / 'index.bin')
+    original = app.config['CONTENT_INDEX_PATH']
+    app.config['CONTENT_INDEX_PATH'] = path
+    try:
+        write_index(path, [document('/a', 'Grøntsager', 'Sæsonens grøntsager fra Danmark')], {})
+        assert [hit['path'] for hit in content_index.search('grontsag')['hits']] == ['/a']
+
+        write_index(path, [document('/b', 'Fisk', 'Hvid fisk og grøntsager'),
+                           document('/c', 'Kød', 'Oksekød')], {})
+        assert [hit['path'] for hit in content_index.search('grøntsagerne')['hits']] == ['/b']
+        assert content_index.reader.doc_count == 2
+    finally:
+        app.config['CONTENT_INDEX_PATH'] = original
+
+def test_index_file_layout(tmp_path):
+    path = str(tmp_path / 'index.bin')
+    write_index(path, [document('/a', 'Vand', 'Vand og vandforbrug')], {'build_key': 'x'})
+    reader = IndexReader(path)
+    assert reader.info == {'build_key': 'x'}
+    assert reader.document(0)['path'] == '/a'
+    assert reader.text(0) == 'Vand og vandforbrug'
+    assert [bytes(reader.term(i)) for i in reader.expand('vand')] == [b'vand', b'vandforbrug']
+    reader.close()
+
+def test_search_page_lists_content_hits(client, monkeypatch):
+    # No CMS page hits, and the tracked database stays untouched
+    empty = {'hits': [], 'total': 0, 'page': 1, 'per_page': 10, 'pages': 0}
+    monkeypatch.setattr(search_index, 'search', lambda query, page=1: empty)
+
+    response = client.get('/search?q=madspild')
+    html = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert 'I vidensbanken' in html
+    assert '<mark>' in html
+    assert 'Ingen resultater' not in html
@@ -0,0 +1,61 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, css_bundle, page_cache
+from css_build import collect_critical_classes, extract_critical_css
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    page_cache.clear()
+    with app.test_client() as client:
+        yield client
+    page_cache.clear()
+
+def test_extract_keeps_used_and_element_rules():
+    css = ('*,:after{box-sizing:border-box}html{line-height:1.5}'
+           '.flex{display:flex}.grid{display:grid}'
+           '.h-\\[70vh\\]{height:70vh}.hover\\:scale-105:hover{--tw-scale-x:1.05}'
+           '@media (min-width:768px){.md\\:text-8xl{font-size:6rem}.md\\:px-4{padding:1rem}}'
+           '@keyframes spin{to{transform:rotate(1turn)}}')
+    critical = extract_critical_css(css, {'flex', 'h-[70vh]', 'hover:scale-105', 'md:text-8xl'})
+
+    assert '*,:after{box-sizing:border-box}' in critical
+    assert 'html{line-height:1.5}' in critical
+    assert '.flex{display:flex}' in critical
+    assert '.grid' not in critical
+    assert '.h-\\[70vh\\]{height:70vh}' in critical
+    assert '.hover\\:scale-105:hover' in critical
+    assert '@media (min-width:768px){.md\\:text-8xl{font-size:6rem}}' in critical
+    assert '@keyframes' not in critical
+
+def test_critical_classes_cover_shell_and_heroes():
+    classes = collect_critical_classes(os.path.join(app.root_path, app.template_folder))
+    # body classes from base.html and a hero class from a topic page
+    assert 'antialiased' in classes
+    assert 'object-cover' in classes
+
+def test_base_uses_cdn_fallback_without_build(client):
+    bundle = css_bundle.bundle
+    css_bundle.bundle = None
+    try:
+        html = client.get('/vidensbank/saeson').data.decode('utf-8')
+    finally:
+        css_bundle.bundle = bundle
+    assert 'cdn.tailwindcss.com' in html
+    assert '/static/js/tailwind.theme.' in html
+
+def test_base_inlines_critical_css_when_built(client):
+    bundle = css_bundle.bundle
+    css_bundle.bundle = {'filename': 'dist/app.0123456789ab.css', 'critical': '.flex{display:flex}'}
+    try:
+        html = client.get('/vidensbank/saeson').data.decode('utf-8')
+    finally:
+        css_bundle.bundle = bundle
+    assert 'cdn.tailwindcss.com' not in html
+    assert '<style>.flex{display:flex}</style>' in html
+    assert 'href="/static/dist/app.0123456789ab.css" as="style"' in html
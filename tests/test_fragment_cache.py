@@ -0,0 +1,72 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, page_cache, fragment_cache
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    app.config['PAGE_CACHE_ENABLED'] = False
+    fragment_cache.clear()
+    with app.test_client() as client:
+        yield client
+    app.config['PAGE_CACHE_ENABLED'] = True
+    fragment_cache.clear()
+
+def compile_template(source):
+    return app.jinja_env.from_string(source)
+
+def test_block_is_rendered_once_per_key():
+    calls = []
+
+    def counter():
+        calls.append(1)
+        return len(calls)
+
+    template = compile_template("{% cache 'nav', section %}{{ counter() }}{% endcache %}")
+    with app.test_request_context('/'):
+        assert template.render(counter=counter, section='a') == '1'
+        assert template.render(counter=counter, section='a') == '1'
+        assert template.render(counter=counter, section='b') == '2'
+
+def test_recompiled_template_is_not_served_from_cache():
+    source = "{% cache 'nav' %}{{ value }}{% endcache %}"
+    with app.test_request_context('/'):
+        assert compile_template(source).render(value='old') == 'old'
+        assert compile_template(source).render(value='new') == 'new'
+
+def test_cache_can_be_disabled():
+    app.config['FRAGMENT_CACHE_ENABLED'] = False
+    try:
+        with app.test_request_context('/'):
+            template = compile_template("{% cache 'nav' %}{{ value }}{% endcache %}")
+            assert template.render(value='x') == 'x'
+            assert template.render(value='y') == 'y'
+    finally:
+        app.config['FRAGMENT_CACHE_ENABLED'] = True
+
+def test_cached_markup_is_not_escaped_again():
+    with app.test_request_context('/'):
+        template = compile_template("{% cache 'link' %}<a href=\"{{ url }}\">Ø</a>{% endcache %}")
+        first = template.render(url='/a?b=1&c=2')
+        assert template.render(url='/ignored') == first == '<a href="/a?b=1&amp;c=2">Ø</a>'
+
+def test_pages_share_header_and_footer_per_section(client):
+    first = client.get('/vidensbank/emissioner/hvorfor-vigtigt').data
+    second = client.get('/vidensbank/emissioner/hvad-er-det').data
+    assert b'id="main-header"' in first and b'id="main-header"' in second
+    # one header and one footer for the anonymous emissioner section
+    assert len(fragment_cache._fragments) == 2
+
+    client.get('/vidensbank/madspild')
+    assert len(fragment_cache._fragments) == 4
+
+def test_unknown_urls_do_not_grow_the_cache(client):
+    client.get('/findes-ikke-1')
+    count = len(fragment_cache._fragments)
+    client.get('/findes-ikke-2')
+    assert len(fragment_cache._fragments) == count
@@ -0,0 +1,48 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, page_cache
+
+FRAGMENT = {'X-Fragment': 'content'}
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    page_cache.clear()
+    with app.test_client() as client:
+        yield client
+    page_cache.clear()
+
+def test_fragment_renders_content_block_only(client):
+    response = client.get('/vidensbank/emissioner/hvorfor-vigtigt', headers=FRAGMENT)
+    html = response.data.decode('utf-8')
+    assert response.status_code == 200
+    assert html.startswith('<title>')
+    assert '<!DOCTYPE' not in html
+    assert '<header' not in html and '<footer' not in html
+    assert 'js/main.' not in html
+
+def test_full_page_and_fragment_are_cached_separately(client):
+    full = client.get('/vidensbank/emissioner/hvorfor-vigtigt')
+    fragment = client.get('/vidensbank/emissioner/hvorfor-vigtigt', headers=FRAGMENT)
+    again = client.get('/vidensbank/emissioner/hvorfor-vigtigt', headers=FRAGMENT)
+    assert fragment.headers['X-Page-Cache'] == 'MISS'
+    assert again.headers['X-Page-Cache'] == 'HIT'
+    assert len(fragment.data) < len(full.data)
+    assert full.data.decode('utf-8').lstrip().startswith('<!DOCTYPE')
+    assert 'X-Fragment' in full.headers['Vary']
+
+def test_fragment_includes_page_assets(client):
+    html = client.get('/vidensbank/madspild/mit-aftryk', headers=FRAGMENT).data.decode('utf-8')
+    assert 'js/impact/madspild.' in html
+
+def test_pending_flash_gets_full_page(client):
+    with client.session_transaction() as sess:
+        sess['_flashes'] = [('info', 'Velkommen')]
+    html = client.get('/vidensbank/emissioner/hvorfor-vigtigt', headers=FRAGMENT).data.decode('utf-8')
+    assert '<!DOCTYPE' in html
+    assert 'Velkommen' in html
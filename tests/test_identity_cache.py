@@ -0,0 +1,148 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask_login import LoginManager, current_user, login_user, logout_user
+from sqlalchemy import event
+from app import db, User
+from identity_cache import IdentityCache, SESSION_KEY
+
+@pytest.fixture
+def site(tmp_path):
+    """Minimal app with its own SQLite database, so the tracked instance database is never touched"""
+    test_app = Flask(__name__)
+    test_app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'users.db'}"
+    test_app.config['SECRET_KEY'] = 'test'
+    db.init_app(test_app)
+    cache = IdentityCache(test_app, db, User)
+    login_manager = LoginManager(test_app)
+    login_manager.user_loader(cache.load)
+
+    @test_app.route('/login/<int:user_id>')
+    def login(user_id):
+        login_user(db.session.get(User, user_id))
+        return 'ok'
+
+    @test_app.route('/logout')
+    def logout():
+        logout_user()
+        return 'ok'
+
+    @test_app.route('/whoami')
+    def whoami():
+        if not current_user.is_authenticated:
+            return 'anonymous'
+        return f'{current_user.username}:{current_user.role}'
+
+    queries = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if 'FROM user' in statement:
+            queries.append(statement)
+
+    with test_app.app_context():
+        db.create_all()
+        user = User(username='anna', email='anna@example.dk', role='user')
+        user.set_password('hemmelig')
+        db.session.add(user)
+        db.session.commit()
+        engine = db.engine
+
+    # No app context held here: Flask-Login keeps the user on g, which would
+    # otherwise be shared between the test requests
+    event.listen(engine, 'before_cursor_execute', count)
+    yield test_app, cache, queries
+    event.remove(engine, 'before_cursor_execute', count)
+    for name in ('after_update', 'after_delete'):
+        event.remove(User, name, cache._invalidate)
+    event.remove(db.session, 'after_commit', cache._after_commit)
+    event.remove(db.session, 'after_rollback', cache._after_rollback)
+
+def test_steady_state_skips_users_table(site):
+    test_app, cache, queries = site
+    client = test_app.test_client()
+    client.get('/login/1')
+    queries.clear()
+
+    for _ in range(5):
+        assert client.get('/whoami').data == b'anna:user'
+    assert len(queries) == 1
+    assert cache.hits == 4
+
+def test_role_change_is_seen_immediately(site):
+    test_app, cache, queries = site
+    client = test_app.test_client()
+    client.get('/login/1')
+    client.get('/whoami')
+
+    with test_app.app_context():
+        user = db.session.get(User, 1)
+        user.role = 'admin'
+        db.session.commit()
+    assert client.get('/whoami').data == b'anna:admin'
+
+def test_eviction_waits_for_commit(site):
+    test_app, cache, queries = site
+    client = test_app.test_client()
+    client.get('/login/1')
+    client.get('/whoami')
+
+    with test_app.app_context():
+        user = db.session.get(User, 1)
+        user.role = 'admin'
+        db.session.flush()
+        # Not committed yet, so the cached user is still the right one
+        assert 1 in cache._users
+        db.session.rollback()
+        assert 1 in cache._users
+
+        user = db.session.get(User, 1)
+        user.role = 'admin'
+        db.session.flush()
+        assert 1 in cache._users
+        db.session.commit()
+        assert 1 not in cache._users
+    assert client.get('/whoami').data == b'anna:admin'
+
+def test_stale_version_in_other_worker_refetches(site):
+    test_app, cache, queries = site
+    client = test_app.test_client()
+    client.get('/login/1')
+    client.get('/whoami')
+
+    # Another worker changed the password: this one still holds the old entry,
+    # but the visitor's session carries a stamp that no longer matches it
+    with client.session_transaction() as sess:
+        sess[SESSION_KEY] = 'changed'
+    queries.clear()
+    client.get('/whoami')
+    assert len(queries) == 1
+    with client.session_transaction() as sess:
+        assert sess[SESSION_KEY] != 'changed'
+
+def test_entries_expire(site):
+    test_app, cache, queries = site
+    test_app.config['IDENTITY_CACHE_TTL'] = 0
+    client = test_app.test_client()
+    client.get('/login/1')
+    queries.clear()
+    client.get('/whoami')
+    client.get('/whoami')
+    assert len(queries) == 2
+
+def test_logout_and_unknown_users(site):
+    test_app, cache, queries = site
+    client = test_app.test_client()
+    client.get('/login/1')
+    client.get('/logout')
+    with client.session_transaction() as sess:
+        assert SESSION_KEY not in sess
+    assert client.get('/whoami').data == b'anonymous'
+
+    with test_app.test_request_context():
+        assert cache.load('999') is None
+        assert cache.load('abc') is None
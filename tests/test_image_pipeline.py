@@ -0,0 +1,67 @@
+import pytest
+import sys
+import os
+import json
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+from app import app, responsive_images
+from image_pipeline import build_images
+
+@pytest.fixture
+def static_folder(tmp_path):
+    images = tmp_path / 'images'
+    images.mkdir()
+    Image.new('RGB', (2400, 1200), (200, 120, 40)).save(images / 'hero.jpg')
+    Image.new('RGBA', (300, 300), (0, 0, 0, 0)).save(images / 'logo.png')
+    return tmp_path
+
+def test_build_creates_webp_variants_and_manifest(static_folder):
+    summary = build_images(str(static_folder), jobs=2)
+    assert summary['built'] == 2
+
+    manifest = json.loads((static_folder / 'responsive' / 'manifest.json').read_text(encoding='utf-8'))
+    hero = manifest['images/hero.jpg']
+    assert sorted(hero['variants'], key=int) == ['480', '960', '1440', '1920']
+    with Image.open(static_folder / hero['variants']['480']) as variant:
+        assert variant.format == 'WEBP'
+        assert variant.size == (480, 240)
+
+    # Small images are never upscaled
+    assert list(manifest['images/logo.png']['variants']) == ['300']
+
+def test_rebuild_reuses_variants_by_content_hash(static_folder):
+    build_images(str(static_folder), jobs=1)
+    assert build_images(str(static_folder), jobs=1)['cached'] == 2
+
+    Image.new('RGB', (1000, 500), (10, 10, 10)).save(static_folder / 'images' / 'hero.jpg')
+    summary = build_images(str(static_folder), jobs=1)
+    assert summary['built'] == 1
+    assert summary['pruned'] == 4
+
+def test_helper_renders_picture_with_srcset():
+    manifest = responsive_images.manifest
+    responsive_images.manifest = {
+        'images/hero.jpg': {
+            'hash': 'abc', 'width': 1000, 'height': 500,
+            'variants': {'480': 'responsive/hero.abc.480w.webp', '1000': 'responsive/hero.abc.1000w.webp'}
+        }
+    }
+    try:
+        with app.test_request_context():
+            html = str(responsive_images.responsive_image('images/hero.jpg', alt='Hero', sizes='50vw', **{'class': 'w-full'}))
+    finally:
+        responsive_images.manifest = manifest
+
+    assert html.startswith('<picture><source type="image/webp"')
+    assert '/static/responsive/hero.abc.480w.webp 480w, /static/responsive/hero.abc.1000w.webp 1000w' in html
+    assert 'sizes="50vw"' in html
+    assert 'src="/static/images/hero.jpg"' in html
+    assert 'class="w-full"' in html
+
+def test_helper_falls_back_to_plain_img_without_build():
+    with app.test_request_context():
+        html = str(responsive_images.responsive_image('images/not-built.jpg', alt='X'))
+    assert html == '<img src="/static/images/not-built.jpg" alt="X" loading="lazy" decoding="async">'
@@ -0,0 +1,55 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, page_cache
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    page_cache.clear()
+    with app.test_client() as client:
+        yield client
+
+def test_second_request_is_served_from_cache(client):
+    """A static page is rendered once and then served from memory"""
+    first = client.get('/vidensbank/saeson')
+    second = client.get('/vidensbank/saeson')
+    assert first.headers['X-Page-Cache'] == 'MISS'
+    assert second.headers['X-Page-Cache'] == 'HIT'
+    assert first.data == second.data
+
+def test_etag_revalidation_returns_304(client):
+    """Clients sending the current ETag get an empty 304"""
+    # Streamed pages only carry an ETag once they are served from the cache
+    client.get('/vidensbank/raavarer/laks').get_data()
+    response = client.get('/vidensbank/raavarer/laks')
+    etag = response.headers['ETag']
+    revalidated = client.get('/vidensbank/raavarer/laks', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b''
+
+def test_dynamic_routes_are_not_cached(client):
+    """Routes with forms or per-user data stay uncached"""
+    response = client.get('/contact')
+    assert response.status_code == 200
+    assert 'X-Page-Cache' not in response.headers
+    assert 'contact' not in page_cache.endpoints
+
+def test_flash_messages_bypass_cache(client):
+    """A pending flash message must be rendered, not a cached page without it"""
+    client.get('/')
+    with client.session_transaction() as sess:
+        sess['_flashes'] = [('success', 'Tak for din besked!')]
+    response = client.get('/')
+    assert 'X-Page-Cache' not in response.headers
+    assert 'Tak for din besked!' in response.data.decode('utf-8')
+
+def test_warm_renders_every_static_route(client):
+    """Warm-up fills the cache so the first visitor gets a hit"""
+    assert page_cache.warm() > 0
+    response = client.get('/vidensbank/emissioner')
+    assert response.headers['X-Page-Cache'] == 'HIT'
@@ -0,0 +1,98 @@
+import pytest
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pdf_cache as pdf_cache_module
+import pdf_generator
+from app import app, page_cache, pdf_cache
+from pdf_generator import PDFGenerator
+
+PDF_URL = '/vidensbank/emissioner/download-pdf'
+
+@pytest.fixture
+def renders(tmp_path, monkeypatch):
+    """Count renders; WeasyPrint's system libraries are not needed to test the cache"""
+    calls = []
+
+    def fake_write_pdf(self, template_name, target, **template_vars):
+        calls.append((template_name, template_vars))
+        time.sleep(0.05)
+        target.write(b'%PDF-1.7 ' + template_vars['current_date'].encode('utf-8'))
+
+    monkeypatch.setattr(PDFGenerator, 'write_pdf', fake_write_pdf)
+    monkeypatch.setitem(app.config, 'PDF_CACHE_DIR', str(tmp_path / 'pdf_cache'))
+    app.config['TESTING'] = True
+    page_cache.clear()
+    return calls
+
+@pytest.fixture
+def client(renders):
+    with app.test_client() as client:
+        yield client
+
+def test_pdf_is_rendered_once_and_revalidated_by_etag(client, renders):
+    first = client.get(PDF_URL)
+    assert first.status_code == 200
+    assert first.mimetype == 'application/pdf'
+    assert first.data.startswith(b'%PDF')
+    assert 'attachment' in first.headers['Content-Disposition']
+    etag = first.headers['ETag']
+
+    second = client.get(PDF_URL)
+    assert second.data == first.data
+    assert client.get(PDF_URL, headers={'If-None-Match': etag}).status_code == 304
+    assert len(renders) == 1
+
+def test_range_requests_are_supported(client, renders):
+    response = client.get(PDF_URL, headers={'Range': 'bytes=0-3'})
+    assert response.status_code == 206
+    assert response.data == b'%PDF'
+
+def test_new_date_renders_again_and_prunes_old_file(client, renders, monkeypatch):
+    client.get(PDF_URL)
+    monkeypatch.setattr(pdf_cache_module, 'report_date', lambda: '01. January 2030')
+    response = client.get(PDF_URL)
+    assert response.data.endswith(b'2030')
+    assert len(renders) == 2
+    files = [name for name in os.listdir(app.config['PDF_CACHE_DIR']) if name.endswith('.pdf')]
+    assert len(files) == 1
+
+def test_template_edit_changes_key(client, renders, monkeypatch):
+    etag = client.get(PDF_URL).headers['ETag']
+    monkeypatch.setattr(pdf_cache_module, 'template_dependency_hash', lambda app, names: 'edited')
+    monkeypatch.setitem(app.config, 'PDF_CACHE_TEMPLATE_CHECK_INTERVAL', 0)
+    assert client.get(PDF_URL).headers['ETag'] != etag
+    assert len(renders) == 2
+
+def test_concurrent_first_requests_share_one_render(renders):
+    paths = []
+
+    def fetch():
+        with app.test_request_context():
+            paths.append(pdf_cache.get('pdf/emissions_report.html')[0])
+
+    threads = [threading.Thread(target=fetch) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(renders) == 1
+    assert len(set(paths)) == 1
+
+def test_template_variables_get_their_own_file(renders):
+    with app.test_request_context():
+        first, _ = pdf_cache.get('pdf/emissions_report.html', canteen='A')
+        second, _ = pdf_cache.get('pdf/emissions_report.html', canteen='B')
+    assert first != second
+    assert os.path.exists(first) and os.path.exists(second)
+
+@pytest.mark.skipif(pdf_generator.WEASYPRINT_AVAILABLE, reason='WeasyPrint can render here')
+def test_missing_weasyprint_redirects_with_message(tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, 'PDF_CACHE_DIR', str(tmp_path))
+    response = app.test_client().get(PDF_URL)
+    assert response.status_code == 302
@@ -0,0 +1,86 @@
+import pytest
+import sys
+import os
+import subprocess
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pdf_generator
+from app import app, pdf_cache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_app_import_does_not_load_weasyprint():
+    result = subprocess.run(
+        [sys.executable, '-c', "import sys, app; print('weasyprint' in sys.modules)"],
+        cwd=ROOT, capture_output=True, text=True, timeout=120
+    )
+    assert result.stdout.strip().splitlines()[-1] == 'False'
+
+def test_style_blocks_become_cached_stylesheets(monkeypatch):
+    monkeypatch.setattr(pdf_generator, 'parsed_stylesheet', lambda css: ('parsed', css))
+    html, stylesheets = pdf_generator.split_stylesheets(
+        '<head><style>p { color: red }</style><style media="print">h1 {}</style></head><p>Tekst</p>'
+    )
+    assert stylesheets == [('parsed', 'p { color: red }')]
+    assert '<style media="print">' in html
+    assert 'color: red' not in html
+
+def test_warm_parses_static_report_stylesheets(monkeypatch):
+    parsed = []
+    monkeypatch.setattr(pdf_generator, 'parsed_stylesheet', parsed.append)
+    monkeypatch.setattr(pdf_generator, 'load_weasyprint', lambda: FakeWeasyPrint)
+    summary = pdf_cache.warm(['pdf/emissions_report.html', 'pdf/canteen_report.html'])
+    assert summary['available']
+    assert summary['stylesheets'] == 2
+    assert all('@page' in css for css in parsed)
+
+def test_warm_can_be_switched_off(monkeypatch):
+    monkeypatch.setitem(app.config, 'PDF_PREWARM', False)
+    assert pdf_cache.warm(['pdf/emissions_report.html']) is None
+
+@pytest.mark.skipif(pdf_generator.WEASYPRINT_AVAILABLE, reason='WeasyPrint can render here')
+def test_missing_weasyprint_is_reported_lazily():
+    assert pdf_generator.load_weasyprint() is None
+    assert pdf_generator.warm(app)['available'] is False
+
+
+class FakeWeasyPrint:
+    class HTML:
+        def __init__(self, string):
+            self.string = string
+
+        def write_pdf(self, target=None, **options):
+            return b'%PDF'
+
+def test_custom_report_is_streamed_from_a_spooled_file(monkeypatch):
+    body = b'%PDF-1.7 ' + b'x' * (3 * pdf_generator.SPOOL_MAX_SIZE)
+    spools = []
+
+    def fake_write_pdf(self, template_name, target, **template_vars):
+        spools.append(target)
+        target.write(body)
+
+    monkeypatch.setattr(pdf_generator.PDFGenerator, 'write_pdf', fake_write_pdf)
+    with app.test_request_context():
+        response = pdf_generator.PDFGenerator().generate_custom_report('pdf/emissions_report.html', 'Rapport.pdf')
+        assert response.is_streamed
+        assert response.content_length == len(body)
+        assert response.headers['Accept-Ranges'] == 'bytes'
+        assert 'Rapport.pdf' in response.headers['Content-Disposition']
+        # Larger than the spool limit, so it went to disk instead of memory
+        assert spools[0]._rolled
+        assert b''.join(response.response) == body
+        response.close()
+    assert spools[0].closed
+
+def test_custom_report_supports_ranges(monkeypatch):
+    monkeypatch.setattr(pdf_generator.PDFGenerator, 'write_pdf',
+                        lambda self, template_name, target, **template_vars: target.write(b'%PDF-1.7 rapport'))
+    with app.test_request_context(headers={'Range': 'bytes=0-3'}):
+        response = pdf_generator.PDFGenerator().generate_custom_report('pdf/emissions_report.html', 'Rapport.pdf')
+        assert response.status_code == 206
+        assert response.headers['Content-Range'] == 'bytes 0-3/16'
+        assert b''.join(response.response) == b'%PDF'
+        response.close()
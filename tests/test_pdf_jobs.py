@@ -0,0 +1,193 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, page_cache, pdf_jobs
+from pdf_generator import PDFGenerator
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Fake renderer so the queue can be tested without WeasyPrint's system libraries"""
+    def fake_write_pdf(self, template_name, target, **template_vars):
+        if template_vars.get('canteen_id') == 'broken':
+            raise RuntimeError('render failed')
+        target.write(b'%PDF-1.7 ' + template_name.encode('utf-8'))
+
+    monkeypatch.setattr(PDFGenerator, 'write_pdf', fake_write_pdf)
+    monkeypatch.setitem(app.config, 'PDF_CACHE_DIR', str(tmp_path / 'pdf_cache'))
+    monkeypatch.setitem(app.config, 'PDF_JOB_DB', str(tmp_path / 'pdf_jobs.sqlite'))
+    monkeypatch.setitem(app.config, 'PDF_JOB_POLL_INTERVAL', 0.05)
+    monkeypatch.setitem(app.config, 'PDF_JOB_OUTPUT_DIR', str(tmp_path / 'pdf_jobs'))
+    monkeypatch.setitem(pdf_jobs.reports, 'canteen-test', {
+        'template': 'pdf/emissions_report.html', 'filename': 'Kantine_{canteen_id}_{date}.pdf',
+        'params': ('canteen_id',), 'back_endpoint': 'index'
+    })
+    monkeypatch.setattr(pdf_jobs, '_schema_ready', False)
+    app.config['TESTING'] = True
+    page_cache.clear()
+    with app.test_client() as client:
+        yield client
+
+def test_job_lifecycle(client):
+    created = client.post('/api/pdf-jobs', json={'report': 'emissions'})
+    assert created.status_code == 202
+    job_id = created.get_json()['job_id']
+    assert created.headers['Location'] == f'/api/pdf-jobs/{job_id}'
+
+    status = client.get(f'/api/pdf-jobs/{job_id}')
+    assert status.get_json()['status'] == 'queued'
+    assert status.headers['Retry-After'] == '1'
+
+    waiting = client.get(f'/pdf-jobs/{job_id}')
+    assert waiting.status_code == 202
+    assert waiting.headers['Refresh'] == '2'
+
+    assert pdf_jobs.run_worker(concurrency=2, once=True) == {'done': 1, 'failed': 0}
+
+    done = client.get(f'/api/pdf-jobs/{job_id}').get_json()
+    assert done['status'] == 'done'
+    download = client.get(done['download_url'])
+    assert download.status_code == 200
+    assert download.mimetype == 'application/pdf'
+    assert download.data.startswith(b'%PDF')
+    assert 'Emissions_Report_' in download.headers['Content-Disposition']
+
+def test_parameters_are_validated(client):
+    assert client.post('/api/pdf-jobs', json={'report': 'nope'}).status_code == 404
+    assert client.post('/api/pdf-jobs', json={'report': 'canteen-test'}).status_code == 400
+    created = client.post('/api/pdf-jobs', json={'report': 'canteen-test', 'canteen_id': 7, 'template': 'x.html'})
+    job = pdf_jobs.get(created.get_json()['job_id'])
+    assert job['variables'] == {'canteen_id': 7}
+
+def test_failed_render_is_reported(client):
+    job_id = client.post('/api/pdf-jobs', json={'report': 'canteen-test', 'canteen_id': 'broken'}).get_json()['job_id']
+    assert pdf_jobs.run_worker(once=True) == {'done': 0, 'failed': 1}
+    status = client.get(f'/api/pdf-jobs/{job_id}').get_json()
+    assert status['status'] == 'failed'
+    assert 'render failed' in status['error']
+    assert client.get(f'/pdf-jobs/{job_id}').status_code == 500
+
+def test_all_queued_jobs_are_drained(client):
+    ids = [pdf_jobs.enqueue('canteen-test', canteen_id=number) for number in range(5)]
+    assert pdf_jobs.run_worker(concurrency=2, once=True)['done'] == 5
+    assert {pdf_jobs.get(job_id)['status'] for job_id in ids} == {'done'}
+
+def test_expiry(client, monkeypatch):
+    finished = pdf_jobs.enqueue('emissions')
+    pdf_jobs.run_worker(once=True)
+    stuck = pdf_jobs.enqueue('emissions')
+    pdf_jobs._claim()
+
+    # A lost render gets one more attempt
+    monkeypatch.setitem(app.config, 'PDF_JOB_TIMEOUT', -1)
+    assert pdf_jobs.expire() == 0
+    assert pdf_jobs.get(stuck)['status'] == 'queued'
+    pdf_jobs._claim()
+    pdf_jobs.expire()
+    assert pdf_jobs.get(stuck)['error'] == 'Timed out'
+
+    monkeypatch.setitem(app.config, 'PDF_JOB_TTL', -1)
+    assert pdf_jobs.expire() == 2
+    assert pdf_jobs.get(finished) is None
+    assert client.get(f'/api/pdf-jobs/{finished}').status_code == 404
+
+def test_download_renders_inline_without_worker(client):
+    response = client.get('/vidensbank/emissioner/download-pdf')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/pdf'
+
+def test_download_is_queued_when_worker_runs(client):
+    pdf_jobs._heartbeat()
+    response = client.get('/vidensbank/emissioner/download-pdf')
+    assert response.status_code == 302
+    assert response.headers['Location'].startswith('/pdf-jobs/')
+
+    pdf_jobs.run_worker(once=True)
+    # Now cached, so the next click is served straight away
+    assert client.get('/vidensbank/emissioner/download-pdf').status_code == 200
+
+def test_stale_heartbeat_means_no_worker(client, monkeypatch):
+    pdf_jobs._heartbeat()
+    assert pdf_jobs.worker_alive()
+    monkeypatch.setitem(app.config, 'PDF_WORKER_HEARTBEAT', 0)
+    assert not pdf_jobs.worker_alive()
+
+def test_duplicate_requests_share_a_job(client):
+    first = pdf_jobs.enqueue('canteen-test', canteen_id=7)
+    assert pdf_jobs.enqueue('canteen-test', canteen_id=7) == first
+    assert client.post('/api/pdf-jobs', json={'report': 'canteen-test', 'canteen_id': 7}).get_json()['job_id'] == first
+    assert pdf_jobs.enqueue('canteen-test', canteen_id=8) != first
+
+    pdf_jobs._claim()
+    assert pdf_jobs.enqueue('canteen-test', canteen_id=7) == first
+    pdf_jobs._finish(first, path='/tmp/rapport.pdf')
+    # Finished jobs are not reused; the PDF cache answers those requests
+    assert pdf_jobs.enqueue('canteen-test', canteen_id=7) != first
+
+def test_archive_job_is_built_by_worker(client, monkeypatch):
+    def build(path, name):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f'arkiv {name}')
+
+    monkeypatch.setattr(pdf_jobs, 'reports', dict(pdf_jobs.reports))
+    pdf_jobs.register_archive('bundle-test', build, lambda name: f'Arkiv_{name}.txt', mimetype='text/plain',
+                              params=('name',), timeout=600)
+    # Not something anonymous visitors can start
+    assert client.post('/api/pdf-jobs', json={'report': 'bundle-test', 'name': 'x'}).status_code == 404
+
+    job_id = pdf_jobs.enqueue('bundle-test', name='kantiner')
+    assert pdf_jobs.run_worker(once=True) == {'done': 1, 'failed': 0}
+    job = pdf_jobs.get(job_id)
+    assert job['path'] == os.path.join(app.config['PDF_JOB_OUTPUT_DIR'], f'{job_id}.txt')
+
+    download = client.get(f'/pdf-jobs/{job_id}')
+    assert download.mimetype == 'text/plain'
+    assert download.data == b'arkiv kantiner'
+    assert 'Arkiv_kantiner.txt' in download.headers['Content-Disposition']
+    download.close()
+
+    # Its own timeout, not PDF_JOB_TIMEOUT; and the file goes with the job
+    monkeypatch.setitem(app.config, 'PDF_JOB_TIMEOUT', -1)
+    running = pdf_jobs.enqueue('bundle-test', name='igen')
+    pdf_jobs._claim()
+    pdf_jobs.expire()
+    assert pdf_jobs.get(running)['status'] == 'running'
+    monkeypatch.setitem(app.config, 'PDF_JOB_TTL', -1)
+    pdf_jobs.expire()
+    assert not os.path.exists(job['path'])
+
+def test_expiry_leaves_renders_that_are_still_running(client, monkeypatch):
+    monkeypatch.setitem(app.config, 'PDF_JOB_TIMEOUT', -1)
+    slow = pdf_jobs.enqueue('canteen-test', canteen_id=1)
+    pdf_jobs._claim()
+    # Held by the calling worker: not claimed a second time
+    pdf_jobs.expire(held={slow})
+    assert pdf_jobs.get(slow)['status'] == 'running'
+
+    # Claimed by another worker process that is still alive
+    other = os.getppid()
+    with pdf_jobs._connect() as conn:
+        conn.execute("UPDATE pdf_jobs SET worker_pid = ? WHERE id = ?", (other, slow))
+    pdf_jobs.expire()
+    assert pdf_jobs.get(slow)['status'] == 'running'
+
+    # That worker is gone
+    monkeypatch.setattr('pdf_jobs._pid_alive', lambda pid: False)
+    pdf_jobs.expire()
+    assert pdf_jobs.get(slow)['status'] == 'queued'
+
+def test_old_queue_database_gains_worker_column(client):
+    import sqlite3
+    conn = sqlite3.connect(app.config['PDF_JOB_DB'])
+    conn.executescript("""
+        CREATE TABLE pdf_jobs (id TEXT PRIMARY KEY, report TEXT NOT NULL, variables TEXT NOT NULL,
+            status TEXT NOT NULL, path TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0,
+            created_at REAL NOT NULL, started_at REAL, finished_at REAL);
+    """)
+    conn.close()
+    job_id = pdf_jobs.enqueue('emissions')
+    assert pdf_jobs._claim()['id'] == job_id
+    assert pdf_jobs.get(job_id)['worker_pid'] == os.getpid()
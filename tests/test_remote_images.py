@@ -0,0 +1,112 @@
+import pytest
+import sys
+import os
+import io
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+from app import app, page_cache, remote_images
+from remote_images import rewrite_templates, collect_template_keys
+from static_export import rewrite_links
+
+KEY = 'photo-1000000000000-abcdef012345'
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves a 2000px JPEG for any photo path, like images.unsplash.com"""
+    requests = []
+
+    def do_GET(self):
+        StandInHandler.requests.append(self.path)
+        if not self.path.startswith('/photo-'):
+            self.send_error(404)
+            return
+        buffer = io.BytesIO()
+        Image.new('RGB', (2000, 1000), (46, 125, 50)).save(buffer, 'JPEG')
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(buffer.tell()))
+        self.end_headers()
+        self.wfile.write(buffer.getvalue())
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def image_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    StandInHandler.requests = []
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def client(image_server, tmp_path):
+    app.config['TESTING'] = True
+    config = {key: app.config[key] for key in ('REMOTE_IMAGE_ORIGIN', 'REMOTE_IMAGE_CACHE_DIR')}
+    app.config['REMOTE_IMAGE_ORIGIN'] = image_server
+    app.config['REMOTE_IMAGE_CACHE_DIR'] = str(tmp_path / 'remote_images')
+    remote_images.keys.add(KEY)
+    page_cache.clear()
+    with app.test_client() as client:
+        yield client
+    remote_images.keys.discard(KEY)
+    app.config.update(config)
+    page_cache.clear()
+
+def test_proxy_fetches_once_and_serves_webp_buckets(client):
+    response = client.get(f'/img/{KEY}?w=900')
+    assert response.status_code == 200
+    assert response.mimetype == 'image/webp'
+    assert response.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+    assert Image.open(io.BytesIO(response.data)).size == (960, 480)
+
+    large = client.get(f'/img/{KEY}?w=5000')
+    assert Image.open(io.BytesIO(large.data)).size == (1920, 960)
+    again = client.get(f'/img/{KEY}?w=900')
+    assert again.status_code == 200
+    assert len(StandInHandler.requests) == 1
+
+def test_unreferenced_keys_are_not_proxied(client):
+    assert client.get('/img/photo-1-abc').status_code == 404
+    assert client.get('/img/..%2Fapp.py').status_code == 404
+    assert StandInHandler.requests == []
+
+def test_unreachable_origin_redirects_to_remote(client):
+    app.config['REMOTE_IMAGE_ORIGIN'] = 'http://127.0.0.1:9'
+    response = client.get(f'/img/{KEY}?w=480')
+    assert response.status_code == 302
+    assert response.headers['Location'].startswith(f'http://127.0.0.1:9/{KEY}?w=480')
+    assert response.headers['Cache-Control'] == 'no-store'
+
+def test_templates_reference_the_proxy(client):
+    assert not any('images.unsplash.com' in open(os.path.join(root, name), encoding='utf-8').read()
+                   for root, _, files in os.walk(os.path.join(app.root_path, 'templates'))
+                   for name in files)
+    assert remote_images.keys >= collect_template_keys(os.path.join(app.root_path, 'templates'))
+
+    with app.test_request_context():
+        assert remote_images.image_url(KEY, 1200) == f'/img/{KEY}?w=1440'
+        assert remote_images.image_srcset(KEY, 960) == f'/img/{KEY}?w=480 480w, /img/{KEY}?w=960 960w'
+
+def test_rewrite_templates(tmp_path):
+    (tmp_path / 'page.html').write_text(
+        '<img src="https://images.unsplash.com/photo-1-ab?q=80&w=1200" alt="x">\n'
+        '<div style="background-image: url(\'https://images.unsplash.com/photo-2-cd\')"></div>\n',
+        encoding='utf-8')
+    assert rewrite_templates(str(tmp_path)) == {'files': 1, 'urls': 2}
+    html = (tmp_path / 'page.html').read_text(encoding='utf-8')
+    assert 'src="{{ remote_image_url(\'photo-1-ab\', 1200) }}"' in html
+    assert 'sizes="(min-width: 1200px) 1200px, 100vw"' in html
+    assert 'url(\'{{ remote_image_url("photo-2-cd", 1920) }}\')' in html
+    assert collect_template_keys(str(tmp_path)) == {'photo-1-ab', 'photo-2-cd'}
+
+def test_static_export_points_proxy_images_at_app():
+    html = f'<img src="/img/{KEY}?w=960" srcset="/img/{KEY}?w=480 480w, /img/{KEY}?w=960 960w">'
+    rewritten = rewrite_links(html, set(), 'https://app.example')
+    assert rewritten.count('https://app.example/img/') == 3
@@ -0,0 +1,203 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import event
+from markupsafe import Markup
+from datetime import datetime
+from app import app, db, Page, search_index
+from search_index import SearchIndex, normalize_query, strip_html
+import os
+import time
+
+@pytest.fixture
+def index(tmp_path):
+    """A throwaway SQLite database so the tracked instance database is never touched"""
+    test_app = Flask(__name__)
+    test_app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'search.db'}"
+    test_app.config['SEARCH_PER_PAGE'] = 2
+    test_app.config['SEARCH_CACHE_STAMP'] = str(tmp_path / 'search_cache.stamp')
+    db.init_app(test_app)
+    index = SearchIndex(test_app, db, Page)
+    with test_app.app_context():
+        db.create_all()
+        yield index
+        db.session.remove()
+    event.remove(Page, 'after_insert', index._sync_page)
+    event.remove(Page, 'after_update', index._sync_page)
+    event.remove(Page, 'after_delete', index._remove_page)
+    event.remove(db.session, 'after_commit', index._after_commit)
+    event.remove(db.session, 'after_rollback', index._after_rollback)
+
+def add_page(slug, title, content, published=True):
+    page = Page(title=title, slug=slug, content=content, topic='emissioner', is_published=published)
+    db.session.add(page)
+    db.session.commit()
+    return page
+
+def test_strip_html():
+    assert strip_html('<p>Kød &amp; <strong>mælk</strong></p>') == 'Kød & mælk'
+
+def test_results_are_ranked_and_highlighted(index):
+    add_page('a', 'Madspild i kantinen', '<p>Små tiltag mod madspild sparer CO2.</p>')
+    add_page('b', 'Klimaaftryk', '<p>Oksekød har et stort klimaaftryk, og madspild tæller også.</p>')
+
+    results = index.search('madspild')
+    assert results['total'] == 2
+    # A title match outranks a body-only match
+    assert results['hits'][0]['page'].slug == 'a'
+    assert str(results['hits'][0]['title']) == '<mark>Madspild</mark> i kantinen'
+    assert '<mark>madspild</mark>' in str(results['hits'][1]['snippet'])
+    assert '<p>' not in str(results['hits'][1]['snippet'])
+
+def test_index_follows_updates_deletes_and_publishing(index):
+    page = add_page('a', 'Økologi', 'Økologiske råvarer')
+    add_page('hidden', 'Økologi kladde', 'Ikke udgivet', published=False)
+    assert index.search('økologi')['total'] == 1
+
+    page.content = 'Vandforbrug i landbruget'
+    db.session.commit()
+    assert index.search('vandforbrug')['total'] == 1
+    assert index.search('råvarer')['total'] == 0
+
+    db.session.delete(page)
+    db.session.commit()
+    assert index.search('vandforbrug')['total'] == 0
+
+def test_pagination_and_prefix_match(index):
+    for number in range(5):
+        add_page(f'p{number}', f'Sæsonvarer {number}', 'Grøntsager i sæson')
+    first = index.search('sæson', page=1)
+    last = index.search('sæson', page=3)
+    assert first['total'] == 5 and first['pages'] == 3
+    assert len(first['hits']) == 2 and len(last['hits']) == 1
+    assert not {h['page'].id for h in first['hits']} & {h['page'].id for h in last['hits']}
+
+def test_snippet_text_is_escaped(index):
+    add_page('x', 'Test', 'Kantine &lt;script&gt;alert(1)&lt;/script&gt; data')
+    snippet = str(index.search('kantine')['hits'][0]['snippet'])
+    assert '<script>' not in snippet
+    assert '&lt;script&gt;' in snippet
+
+def test_rebuild_indexes_existing_rows(index):
+    add_page('a', 'Biodiversitet', 'Bier og blomster')
+    db.session.execute(db.text("DELETE FROM page_fts"))
+    db.session.commit()
+    assert index.search('bier')['total'] == 0
+    assert index.rebuild() == 1
+    assert index.search('bier')['total'] == 1
+
+def test_punctuation_only_query_returns_nothing(index):
+    assert index.search('"*)')['total'] == 0
+
+def count_backend_calls(index, monkeypatch):
+    calls = []
+    original = index._search_sqlite
+    monkeypatch.setattr(index, '_search_sqlite', lambda *args: calls.append(args) or original(*args))
+    return calls
+
+def test_normalize_query():
+    assert normalize_query('  Oksekød   PRIS ') == 'oksekød pris'
+
+def test_repeated_queries_are_served_from_cache(index, monkeypatch):
+    add_page('a', 'Madspild', 'Mindre madspild')
+    calls = count_backend_calls(index, monkeypatch)
+    assert index.search('madspild')['total'] == 1
+    assert index.search('  MADSPILD ')['hits'][0]['page'].slug == 'a'
+    assert len(calls) == 1
+    index.search('madspild', page=2)
+    assert len(calls) == 2
+
+def test_cache_expires_after_ttl(index, monkeypatch):
+    index.app.config['SEARCH_CACHE_TTL'] = 0
+    calls = count_backend_calls(index, monkeypatch)
+    index.search('madspild')
+    index.search('madspild')
+    assert len(calls) == 2
+
+def test_cache_is_bounded(index):
+    index.app.config['SEARCH_CACHE_SIZE'] = 2
+    for query in ('a1', 'b2', 'c3'):
+        index.search(query)
+    assert [key[0] for key in index._results] == ['b2', 'c3']
+
+def test_unpublishing_invalidates_cached_results(index):
+    page = add_page('a', 'Økologi', 'Økologiske råvarer')
+    assert index.search('økologi')['total'] == 1
+    page.is_published = False
+    db.session.commit()
+    assert index.search('økologi')['total'] == 0
+    page.is_published = True
+    db.session.commit()
+    assert index.search('økologi')['total'] == 1
+
+def test_cache_is_dropped_on_commit_not_flush(index):
+    page = add_page('a', 'Økologi', 'Økologiske råvarer')
+    assert index.search('økologi')['total'] == 1
+    page.is_published = False
+    db.session.flush()
+    # A search in between still sees the committed page and caches it
+    assert index._results
+    index.search('økologi')
+    db.session.commit()
+    assert not index._results
+    assert index.search('økologi')['total'] == 0
+
+def test_rollback_keeps_cached_results(index):
+    page = add_page('a', 'Økologi', 'Økologiske råvarer')
+    index.search('økologi')
+    stamp = index.app.config['SEARCH_CACHE_STAMP']
+    touched = os.stat(stamp).st_mtime_ns
+    page.is_published = False
+    db.session.flush()
+    db.session.rollback()
+    assert index._results
+    assert os.stat(stamp).st_mtime_ns == touched
+    # Nothing left pending for the next commit either
+    add_page('b', 'Vand', 'Vandforbrug')
+    assert index.search('økologi')['total'] == 1
+
+def test_stamp_from_another_worker_clears_cache(index, monkeypatch):
+    index.search('madspild')
+    calls = count_backend_calls(index, monkeypatch)
+    stamp = index.app.config['SEARCH_CACHE_STAMP']
+    with open(stamp, 'a'):
+        pass
+    os.utime(stamp, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+    index.search('madspild')
+    assert len(calls) == 1
+
+def test_popular_queries_are_counted_and_warmed(index, monkeypatch):
+    add_page('a', 'Oksekød', 'Oksekød og klima')
+    for query in ('oksekød', 'Oksekød', 'klima', 'oksekød'):
+        index.search(query)
+    assert index.query_counts == {'oksekød': 3, 'klima': 1}
+    assert index.flush_stats() == 2
+    index.search('klima')
+    index.search('klima')
+    index.flush_stats()
+    rows = db.session.execute(db.text("SELECT query, hits FROM search_query_stats ORDER BY query")).all()
+    assert [tuple(row) for row in rows] == [('klima', 3), ('oksekød', 3)]
+
+    index.clear_cache()
+    assert index.warm(limit=1) == 1
+    assert [key[0] for key in index._results] == ['klima']
+
+def test_search_route_renders_hits(monkeypatch):
+    page = Page(title='Madspild', slug='madspild', content='', topic='madspild',
+                created_at=datetime(2024, 5, 1))
+    results = {
+        'hits': [{'page': page, 'title': Markup('<mark>Madspild</mark>'),
+                  'snippet': Markup('Mindre <mark>madspild</mark>'), 'rank': -1.0}],
+        'total': 12, 'page': 2, 'per_page': 10, 'pages': 2
+    }
+    monkeypatch.setattr(search_index, 'search', lambda query, page=1: results)
+
+    html = app.test_client().get('/search?q=madspild&page=2').data.decode('utf-8')
+    assert 'Fundet <strong>12</strong>' in html
+    assert 'Mindre <mark>madspild</mark>' in html
+    assert '/search?q=madspild&amp;page=1' in html
@@ -0,0 +1,81 @@
+import pytest
+import sys
+import os
+import json
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+from sourcing_engine import SourcingEngine
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+def test_substitutes_for_out_of_season_item(client):
+    """Oranges are never Danish, so January should suggest stored Danish apples"""
+    response = client.get('/api/season/0/substitutes/appelsin')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['success'] is True
+    assert [s['id'] for s in data['substitutes']] == ['aebler']
+
+def test_substitutes_empty_for_in_season_item(client):
+    """Items available in DK have no substitution edges"""
+    response = client.get('/api/season/7/substitutes/gulerod')
+    assert response.status_code == 200
+    assert response.get_json()['substitutes'] == []
+
+def test_substitutes_unknown_item(client):
+    response = client.get('/api/season/0/substitutes/dragefrugt')
+    assert response.status_code == 404
+
+def test_substitutes_invalid_month(client):
+    response = client.get('/api/season/12/substitutes/appelsin')
+    assert response.status_code == 400
+
+def test_graph_rebuilds_when_data_file_changes(tmp_path):
+    """Editing the data file should be picked up without restarting"""
+    data_file = tmp_path / 'sourcing.json'
+    months = {str(m): {'dk_status': 'Ude', 'dk_price': 0, 'dk_quality': 0,
+                       'import_origin': 'World', 'import_price': 2, 'import_quality': 2}
+              for m in range(12)}
+    catalog = {'citron': {'name': 'Citron', 'category': 'Frugt', 'co2_base': 0.5, 'months': months}}
+    data_file.write_text(json.dumps(catalog), encoding='utf-8')
+
+    engine = SourcingEngine(data_path=str(data_file))
+    assert engine.get_substitutes(0, 'citron') == []
+
+    catalog['rabarber'] = {
+        'name': 'Rabarber', 'category': 'Frugt', 'co2_base': 0.3,
+        'months': {'0': {'dk_status': 'Lager', 'dk_price': 2, 'dk_quality': 2,
+                         'import_origin': 'EU', 'import_price': 2, 'import_quality': 2}}
+    }
+    data_file.write_text(json.dumps(catalog), encoding='utf-8')
+    os.utime(data_file, (engine._data_mtime + 1, engine._data_mtime + 1))
+
+    assert [s['id'] for s in engine.get_substitutes(0, 'citron')] == ['rabarber']
+
+def test_broken_data_file_keeps_previous_graph(tmp_path):
+    data_file = tmp_path / 'sourcing.json'
+    months = {'0': {'dk_status': 'Ude', 'import_origin': 'World', 'import_price': 2, 'import_quality': 2}}
+    data_file.write_text(json.dumps({'citron': {'name': 'Citron', 'category': 'Frugt', 'months': months}}),
+                         encoding='utf-8')
+    engine = SourcingEngine(data_path=str(data_file))
+    loaded_mtime = engine._data_mtime
+
+    # A half-written file
+    data_file.write_text('{"citron": {"name": "Cit', encoding='utf-8')
+    os.utime(data_file, (loaded_mtime + 1, loaded_mtime + 1))
+    assert engine.get_substitutes(0, 'citron') == []
+    assert engine._data_mtime == loaded_mtime
+
+    # Picked up once the write completes, even with the same mtime as the broken one
+    data_file.write_text(json.dumps({'citron': {'name': 'Citron', 'category': 'Frugt', 'months': months}}),
+                         encoding='utf-8')
+    os.utime(data_file, (loaded_mtime + 1, loaded_mtime + 1))
+    assert engine.get_substitutes(0, 'citron') == []
+    assert engine._data_mtime == loaded_mtime + 1
@@ -0,0 +1,68 @@
+import pytest
+import sys
+import os
+import hashlib
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, static_assets, page_cache
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    page_cache.clear()
+    with app.test_client() as client:
+        yield client
+    page_cache.clear()
+
+def content_hash(filename):
+    with open(os.path.join(app.static_folder, filename), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:10]
+
+def test_url_for_static_uses_content_hash():
+    with app.test_request_context():
+        from flask import url_for
+        url = url_for('static', filename='js/main.js')
+        assert url == f"/static/js/main.{content_hash('js/main.js')}.js"
+        assert static_assets.static_url('js/main.js') == url
+
+def test_pages_link_hashed_assets(client):
+    html = client.get('/vidensbank/saeson').data.decode('utf-8')
+    assert f"/static/js/main.{content_hash('js/main.js')}.js" in html
+    assert '?v=' not in html
+
+def test_hashed_url_is_served_immutable(client):
+    response = client.get(f"/static/js/main.{content_hash('js/main.js')}.js")
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+    with open(os.path.join(app.static_folder, 'js', 'main.js'), 'rb') as f:
+        assert response.data == f.read()
+
+def test_plain_and_outdated_urls_are_not_immutable(client):
+    plain = client.get('/static/js/main.js')
+    assert plain.status_code == 200
+    assert 'immutable' not in plain.headers.get('Cache-Control', '')
+
+    # A hash from an earlier deploy still resolves to the current file
+    outdated = client.get('/static/js/main.0000000000.js')
+    assert outdated.status_code == 200
+    assert 'immutable' not in outdated.headers.get('Cache-Control', '')
+
+def test_debug_mode_keeps_plain_urls():
+    app.debug = True
+    try:
+        with app.test_request_context():
+            assert static_assets.static_url('js/main.js') == '/static/js/main.js'
+    finally:
+        app.debug = False
+
+def test_calculator_assets_are_external_deferred_bundles(client):
+    html = client.get('/calculator-advanced').data.decode('utf-8')
+    assert '<style>' not in html
+    assert 'async function loadCanteens' not in html
+    assert f"/static/css/calculator_advanced.{content_hash('css/calculator_advanced.css')}.css" in html
+    assert f"<script defer src=\"/static/js/calculator_advanced.{content_hash('js/calculator_advanced.js')}.js\">" in html
+
+    impact = client.get('/vidensbank/madspild/mit-aftryk').data.decode('utf-8')
+    assert f"/static/js/impact/madspild.{content_hash('js/impact/madspild.js')}.js" in impact
@@ -0,0 +1,83 @@
+import pytest
+import sys
+import os
+import gzip
+import json
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from app import app
+from static_assets import StaticAssets
+from static_export import _copy_static, collect_routes, export_site, rewrite_links
+
+@pytest.fixture
+def export_dir(tmp_path):
+    app.config['TESTING'] = True
+    return tmp_path / 'site'
+
+def test_collect_routes_only_includes_content_pages():
+    routes = collect_routes(app)
+    assert '/vidensbank/raavarer/laks' in routes
+    assert '/api/canteens' not in routes
+    assert '/contact' not in routes
+    assert '/calculator' not in routes
+
+def test_rewrite_links():
+    html = ('<a href="/vidensbank/saeson">S</a><a href="/login">L</a>'
+            '<link href="/static/css/style.css?v=3.1">')
+    rewritten = rewrite_links(html, {'/vidensbank/saeson'}, app_url='https://app.example.dk')
+    assert 'href="/vidensbank/saeson/"' in rewritten
+    assert 'href="https://app.example.dk/login"' in rewritten
+    assert 'href="/static/css/style.css?v=3.1"' in rewritten
+
+def test_export_writes_pages_gzip_and_manifest(export_dir):
+    summary = export_site(app, export_dir, jobs=2, copy_static=False)
+    assert summary['rendered'] > 0
+
+    page = export_dir / 'vidensbank' / 'raavarer' / 'laks' / 'index.html'
+    assert page.exists()
+    assert gzip.decompress((export_dir / 'vidensbank' / 'raavarer' / 'laks' / 'index.html.gz').read_bytes()) == page.read_bytes()
+
+    manifest = json.loads((export_dir / 'manifest.json').read_text(encoding='utf-8'))
+    entry = manifest['pages']['/vidensbank/raavarer/laks']
+    assert entry['file'] == 'vidensbank/raavarer/laks/index.html'
+    assert entry['templates'] == ['raavarer/laks.html']
+
+def test_incremental_export_skips_unchanged_pages(export_dir):
+    first = export_site(app, export_dir, jobs=1, copy_static=False)
+    second = export_site(app, export_dir, jobs=1, copy_static=False)
+    assert second['rendered'] == 0
+    assert second['skipped'] == first['rendered']
+
+def test_asset_change_rerenders_pages(export_dir, monkeypatch):
+    first = export_site(app, export_dir, jobs=1, copy_static=False)
+    static_assets = app.extensions['static_assets']
+    hashed = dict(static_assets.hashed, **{'css/style.css': 'css/style.0123456789.css'})
+    monkeypatch.setattr(static_assets, 'hashed', hashed)
+    second = export_site(app, export_dir, jobs=1, copy_static=False)
+    assert second['rendered'] == first['rendered']
+
+def test_copy_static_prunes_old_hashed_copies(tmp_path):
+    static = tmp_path / 'static'
+    (static / 'css').mkdir(parents=True)
+    (static / 'css' / 'style.css').write_text('body { color: green }')
+    test_app = Flask(__name__, static_folder=str(static))
+    assets = StaticAssets(test_app)
+    output_dir = tmp_path / 'site'
+
+    _copy_static(test_app, output_dir)
+    old = assets.hashed['css/style.css']
+    assert (output_dir / 'static' / old).exists()
+
+    (static / 'css' / 'style.css').write_text('body { color: red }')
+    assets.build_manifest()
+    _copy_static(test_app, output_dir)
+    new = assets.hashed['css/style.css']
+    assert new != old
+    assert (output_dir / 'static' / new).exists()
+    assert (output_dir / 'static' / new).read_text() == 'body { color: red }'
+    assert not (output_dir / 'static' / old).exists()
+    assert not (output_dir / 'static' / (old + '.gz')).exists()
+    assert (output_dir / 'static' / 'css' / 'style.css').exists()
@@ -0,0 +1,72 @@
+import pytest
+import sys
+import os
+import gzip
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, page_cache
+from streaming import measure_ttfb
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    page_cache.clear()
+    with app.test_client() as client:
+        yield client
+    page_cache.clear()
+
+def test_head_is_flushed_before_body(client):
+    response = client.get('/vidensbank/raavarer/oksekoed', buffered=False)
+    chunks = iter(response.response)
+    first = next(chunks)
+    rest = b''.join(chunks)
+    response.close()
+
+    assert response.headers['X-Page-Cache'] == 'MISS'
+    assert b'</head>' in first
+    assert b'</body>' not in first
+    assert b'</html>' in rest
+
+def test_streamed_page_matches_buffered_render(client):
+    streamed = client.get('/vidensbank/raavarer/oksekoed').data
+    app.config['STREAM_TEMPLATES_ENABLED'] = False
+    page_cache.clear()
+    try:
+        buffered = client.get('/vidensbank/raavarer/oksekoed').data
+    finally:
+        app.config['STREAM_TEMPLATES_ENABLED'] = True
+    assert streamed == buffered
+
+def test_streamed_page_is_cached_for_next_request(client):
+    # The page is stored once the stream has been read to the end
+    first = client.get('/calculator-advanced')
+    body = first.data
+    second = client.get('/calculator-advanced')
+    assert first.headers['X-Page-Cache'] == 'MISS'
+    assert second.headers['X-Page-Cache'] == 'HIT'
+    assert second.headers['ETag']
+    assert second.data == body
+
+def test_streamed_page_is_gzipped(client):
+    plain = client.get('/emissioner-og-baeredygtighed/branchepraestation').data
+    page_cache.clear()
+    response = client.get('/emissioner-og-baeredygtighed/branchepraestation', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data) == plain
+
+def test_pending_flash_renders_without_streaming(client):
+    with client.session_transaction() as sess:
+        sess['_flashes'] = [('info', 'Velkommen')]
+    response = client.get('/vidensbank/raavarer')
+    assert response.status_code == 200
+    assert 'Velkommen' in response.data.decode('utf-8')
+    assert 'X-Page-Cache' not in response.headers
+
+def test_measure_ttfb_reports_both_modes():
+    results = measure_ttfb(app, ['/vidensbank/raavarer'], runs=2)
+    modes = results['/vidensbank/raavarer']
+    assert set(modes) == {'streamed', 'buffered'}
+    assert modes['streamed']['status'] == 200
+    assert modes['streamed']['ttfb_ms'] <= modes['streamed']['total_ms']
@@ -0,0 +1,128 @@
+import pytest
+import sys
+import os
+import time
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, page_cache, suggestions
+from suggest import PrefixTrie, Suggestions, fold_key
+
+BROWSER = {'User-Agent': 'Mozilla/5.0'}
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    page_cache.clear()
+    with app.test_client() as client:
+        yield client
+
+def entry(label, weight, url=None, kind='page'):
+    from suggest import _word_keys
+    return {'label': label, 'type': kind, 'url': url or f'/{label}', 'weight': weight, 'keys': _word_keys(label)}
+
+def test_fold_key():
+    assert fold_key('  Økologisk   Bælgfrugt ') == 'okologisk baelgfrugt'
+
+def test_trie_ranks_by_weight_and_matches_word_starts():
+    trie = PrefixTrie([entry('Røget laks', 1.0), entry('Laks & Ørred', 3.0), entry('Lammekød', 2.0)], limit=5)
+    assert [e['label'] for e in trie.lookup('la', 5)] == ['Laks & Ørred', 'Lammekød', 'Røget laks']
+    assert [e['label'] for e in trie.lookup('laks', 1)] == ['Laks & Ørred']
+    assert [e['label'] for e in trie.lookup('orr', 5)] == ['Laks & Ørred']
+    assert trie.lookup('x', 5) == []
+
+def test_suggest_endpoint_folds_diacritics(client):
+    data = client.get('/api/suggest?q=oksek').get_json()
+    assert data['success'] is True
+    urls = [s['url'] for s in data['suggestions']]
+    assert '/vidensbank/raavarer/oksekoed' in urls
+    # ASCII slug spellings reach the same page
+    slug = client.get('/api/suggest?q=baelgfrug').get_json()['suggestions']
+    assert slug[0]['url'] == '/vidensbank/raavarer/baelgfrugter'
+
+def test_suggest_covers_climate_database(client):
+    if not os.path.exists(app.config['SUGGEST_CLIMATE_DB']):
+        pytest.skip('climate database not initialised')
+    types = {s['type'] for s in client.get('/api/suggest?q=laks').get_json()['suggestions']}
+    assert 'emission_factor' in types
+    canteens = client.get('/api/suggest?q=henning').get_json()['suggestions']
+    assert canteens[0]['type'] == 'canteen'
+    assert canteens[0]['url'].startswith('/calculator-advanced?canteen=')
+
+def test_empty_query_has_no_suggestions(client):
+    assert client.get('/api/suggest?q=%20').get_json()['suggestions'] == []
+
+def test_page_views_raise_weight(tmp_path):
+    from flask import Flask
+    from page_cache import PageCache
+    test_app = Flask(__name__)
+    test_app.config['SUGGEST_CLIMATE_DB'] = str(tmp_path / 'missing.db')
+    # Only used to mark the routes as content pages
+    test_app.config['PAGE_CACHE_ENABLED'] = False
+    cache = PageCache(test_app)
+
+    @test_app.route('/madspild/cases')
+    @cache.cached
+    def cases():
+        return 'ok'
+
+    @test_app.route('/madspild/casestudier')
+    @cache.cached
+    def casestudier():
+        return 'ok'
+
+    suggest = Suggestions(test_app)
+    assert [s['url'] for s in suggest.suggest('cas')] == ['/madspild/cases', '/madspild/casestudier']
+
+    client = test_app.test_client()
+    client.get('/madspild/casestudier', headers=BROWSER)
+    # Internal test-client renders are not page views
+    client.get('/madspild/cases')
+    assert suggest.views == {'/madspild/casestudier': 1}
+
+    suggest.rebuild()
+    assert [s['url'] for s in suggest.suggest('cas')] == ['/madspild/casestudier', '/madspild/cases']
+
+def test_views_reweight_without_rebuilding(tmp_path, monkeypatch):
+    from flask import Flask
+    test_app = Flask(__name__)
+    test_app.config['SUGGEST_CLIMATE_DB'] = str(tmp_path / 'missing.db')
+    test_app.config['SUGGEST_CHECK_INTERVAL'] = 0
+    suggest = Suggestions(test_app)
+    rebuilds, threads = [], []
+    monkeypatch.setattr(suggest, '_page_entries', lambda: rebuilds.append(1) or [entry('Madspild', 0.0, kind='page')])
+    monkeypatch.setattr('suggest.threading.Thread', lambda target, daemon: threads.append(target) or FakeThread())
+    suggest.warm()
+    assert len(rebuilds) == 1
+
+    # Checks while one refresh is still pending do not start another
+    suggest.suggest('mad')
+    suggest.suggest('mad')
+    assert len(threads) == 1
+
+    suggest.views['/Madspild'] += 5
+    threads.pop()()
+    assert len(rebuilds) == 1
+    # Inside the re-weight interval, so the weights are unchanged as well
+    assert suggest.trie.entries[0]['weight'] == 3.0
+
+    test_app.config['SUGGEST_REWEIGHT_INTERVAL'] = 0
+    suggest.suggest('mad')
+    threads.pop()()
+    assert len(rebuilds) == 1
+    assert suggest.trie.entries[0]['weight'] > 3.0
+
+class FakeThread:
+    def start(self):
+        pass
+
+def test_lookup_is_fast():
+    suggestions.warm()
+    timings = []
+    for query in ['o', 'ok', 'oksekod', 'mads', 'laks', 'kar', 'b', 'æg'] * 200:
+        started = time.perf_counter()
+        suggestions.suggest(query)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    assert timings[int(len(timings) * 0.99)] < 0.002
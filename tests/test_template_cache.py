@@ -0,0 +1,44 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from app import app, template_cache
+from template_cache import TemplateCache
+
+def test_app_uses_filesystem_bytecode_cache():
+    assert app.jinja_env.bytecode_cache is template_cache.bytecode_cache
+    assert os.path.isdir(template_cache.directory)
+
+def test_load_all_compiles_every_template_once(tmp_path):
+    test_app = Flask(__name__, template_folder=str(tmp_path / 'templates'))
+    (tmp_path / 'templates').mkdir()
+    (tmp_path / 'templates' / 'base.html').write_text('<h1>{% block title %}{% endblock %}</h1>', encoding='utf-8')
+    (tmp_path / 'templates' / 'page.html').write_text('{% extends "base.html" %}{% block title %}Hej{% endblock %}', encoding='utf-8')
+    test_app.config['JINJA_BYTECODE_CACHE_DIR'] = str(tmp_path / 'cache')
+    cache = TemplateCache(test_app)
+
+    first = cache.load_all()
+    assert first['loaded'] == 2
+    assert first['compiled'] == 2
+    assert first['failed'] == []
+    assert len(os.listdir(tmp_path / 'cache')) == 2
+
+    # A fresh environment (a new worker) reads the bytecode instead of compiling
+    test_app.jinja_env.cache.clear()
+    second = cache.load_all()
+    assert second['from_cache'] == 2
+    assert second['compiled'] == 0
+
+def test_broken_template_is_reported(tmp_path):
+    test_app = Flask(__name__, template_folder=str(tmp_path / 'templates'))
+    (tmp_path / 'templates').mkdir()
+    (tmp_path / 'templates' / 'broken.html').write_text('{% if %}', encoding='utf-8')
+    test_app.config['JINJA_BYTECODE_CACHE_DIR'] = str(tmp_path / 'cache')
+
+    summary = TemplateCache(test_app).load_all()
+    assert summary['failed'] == ['broken.html']
+    assert summary['loaded'] == 0
@@ -0,0 +1,152 @@
+import pytest
+import sys
+import os
+import time
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import event
+from app import app, db, ContactForm
+from write_behind import WriteBehind
+
+@pytest.fixture
+def site(tmp_path):
+    """Own SQLite database, so the tracked instance database is never touched"""
+    test_app = Flask(__name__)
+    test_app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'contacts.db'}"
+    test_app.config['WRITE_BEHIND_BATCH_SIZE'] = 10
+    test_app.config['WRITE_BEHIND_INTERVAL_MS'] = 50
+    test_app.config['WRITE_BEHIND_QUEUE_SIZE'] = 25
+    db.init_app(test_app)
+    writes = WriteBehind(test_app, db, ContactForm)
+
+    commits = []
+    with test_app.app_context():
+        db.create_all()
+        engine = db.engine
+    listener = lambda conn: commits.append(1)
+    event.listen(engine, 'commit', listener)
+    yield test_app, writes, commits
+    writes.shutdown()
+    event.remove(engine, 'commit', listener)
+
+def submit(writes, number, **values):
+    values.setdefault('name', f'Navn {number}')
+    return writes.submit(email='a@b.dk', subject='Emne', message=f'Besked {number}', **values)
+
+def stored(test_app):
+    with test_app.app_context():
+        return ContactForm.query.count()
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+def test_submissions_are_batched(site):
+    test_app, writes, commits = site
+    with test_app.app_context():
+        for number in range(20):
+            assert submit(writes, number)
+    assert wait_for(lambda: stored(test_app) == 20)
+    # 20 rows in batches of at most 10, not 20 transactions
+    assert len(commits) <= 3
+
+def test_full_queue_commits_synchronously(site):
+    test_app, writes, commits = site
+    # Stop the writer so the queue fills up
+    writes._ensure_thread()
+    writes.shutdown()
+    writes._ensure_thread = lambda: None
+
+    with test_app.app_context():
+        results = [submit(writes, number) for number in range(30)]
+    assert results.count(True) == 25
+    assert results.count(False) == 5
+    assert stored(test_app) == 5
+
+    assert writes.flush() == 25
+    assert stored(test_app) == 30
+
+def test_shutdown_writes_what_is_queued(site):
+    test_app, writes, commits = site
+    test_app.config['WRITE_BEHIND_INTERVAL_MS'] = 60000
+    test_app.config['WRITE_BEHIND_BATCH_SIZE'] = 1000
+    with test_app.app_context():
+        for number in range(5):
+            submit(writes, number)
+    writes.shutdown()
+    assert stored(test_app) == 5
+
+def test_bad_row_does_not_sink_its_batch(site):
+    test_app, writes, commits = site
+    test_app.config['WRITE_BEHIND_INTERVAL_MS'] = 60000
+    with test_app.app_context():
+        submit(writes, 1)
+        # Past validation, but the insert still fails (e.g. a constraint added later)
+        writes.queue.put_nowait({'name': None, 'email': 'a@b.dk', 'subject': 'Emne', 'message': 'Besked 2'})
+        submit(writes, 3)
+    writes.shutdown()
+    with test_app.app_context():
+        assert sorted(contact.message for contact in ContactForm.query) == ['Besked 1', 'Besked 3']
+
+def test_rows_that_cannot_be_inserted_are_refused(site):
+    test_app, writes, commits = site
+    with test_app.app_context():
+        with pytest.raises(ValueError, match='name'):
+            submit(writes, 1, name=None)
+        with pytest.raises(ValueError, match='phone'):
+            submit(writes, 2, phone='12345678')
+    writes.shutdown()
+    assert stored(test_app) == 0
+
+def test_locked_database_is_retried_not_dropped(site, monkeypatch):
+    from sqlalchemy.exc import OperationalError
+    test_app, writes, commits = site
+    test_app.config['WRITE_BEHIND_RETRIES'] = 1
+    monkeypatch.setattr('write_behind.MAX_BACKOFF', 0.01)
+    failures = []
+
+    def locked(session):
+        if len(failures) < 5:
+            failures.append(1)
+            raise OperationalError('INSERT INTO contact_form', {}, Exception('database is locked'))
+
+    event.listen(db.session, 'before_commit', locked)
+    try:
+        with test_app.app_context():
+            submit(writes, 1)
+        # Well past WRITE_BEHIND_RETRIES, and still written once the lock clears
+        assert wait_for(lambda: stored(test_app) == 1)
+        assert len(failures) == 5
+    finally:
+        event.remove(db.session, 'before_commit', locked)
+
+def test_submission_time_is_kept(site):
+    test_app, writes, commits = site
+    test_app.config['WRITE_BEHIND_ENABLED'] = False
+    with test_app.app_context():
+        assert submit(writes, 1) is False
+        assert ContactForm.query.one().submitted_at is not None
+
+def test_contact_route_queues_submission(monkeypatch):
+    from app import contact_queue
+    queued = []
+    monkeypatch.setattr(contact_queue, 'submit', lambda **values: queued.append(values))
+    response = app.test_client().post('/contact', data={
+        'name': 'Anna', 'email': 'a@b.dk', 'subject': 'Hej', 'message': 'Besked'
+    })
+    assert response.status_code == 302
+    assert queued == [{'name': 'Anna', 'email': 'a@b.dk', 'subject': 'Hej', 'message': 'Besked'}]
+
+def test_contact_route_rejects_missing_fields(monkeypatch):
+    from app import contact_queue
+    queued = []
+    monkeypatch.setattr(contact_queue, 'submit', lambda **values: queued.append(values))
+    response = app.test_client().post('/contact', data={'name': 'Anna', 'email': 'a@b.dk', 'subject': ' '})
+    assert response.status_code == 400
+    assert 'Udfyld venligst'.encode('utf-8') in response.data
+    assert queued == []
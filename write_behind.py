@@ -0,0 +1,214 @@
+"""
+Write-Behind Module for Vidensbank
+Queues new rows in memory and inserts them in batches from a background thread,
+so a burst of form submissions costs a few transactions instead of one each
+"""
+
+from sqlalchemy.exc import OperationalError
+from datetime import datetime
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Longest wait between attempts while the database stays locked
+MAX_BACKOFF = 5.0
+
+
+class WriteBehind:
+    """
+    Bounded write-behind queue for one model.
+
+    Rows are committed together once WRITE_BEHIND_BATCH_SIZE have queued up or
+    WRITE_BEHIND_INTERVAL_MS after the first of them arrived, and at shutdown.
+    A full queue (or a disabled one) commits the row in the request instead.
+    """
+
+    def __init__(self, app=None, db=None, model=None):
+        self.app = None
+        self.db = db
+        self.model = model
+        self.queue = None
+        self._thread = None
+        self._pid = None
+        self._stopping = threading.Event()
+        self._start_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self.batches = 0
+        self.fallbacks = 0
+        if app is not None:
+            self.init_app(app, db, model)
+
+    def init_app(self, app, db=None, model=None):
+        app.config.setdefault('WRITE_BEHIND_ENABLED', True)
+        app.config.setdefault('WRITE_BEHIND_BATCH_SIZE', 50)
+        app.config.setdefault('WRITE_BEHIND_INTERVAL_MS', 200)
+        # Rows held in memory at most; beyond this submissions commit synchronously
+        app.config.setdefault('WRITE_BEHIND_QUEUE_SIZE', 1000)
+        # Attempts on a busy database before warning; at shutdown, before giving up
+        app.config.setdefault('WRITE_BEHIND_RETRIES', 3)
+        app.extensions['write_behind'] = self
+        self.app = app
+        if db is not None:
+            self.db = db
+        if model is not None:
+            self.model = model
+        atexit.register(self.shutdown)
+
+    def submit(self, **values):
+        """
+        Queue a row for insertion.
+
+        Returns:
+            True if queued, False if it was committed synchronously
+
+        Raises:
+            ValueError: If the row could never be inserted, so it is not queued
+        """
+        self.validate(values)
+        if 'submitted_at' in self.model.__table__.columns:
+            # Stamped now, not when the batch is written
+            values.setdefault('submitted_at', datetime.utcnow())
+
+        if self.app.config['WRITE_BEHIND_ENABLED']:
+            self._ensure_thread()
+            try:
+                self.queue.put_nowait(values)
+                return True
+            except queue.Full:
+                self.fallbacks += 1
+                logger.warning(f"Write-behind queue for {self.model.__name__} is full, committing synchronously")
+
+        self.db.session.add(self.model(**values))
+        self.db.session.commit()
+        return False
+
+    def validate(self, values):
+        """
+        Check a row against the model before it is acknowledged: unknown columns
+        and missing NOT NULL columns would only fail later, in the background.
+        """
+        columns = self.model.__table__.columns
+        unknown = sorted(set(values) - set(columns.keys()))
+        if unknown:
+            raise ValueError(f"Unknown {self.model.__name__} columns: {', '.join(unknown)}")
+        missing = [column.key for column in columns
+                   if not column.nullable and not column.primary_key and column.default is None
+                   and column.server_default is None and values.get(column.key) is None]
+        if missing:
+            raise ValueError(f"Missing {self.model.__name__} values: {', '.join(missing)}")
+
+    def flush(self):
+        """Write everything queued so far; returns the number of rows written"""
+        if self.queue is None:
+            return 0
+        written = 0
+        while True:
+            rows = self._take(self.app.config['WRITE_BEHIND_BATCH_SIZE'])
+            if not rows:
+                return written
+            self._write(rows)
+            written += len(rows)
+
+    def shutdown(self):
+        """Stop the background thread and write what is left"""
+        self._stopping.set()
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            self._thread.join(timeout=10)
+        return self.flush()
+
+    def _ensure_thread(self):
+        # Started lazily and again after a fork, since threads do not survive one
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            if self._pid != os.getpid():
+                self.queue = queue.Queue(maxsize=self.app.config['WRITE_BEHIND_QUEUE_SIZE'])
+                self._pid = os.getpid()
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name=f"write-behind-{self.model.__tablename__}",
+                                            daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        batch_size = self.app.config['WRITE_BEHIND_BATCH_SIZE']
+        interval = self.app.config['WRITE_BEHIND_INTERVAL_MS'] / 1000
+        while not self._stopping.is_set():
+            try:
+                rows = [self.queue.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+
+            deadline = time.monotonic() + interval
+            # On shutdown the rows taken so far are written before the thread ends
+            while len(rows) < batch_size and not self._stopping.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    rows.append(self.queue.get(timeout=min(remaining, 0.5)))
+                except queue.Empty:
+                    continue
+            self._write(rows)
+
+    def _take(self, limit):
+        rows = []
+        while len(rows) < limit:
+            try:
+                rows.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _write(self, rows):
+        """
+        Insert rows in one transaction. While the database is busy this keeps
+        retrying, with backoff, until shutdown: the rows were already acknowledged.
+        """
+        retries = self.app.config['WRITE_BEHIND_RETRIES']
+        attempt = 0
+        with self._write_lock, self.app.app_context():
+            while True:
+                try:
+                    # ORM inserts, so mapper events (search index, admin counts) still fire
+                    self.db.session.add_all([self.model(**values) for values in rows])
+                    self.db.session.commit()
+                    self.batches += 1
+                    return
+                except OperationalError as e:
+                    # Typically "database is locked"; the rows themselves are fine
+                    self.db.session.rollback()
+                    attempt += 1
+                    if attempt > retries:
+                        if self._stopping.is_set():
+                            # Exiting with the database still locked: log them rather than hang
+                            self._drop(rows, e)
+                            return
+                        if attempt == retries + 1:
+                            logger.warning(f"Database busy, still retrying {len(rows)} {self.model.__name__} rows: {e}")
+                    time.sleep(min(0.1 * 2 ** attempt, MAX_BACKOFF))
+                except Exception as e:
+                    self.db.session.rollback()
+                    error = e
+                    break
+                finally:
+                    self.db.session.remove()
+
+        # A bad row must not take the rest of its batch down with it
+        if len(rows) > 1:
+            for values in rows:
+                self._write([values])
+        else:
+            self._drop(rows, error)
+
+    def _drop(self, rows, error):
+        # Only for rows that can never be inserted, or a locked database at exit;
+        # logged in full so nothing is lost silently
+        logger.error(f"Dropped {len(rows)} {self.model.__name__} rows: {error}; rows: {rows!r}")